@@ -0,0 +1,165 @@
+from pathlib import Path
+
+import pygame
+from pygame.mixer import Sound
+
+
+class SoundBank:
+    def __init__(self, directory="../assets/sounds"):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.__sounds = {}
+
+    def get(self, name):
+        sound = self.__sounds.get(name)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        sound = Sound(f"{self.directory}/{name}.wav")
+        self.__sounds[name] = sound
+        return sound
+
+    def preload(self, exclude=()):
+        for path in sorted(Path(self.directory).glob("*.wav")):
+            if path.stem not in self.__sounds and path.stem not in exclude:
+                self.get(path.stem)
+
+    def stats(self):
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "sounds": len(self.__sounds)}
+
+    def clear(self):
+        self.__sounds.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, name):
+        return name in self.__sounds
+
+    def __len__(self):
+        return len(self.__sounds)
+
+
+class ChannelPool:
+    def __init__(self, size=12):
+        self.size = size
+        self.enabled = True
+        self.played = 0
+        self.stolen = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.__channels = []
+        self.__owners = []
+        self.__priorities = []
+        self.__started = []
+        self.__frame_sounds = set()
+        self.__plays = 0
+
+    def begin_frame(self):
+        self.__frame_sounds.clear()
+
+    def play(self, sound, volume=1.0, priority=0, loops=0, owner=None):
+        if not self.__ensure_channels():
+            return None
+        key = (sound, volume)
+        if key in self.__frame_sounds:
+            self.deduplicated += 1
+            return None
+
+        index = self.__find_channel(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+
+        channel = self.__channels[index]
+        channel.play(sound, loops)
+        channel.set_volume(volume)
+        self.__plays += 1
+        self.__owners[index] = owner
+        self.__priorities[index] = priority
+        self.__started[index] = self.__plays
+        self.__frame_sounds.add(key)
+        self.played += 1
+        return channel
+
+    def stop(self, owner):
+        for index, channel in enumerate(self.__channels):
+            if self.__owners[index] is owner:
+                channel.stop()
+                self.__owners[index] = None
+
+    def set_volume(self, owner, volume):
+        for index, channel in enumerate(self.__channels):
+            if self.__owners[index] is owner and channel.get_busy():
+                channel.set_volume(volume)
+
+    def stop_all(self):
+        for index, channel in enumerate(self.__channels):
+            channel.stop()
+            self.__owners[index] = None
+
+    def busy_channels(self):
+        return sum(channel.get_busy() for channel in self.__channels)
+
+    def stats(self):
+        return {"played": self.played,
+                "stolen": self.stolen,
+                "deduplicated": self.deduplicated,
+                "dropped": self.dropped}
+
+    def __ensure_channels(self):
+        if not self.enabled or not pygame.mixer.get_init():
+            return False
+        if not self.__channels:
+            if pygame.mixer.get_num_channels() < self.size * 2:
+                pygame.mixer.set_num_channels(self.size * 2)
+            pygame.mixer.set_reserved(self.size)
+            self.__channels = [pygame.mixer.Channel(i)
+                               for i in range(self.size)]
+            self.__owners = [None] * self.size
+            self.__priorities = [0] * self.size
+            self.__started = [0] * self.size
+        return True
+
+    def __find_channel(self, priority):
+        victim = None
+        for index, channel in enumerate(self.__channels):
+            if not channel.get_busy():
+                return index
+            if self.__priorities[index] > priority:
+                continue
+            if victim is None or \
+                    (self.__priorities[index], self.__started[index]) < \
+                    (self.__priorities[victim], self.__started[victim]):
+                victim = index
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+
+sound_bank = SoundBank()
+channel_pool = ChannelPool()
+
+
+class SoundEffect:
+    def __init__(self, name, volume=1.0, priority=0, loops=0):
+        self.name = name
+        self.volume = volume
+        self.priority = priority
+        self.loops = loops
+
+    def play(self):
+        if channel_pool.enabled:
+            channel_pool.play(sound_bank.get(self.name), self.volume,
+                              self.priority, self.loops, owner=self)
+
+    def stop(self):
+        channel_pool.stop(self)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        channel_pool.set_volume(self, volume)
@@ -0,0 +1,213 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+from pygame import Surface, Vector2
+
+from scripts.audio import channel_pool
+from scripts.entities import EntityStore, rows_of
+from scripts.game import init_pygame
+from scripts.render import DRAW_LAYERS, RenderQueue
+from scripts.models import Asteroid, Bullet, Spaceship, Ufo
+from scripts.spatial import SpatialHash, first_unclaimed
+from scripts.utils import get_random_size, get_random_velocity, \
+    preload_sprites
+
+SIZES = (10, 100, 1000, 10000)
+PHASES = ("move", "bullets_collision", "ufo_collision", "asteroids_collision",
+          "spaceship_collision", "split_cascade", "draw")
+SCREEN_SIZE = (1500, 700)
+
+
+class World:
+    def __init__(self, asteroids, seed=0, bullets_per_asteroid=0.5,
+                 asteroids_per_ufo=100):
+        random.seed(seed)
+        self.width, self.height = SCREEN_SIZE
+        self.surface = Surface(SCREEN_SIZE)
+        self.store = EntityStore(capacity=asteroids * 2)
+        self.grid = SpatialHash(self.width, self.height)
+        self.render_queue = RenderQueue()
+        self.spaceship = Spaceship(Vector2(self.width / 2, self.height / 2),
+                                   None, self.store)
+        self.asteroids = self.create_asteroids(asteroids)
+        bullets = max(1, int(asteroids * bullets_per_asteroid))
+        self.bullets = [Bullet(self.random_position(),
+                               get_random_velocity(2, 4), True, self.store)
+                        for _ in range(bullets)]
+        self.ufo_bullets = [Bullet(self.random_position(),
+                                   get_random_velocity(1, 2), False,
+                                   self.store)
+                            for _ in range(bullets)]
+        self.ufos = [Ufo(self.random_position(), (1, 0), None, self.store)
+                     for _ in range(max(1, asteroids // asteroids_per_ufo))]
+
+    def random_position(self):
+        return Vector2(random.uniform(0, self.width),
+                       random.uniform(0, self.height))
+
+    def create_asteroids(self, count):
+        asteroids = []
+        for _ in range(count):
+            asteroids.append(Asteroid(self.random_position(),
+                                      asteroids.append,
+                                      get_random_size(0.8, 1.5),
+                                      store=self.store))
+        return asteroids
+
+    def objects(self):
+        return [*self.asteroids, *self.bullets, *self.ufos,
+                *self.ufo_bullets, self.spaceship]
+
+    def find_hits(self, objects, other_objects):
+        return first_unclaimed(*self.grid.store_pairs(
+            self.store, rows_of(objects), rows_of(other_objects)))
+
+    def move(self):
+        self.store.move(self.width, self.height)
+
+    def bullets_collision(self):
+        return self.find_hits(self.bullets, self.ufo_bullets)
+
+    def ufo_collision(self):
+        return self.find_hits(self.bullets, self.ufos)
+
+    def asteroids_collision(self):
+        return self.find_hits(self.asteroids, self.bullets)
+
+    def spaceship_collision(self):
+        return self.grid.store_pairs(self.store, [self.spaceship.row],
+                                     rows_of(self.asteroids))
+
+    def split_cascade(self, asteroids):
+        while asteroids:
+            fragments = []
+            for asteroid in asteroids:
+                asteroid.create_asteroid_callback = fragments.append
+                asteroid.split(self.spaceship)
+            asteroids = fragments
+
+    def draw(self):
+        self.surface.fill((0, 0, 0))
+        objects = self.objects()
+        rows = rows_of(objects)
+        self.render_queue.add_sprites(
+            DRAW_LAYERS[self.store.kinds[rows]],
+            [game_object.region for game_object in objects],
+            self.store.positions[rows])
+        self.render_queue.flush(self.surface)
+
+
+def default_repeats(asteroids):
+    return max(3, min(50, 10000 // asteroids))
+
+
+def measure(function, repeats, setup=None):
+    samples = []
+    for _ in range(repeats):
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter_ns()
+        function(*arguments)
+        samples.append(time.perf_counter_ns() - start)
+    return {"median_ms": statistics.median(samples) / 1e6,
+            "min_ms": min(samples) / 1e6,
+            "repeats": repeats}
+
+
+def run_scenario(asteroids, seed=0, repeats=None):
+    repeats = repeats or default_repeats(asteroids)
+    world = World(asteroids, seed)
+    split_count = min(asteroids, 1000)
+    results = {"objects": len(world.objects()),
+               "split_asteroids": split_count}
+    for phase in PHASES:
+        if phase == "split_cascade":
+            results[phase] = measure(
+                world.split_cascade, repeats,
+                lambda: world.create_asteroids(split_count))
+        else:
+            results[phase] = measure(getattr(world, phase), repeats)
+    return results
+
+
+def run_benchmark(sizes=SIZES, seed=0, repeats=None):
+    init_pygame(headless=True)
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    preload_sprites()
+    channel_pool.enabled = False
+    return {"meta": {"python": platform.python_version(),
+                     "pygame": pygame.version.ver,
+                     "numpy": np.__version__,
+                     "platform": platform.platform(),
+                     "seed": seed,
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "scenarios": {str(size): run_scenario(size, seed, repeats)
+                          for size in sizes}}
+
+
+def compare(results, baseline, threshold=0.2):
+    comparison = []
+    for size, phases in results["scenarios"].items():
+        baseline_phases = baseline.get("scenarios", {}).get(size, {})
+        for phase in PHASES:
+            if phase not in phases or phase not in baseline_phases:
+                continue
+            current = phases[phase]["median_ms"]
+            previous = baseline_phases[phase]["median_ms"]
+            ratio = current / previous if previous else float("inf")
+            comparison.append({"asteroids": int(size),
+                               "phase": phase,
+                               "baseline_ms": previous,
+                               "current_ms": current,
+                               "ratio": ratio,
+                               "regression": ratio > 1 + threshold})
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Asteroids simulation core on synthetic "
+                    "worlds")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=None)
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before a phase counts as a "
+                             "regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.seed, args.repeats)
+    for size, phases in results["scenarios"].items():
+        print(f"{size} asteroids ({phases['objects']} objects)")
+        for phase in PHASES:
+            print(f"  {phase:<20} {phases[phase]['median_ms']:9.3f} ms")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        results["comparison"] = compare(results, baseline, args.threshold)
+        results["threshold"] = args.threshold
+        regressions = [row for row in results["comparison"]
+                       if row["regression"]]
+        for row in regressions:
+            print(f"REGRESSION {row['asteroids']} asteroids {row['phase']}: "
+                  f"{row['baseline_ms']:.3f} -> {row['current_ms']:.3f} ms "
+                  f"(x{row['ratio']:.2f})")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
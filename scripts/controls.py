@@ -0,0 +1,70 @@
+import random
+from enum import IntFlag
+
+import pygame
+
+
+class InputFlag(IntFlag):
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    UP = 4
+    SHOOT = 8
+    PAUSE = 16
+
+
+class ScriptedInput:
+    def __init__(self, script, loop=True):
+        self.script = [InputFlag(flags) for flags in script]
+        self.loop = loop
+        self.position = 0
+
+    def next_input(self):
+        if self.position >= len(self.script):
+            if not self.loop or not self.script:
+                return InputFlag.NONE
+            self.position = 0
+        flags = self.script[self.position]
+        self.position += 1
+        return flags
+
+
+class RandomInput:
+    def __init__(self, seed=None, shoot_chance=0.2, turn_chance=0.6,
+                 thrust_chance=0.4):
+        self.__random = random.Random(seed)
+        self.shoot_chance = shoot_chance
+        self.turn_chance = turn_chance
+        self.thrust_chance = thrust_chance
+
+    def next_input(self):
+        flags = InputFlag.NONE
+        if self.__random.random() < self.turn_chance:
+            flags |= self.__random.choice((InputFlag.LEFT, InputFlag.RIGHT))
+        if self.__random.random() < self.thrust_chance:
+            flags |= InputFlag.UP
+        if self.__random.random() < self.shoot_chance:
+            flags |= InputFlag.SHOOT
+        return flags
+
+
+def read_keyboard(events):
+    flags = InputFlag.NONE
+    quit_requested = False
+    for event in events:
+        if event.type == pygame.QUIT:
+            quit_requested = True
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                flags |= InputFlag.PAUSE
+            elif event.key == pygame.K_SPACE:
+                flags |= InputFlag.SHOOT
+
+    is_key_pressed = pygame.key.get_pressed()
+    if is_key_pressed[pygame.K_RIGHT]:
+        flags |= InputFlag.RIGHT
+    elif is_key_pressed[pygame.K_LEFT]:
+        flags |= InputFlag.LEFT
+    if is_key_pressed[pygame.K_UP]:
+        flags |= InputFlag.UP
+    return flags, quit_requested
@@ -0,0 +1,130 @@
+from enum import IntEnum
+
+import numpy as np
+
+
+class EntityKind(IntEnum):
+    SPACESHIP = 0
+    ASTEROID = 1
+    BULLET = 2
+    ENEMY_BULLET = 3
+    UFO = 4
+
+
+class EntityStore:
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.size = 0
+        self.positions = np.zeros((0, 2))
+        self.previous_positions = np.zeros((0, 2))
+        self.velocities = np.zeros((0, 2))
+        self.radii = np.zeros(0)
+        self.kinds = np.zeros(0, dtype=np.uint8)
+        self.wraps = np.zeros(0, dtype=bool)
+        self.alive = np.zeros(0, dtype=bool)
+        self.ages = np.zeros(0, dtype=np.int64)
+        self.generations = np.zeros(0, dtype=np.int64)
+        self.__free = []
+        self.__grow(capacity)
+
+    def allocate(self, position, velocity, radius, kind, wraps=True):
+        if not self.__free:
+            self.__grow(self.capacity * 2)
+        row = self.__free.pop()
+        self.place(row, position)
+        self.velocities[row] = velocity[0], velocity[1]
+        self.radii[row] = radius
+        self.kinds[row] = kind
+        self.wraps[row] = wraps
+        self.alive[row] = True
+        self.ages[row] = 0
+        self.generations[row] += 1
+        self.size = max(self.size, row + 1)
+        return row, int(self.generations[row])
+
+    def place(self, row, position):
+        self.positions[row] = position[0], position[1]
+        self.previous_positions[row] = self.positions[row]
+
+    def release(self, row, generation):
+        if self.generations[row] == generation:
+            self.deactivate(row)
+            self.generations[row] += 1
+            self.__free.append(row)
+
+    def activate(self, row):
+        self.alive[row] = True
+        self.ages[row] = 0
+
+    def deactivate(self, row):
+        self.alive[row] = False
+        self.velocities[row] = 0
+
+    def move(self, width, height):
+        alive = self.alive[:self.size]
+        positions = self.positions[:self.size]
+        np.add(positions, self.velocities[:self.size], out=positions,
+               where=alive[:, None])
+        np.mod(positions, (width, height), out=positions,
+               where=self.wraps[:self.size, None])
+        ages = self.ages[:self.size]
+        np.add(ages, 1, out=ages, where=alive)
+
+    def snapshot(self):
+        self.previous_positions[:self.size] = self.positions[:self.size]
+
+    def interpolate(self, rows, alpha, width, height):
+        previous = self.previous_positions[rows]
+        current = self.positions[rows]
+        delta = current - previous
+        jumped = (np.abs(delta[:, 0]) > width / 2) | \
+            (np.abs(delta[:, 1]) > height / 2)
+        delta[jumped] = 0
+        previous[jumped] = current[jumped]
+        return previous + delta * alpha
+
+    def outside(self, rows, width, height):
+        x = self.positions[rows, 0]
+        y = self.positions[rows, 1]
+        return (x <= -1) | (x >= width) | (y <= -1) | (y >= height)
+
+    def distances(self, rows, other_rows):
+        delta = self.positions[rows] - self.positions[other_rows]
+        return np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+    def overlaps(self, rows, other_rows):
+        return self.distances(rows, other_rows) < \
+            self.radii[rows] + self.radii[other_rows]
+
+    def count(self, kind=None):
+        alive = self.alive[:self.size]
+        if kind is None:
+            return int(np.count_nonzero(alive))
+        return int(np.count_nonzero(alive & (self.kinds[:self.size] == kind)))
+
+    def __grow(self, capacity):
+        extra = capacity - self.capacity
+        self.positions = np.concatenate((self.positions, np.zeros((extra, 2))))
+        self.previous_positions = np.concatenate((self.previous_positions,
+                                                  np.zeros((extra, 2))))
+        self.velocities = np.concatenate((self.velocities,
+                                          np.zeros((extra, 2))))
+        self.radii = np.concatenate((self.radii, np.zeros(extra)))
+        self.kinds = np.concatenate((self.kinds,
+                                     np.zeros(extra, dtype=np.uint8)))
+        self.wraps = np.concatenate((self.wraps, np.zeros(extra, dtype=bool)))
+        self.alive = np.concatenate((self.alive, np.zeros(extra, dtype=bool)))
+        self.ages = np.concatenate((self.ages,
+                                    np.zeros(extra, dtype=np.int64)))
+        self.generations = np.concatenate((self.generations,
+                                           np.zeros(extra, dtype=np.int64)))
+        self.__free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+
+def rows_of(game_objects):
+    return np.fromiter((game_object.row for game_object in game_objects),
+                       dtype=np.intp, count=len(game_objects))
+
+
+entity_store = EntityStore()
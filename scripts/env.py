@@ -0,0 +1,162 @@
+import numpy as np
+
+from scripts.controls import InputFlag
+from scripts.entities import EntityKind
+from scripts.game import Asteroids, GameState
+
+ACTION_MASK = int(InputFlag.LEFT | InputFlag.RIGHT | InputFlag.UP
+                  | InputFlag.SHOOT)
+
+
+class AsteroidsEnv:
+    ACTION_COUNT = ACTION_MASK + 1
+    SHIP_FEATURES = 8
+    OBJECT_FEATURES = 6
+    SPEED_SCALE = 10.0
+    RADIUS_SCALE = 100.0
+    ROW_BITS = 24
+    GROUP_SHIFT = ROW_BITS + 32
+
+    def __init__(self, nearest_asteroids=8, nearest_ufos=2,
+                 nearest_bullets=4, max_steps=36000, death_penalty=100):
+        self.slots = ((EntityKind.ASTEROID, nearest_asteroids),
+                      (EntityKind.UFO, nearest_ufos),
+                      (EntityKind.ENEMY_BULLET, nearest_bullets))
+        self.__unobserved = len(self.slots) << self.GROUP_SHIFT
+        self.__group_codes = np.full(len(EntityKind), self.__unobserved,
+                                     dtype=np.int64)
+        self.__group_slots = []
+        first_slot = 0
+        for group, (kind, count) in enumerate(self.slots):
+            self.__group_codes[kind] = group << self.GROUP_SHIFT
+            self.__group_slots.append((group << self.GROUP_SHIFT,
+                                       (group + 1) << self.GROUP_SHIFT,
+                                       first_slot, count))
+            first_slot += count
+        self.__capacity = 0
+        self.__origin = np.zeros(2)
+        self.__row_mask = (1 << self.ROW_BITS) - 1
+        self.max_steps = max_steps
+        self.death_penalty = death_penalty
+        object_count = nearest_asteroids + nearest_ufos + nearest_bullets
+        self.observation_shape = (self.SHIP_FEATURES
+                                  + object_count * self.OBJECT_FEATURES,)
+        self.observation = np.zeros(self.observation_shape, dtype=np.float32)
+        self.__ship = self.observation[:self.SHIP_FEATURES]
+        self.__objects = self.observation[self.SHIP_FEATURES:].reshape(
+            object_count, self.OBJECT_FEATURES)
+        self.__selected = np.zeros(object_count, dtype=np.intp)
+        self.__values = np.zeros((object_count, 2))
+        self.info = {"score": 0, "lives": 0, "level": 0, "steps": 0,
+                     "state": None}
+        self.game = None
+        self.__steps = 0
+        self.__score = 0
+        self.__lives = 0
+
+    def reset(self, seed=None):
+        if self.game is None:
+            self.game = Asteroids(headless=True, seed=seed)
+        else:
+            self.game.seed = seed
+            self.game.restart(to_menu=False)
+        self.__steps = 0
+        self.__score = self.game.spaceship.score
+        self.__lives = self.game.spaceship.lives
+        self.__size = np.array(self.game.screen_size, dtype=np.float64)
+        self.__half_size = self.__size / 2
+        self.__observe()
+        return self.observation
+
+    def step(self, action):
+        self.game.step(int(action) & ACTION_MASK)
+        self.__steps += 1
+        spaceship = self.game.spaceship
+        reward = spaceship.score - self.__score \
+            - self.death_penalty * (self.__lives - spaceship.lives)
+        self.__score = spaceship.score
+        self.__lives = spaceship.lives
+        done = self.game.game_state is not GameState.GAME or \
+            self.__steps >= self.max_steps
+        self.__observe()
+        return self.observation, reward, done, self.info
+
+    def __observe(self):
+        store = self.game.entities
+        spaceship = self.game.spaceship
+        size = store.size
+        width, height = self.game.screen_size
+
+        x, y = store.positions[spaceship.row].tolist()
+        velocity_x, velocity_y = store.velocities[spaceship.row].tolist()
+        self.__ship[:] = (x / width, y / height,
+                          velocity_x / self.SPEED_SCALE,
+                          velocity_y / self.SPEED_SCALE,
+                          spaceship.direction.x, spaceship.direction.y,
+                          spaceship.lives, self.game.level)
+
+        if size > self.__capacity:
+            self.__reserve(store.capacity)
+        self.__origin[:] = x, y
+        delta = self.__delta[:size]
+        squares = self.__squares[:size]
+        np.subtract(store.positions[:size], self.__origin, out=delta)
+        delta += self.__half_size
+        np.mod(delta, self.__size, out=delta)
+        delta -= self.__half_size
+        np.multiply(delta, delta, out=squares)
+        np.add(squares[:, 0], squares[:, 1], out=self.__distances[:size])
+
+        keys = self.__keys[:size]
+        codes = self.__codes[:size]
+        np.left_shift(self.__distance_bits[:size], self.ROW_BITS, out=keys,
+                      dtype=np.int64)
+        keys |= self.__rows[:size]
+        self.__group_codes.take(store.kinds[:size], out=codes)
+        np.copyto(codes, self.__unobserved,
+                  where=np.logical_not(store.alive[:size],
+                                       out=self.__dead[:size]))
+        keys |= codes
+        keys.sort()
+
+        objects = self.__objects
+        present = objects[:, 0]
+        present.fill(0)
+        rows = self.__selected
+        for start_code, end_code, first_slot, count in self.__group_slots:
+            start = int(keys.searchsorted(start_code))
+            found = min(count, int(keys.searchsorted(end_code)) - start)
+            np.bitwise_and(keys[start:start + found], self.__row_mask,
+                           out=rows[first_slot:first_slot + found])
+            present[first_slot:first_slot + found] = 1
+
+        values = self.__values
+        self.__delta.take(rows, axis=0, out=values, mode="clip")
+        np.divide(values, self.__size, out=objects[:, 1:3],
+                  casting="same_kind")
+        store.velocities.take(rows, axis=0, out=values, mode="clip")
+        np.divide(values, self.SPEED_SCALE, out=objects[:, 3:5],
+                  casting="same_kind")
+        store.radii.take(rows, out=values[:, 0], mode="clip")
+        np.divide(values[:, 0], self.RADIUS_SCALE, out=objects[:, 5],
+                  casting="same_kind")
+        objects[:, 1:] *= objects[:, :1]
+
+        self.info["score"] = spaceship.score
+        self.info["lives"] = spaceship.lives
+        self.info["level"] = self.game.level
+        self.info["steps"] = self.__steps
+        self.info["state"] = self.game.game_state.name
+
+    def __reserve(self, capacity):
+        if capacity <= self.__capacity:
+            return
+        self.__capacity = capacity
+        self.__delta = np.zeros((capacity, 2))
+        self.__squares = np.zeros((capacity, 2))
+        self.__distances = np.zeros(capacity, dtype=np.float32)
+        self.__distance_bits = self.__distances.view(np.int32)
+        self.__keys = np.zeros(capacity, dtype=np.int64)
+        self.__codes = np.zeros(capacity, dtype=np.int64)
+        self.__rows = np.arange(capacity, dtype=np.int64)
+        self.__dead = np.zeros(capacity, dtype=bool)
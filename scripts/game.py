@@ -1,10 +1,27 @@
+import os
 import random
+import time
+import numpy as np
 import pygame
 from pygame_widgets.button import Button
 from pygame import Color, Vector2
-from scripts.utils import get_random_position, print_text, load_sprite, \
-    get_random_size, draw_buttons, load_sound
+from scripts.utils import print_text, load_sprite, get_random_size, \
+    preload_sprites, load_font, text_cache
 from scripts.models import Asteroid, Spaceship, Ufo, Bullet
+from scripts.pool import ProjectilePool
+from scripts.audio import channel_pool, sound_bank
+from scripts.entities import EntityStore, rows_of
+from scripts.spatial import SpatialHash, first_unclaimed
+from scripts.controls import InputFlag, read_keyboard
+from scripts.render import DRAW_LAYERS, DirtyRectRenderer, RenderQueue
+from scripts.menu import MenuRuntime
+from scripts.profiler import FrameProfiler
+from scripts.music import MusicPlayer
+from scripts.leaderboard import Leaderboard
+from scripts.spawn import SpawnPlanner
+from scripts.scheduler import Scheduler
+from scripts.savestate import WorldState, pack_world, unpack_world, \
+    SaveStateError, ASTEROID_RECORD, BULLET_RECORD, UFO_RECORD
 from enum import Enum
 
 
@@ -21,12 +38,39 @@ class GameState(Enum):
 
 class Asteroids:
     __MIN_ASTEROID_DISTANCE = 250
+    __MIN_SPAWN_SPACING = 150
+    __LEVELS = {1: (1, 1), 2: (4, 2), 3: (6, 3)}
+    __UFO_DIRECTIONS = ((0, 1), (1, 0), (-1, 0), (0, -1))
     __MIN_UFO_DISTANCE = 250
     __FRAMERATE = 60
+    __TICK_SECONDS = 1 / __FRAMERATE
+    __MAX_CATCH_UP_TICKS = 5
+    __PROFILER_KEY = pygame.K_F3
+    __PROFILER_EXPORT_KEY = pygame.K_F4
+    __PROFILER_OVERLAY_REFRESH = 30
+    __LEADERBOARD_PAGE_SIZE = 6
+    __QUICK_SAVE_KEY = pygame.K_F5
+    __QUICK_LOAD_KEY = pygame.K_F9
+    __QUICK_SAVE_PATH = "quicksave.sav"
+    __NOTICE_TICKS = 90
 
-    def __init__(self):
-        init_pygame()
-        self.__screen = pygame.display.set_mode((1500, 700))
+    def __init__(self, headless=False, seed=None, input_source=None,
+                 render_fps=60, vsync=False, recorder=None):
+        self.headless = headless
+        self.seed = seed
+        self.recorder = recorder
+        self.render_fps = render_fps
+        self.vsync = vsync
+        if seed is not None:
+            random.seed(seed)
+        init_pygame(headless)
+        if vsync and not headless:
+            self.__screen = pygame.display.set_mode((1500, 700),
+                                                    pygame.SCALED, vsync=1)
+        else:
+            self.__screen = pygame.display.set_mode((1500, 700))
+        preload_sprites()
+        self.__heart_image = load_sprite("heart")
         self.__default_text_pos = Vector2(self.__screen.get_width() // 2,
                                           self.__screen.get_height() // 12 * 6)
         self.__default_button_pos = Vector2(self.__screen.get_width() // 2,
@@ -40,48 +84,80 @@ class Asteroids:
                                                // 2,
                                                self.__default_input_field_size)
         self.__clock = pygame.time.Clock()
+        self.__renderer = DirtyRectRenderer(self.__screen)
+        self.__render_queue = RenderQueue()
+        self.__menu = MenuRuntime()
+        self.__grid = SpatialHash(*self.__screen.get_size())
+        self.__entities = EntityStore()
         self.__current_frame = 0
-        self.__font = pygame.font.Font(None, 64)
+        self.__accumulator = 0.0
+        self.__last_frame_time = None
+        self.skipped_ticks = 0
+        self.restart_seconds = None
+        self.profiler = FrameProfiler()
+        self.__profiler_lines = []
+        self.__notice = None
+        self.__font = load_font(None, 64)
+        self.__level_font = load_font(None, 28)
+        self.__hud_font = load_font(None, 32)
+        self.__profiler_font = load_font(None, 20)
+        self.__title_font = load_font(None, 90)
         self._nickname = "Default"
         self.__is_default_nickname = True
-        self.__leaderboard = {}
+        self.__leaderboard_page = 0
         self.__level = 1
         self.__ufo_quantity = 0
+        self.__spawn_planner = SpawnPlanner(
+            *self.__screen.get_size(), self.__MIN_SPAWN_SPACING,
+            self.__MIN_ASTEROID_DISTANCE)
+        self.__layout_seed = self.__new_layout_seed()
+        self.__scheduler = Scheduler()
+        self.__ufo_timer = None
+        self.__volleys = {}
+
+        self.__input_source = input_source
+        channel_pool.enabled = not headless
+        self.game_state_music = {GameState.MAIN_MENU: "Menu_m",
+                                 GameState.GAME: "Game_m",
+                                 GameState.WIN_MENU: "Win_m",
+                                 GameState.LOSE_MENU: "Lose_m",
+                                 GameState.PAUSE: "Game_m",
+                                 GameState.ENTER_NAME: "Lose_m",
+                                 GameState.LEADERBOARD: "Lose_m"}
+        self.music = MusicPlayer(enabled=not headless)
+        if not headless:
+            sound_bank.preload(exclude=set(self.game_state_music.values()))
 
-        self.menu_music = load_sound("Menu_m")
-        self.game_music = load_sound("Game_m")
-        self.win_music = load_sound("Win_m")
-        self.lose_music = load_sound("Lose_m")
-        self.musics = [self.menu_music,
-                       self.game_music,
-                       self.lose_music,
-                       self.win_music]
-        self.game_state_music = {GameState.MAIN_MENU: self.menu_music,
-                                 GameState.GAME: self.game_music,
-                                 GameState.WIN_MENU: self.win_music,
-                                 GameState.LOSE_MENU: self.lose_music,
-                                 GameState.PAUSE: self.game_music,
-                                 GameState.ENTER_NAME: self.lose_music,
-                                 GameState.LEADERBOARD: self.lose_music}
-
-        self.__game_state = GameState.MAIN_MENU
+        self.__game_state = GameState.GAME \
+            if headless or input_source is not None else GameState.MAIN_MENU
         self.__previous_game_state = GameState.PAUSE
         self.__asteroids = []
-        self.__bullets = []
-        self.__bullets_ufo = []
+        self.__bullet_pool = ProjectilePool(True, self.__entities)
+        self.__ufo_bullet_pool = ProjectilePool(False, self.__entities)
+        self.__bullets = self.__bullet_pool.active
+        self.__bullets_ufo = self.__ufo_bullet_pool.active
         self.__ufo = []
         self.__standard_spaceship_position = Vector2(
             self.__screen.get_width() / 2,
             self.__screen.get_height() / 2
         )
         self.__spaceship = Spaceship(self.__standard_spaceship_position,
-                                     self.__bullets.append)
+                                     None, self.__entities,
+                                     self.__bullet_pool)
+        self.__ships = []
         self.__generate_enemies()
-        self.__fill_leaderboard("record_table.txt")
+        if headless:
+            self.__leaderboard = Leaderboard(":memory:")
+        else:
+            self.__leaderboard = Leaderboard("leaderboard.db",
+                                             "record_table.txt")
 
     def start_game(self):
         while self.__game_state is not GameState.QUIT:
             self.adjust_music()
+            if self.__game_state is not GameState.GAME:
+                self.__renderer.invalidate()
+                self.__last_frame_time = None
             match self.__game_state:
                 case GameState.MAIN_MENU:
                     self.__show_main_menu()
@@ -90,20 +166,57 @@ class Asteroids:
                 case GameState.LEADERBOARD:
                     self.__show_leaderboard()
                 case GameState.GAME:
-                    self.__handle_input()
-                    self.__process_game_logic()
-                    self.__draw()
+                    self.__run_game_frame()
                 case GameState.PAUSE:
                     self.__pause_game()
                 case GameState.WIN_MENU:
-                    self.__record_score("record_table.txt")
+                    self.__record_score()
                     self.__show_win_menu()
                 case GameState.LOSE_MENU:
-                    self.__record_score("record_table.txt")
+                    self.__record_score()
                     self.__show_lose_menu()
         else:
             quit()
 
+    def restart(self, to_menu=True):
+        start = time.perf_counter()
+        if self.seed is not None:
+            random.seed(self.seed)
+        for game_object in [*self.__asteroids, *self.__ufo]:
+            game_object.stop_music()
+        for ship in self.__ships[:]:
+            self.remove_ship(ship)
+        self.__asteroids.clear()
+        self.__ufo.clear()
+        self.__volleys.clear()
+        self.__bullet_pool.clear()
+        self.__ufo_bullet_pool.clear()
+        self.__spaceship.reset(self.__standard_spaceship_position)
+
+        self.__level = 1
+        self.__ufo_quantity = 0
+        self.__layout_seed = self.__new_layout_seed()
+        self.__current_frame = 0
+        self.__scheduler.clear(now=0)
+        self.__ufo_timer = None
+        self.__accumulator = 0.0
+        self.__last_frame_time = None
+        self.skipped_ticks = 0
+        self.__notice = None
+        self.__leaderboard_page = 0
+        self.__generate_enemies()
+        self.__entities.snapshot()
+        self.__renderer.invalidate()
+
+        self.__previous_game_state = GameState.PAUSE
+        if to_menu:
+            self._nickname = "Default"
+            self.__is_default_nickname = True
+            self.__game_state = GameState.MAIN_MENU
+        else:
+            self.__game_state = GameState.GAME
+        self.restart_seconds = time.perf_counter() - start
+
     def adjust_music(self):
         is_to_leaderboard_or_enter_name = (
                 self.__previous_game_state is GameState.MAIN_MENU and
@@ -113,208 +226,550 @@ class Asteroids:
                 self.__previous_game_state in
                 [GameState.ENTER_NAME, GameState.LEADERBOARD] and
                 self.__game_state is GameState.MAIN_MENU)
-        is_from_pause_to_game = (
-                self.__previous_game_state is GameState.PAUSE and
-                self.__game_state is GameState.GAME)
-        is_from_or_to_pause = (
-                (is_from_pause_to_game) or
-                (self.__previous_game_state is GameState.GAME and
-                 self.__game_state is GameState.PAUSE))
-        if (self.__previous_game_state != self.__game_state and
-                (not is_to_leaderboard_or_enter_name) and
-                (not is_from_leaderboard_or_enter_name) and
-                (not (is_from_or_to_pause))):
-            self.stop_all_music()
-            self.__play_music()
-        if is_from_pause_to_game:
-            self.game_music.set_volume(1)
-        if (self.__previous_game_state is GameState.GAME and
-                self.__game_state is GameState.PAUSE):
-            self.game_music.set_volume(0.2)
-        if self.__previous_game_state != self.__game_state:
-            self.__previous_game_state = self.__game_state
+        if self.__previous_game_state == self.__game_state:
+            return
+        if not is_to_leaderboard_or_enter_name and \
+                not is_from_leaderboard_or_enter_name:
+            self.music.play(self.game_state_music.get(self.__game_state))
+        self.music.duck(self.__game_state is GameState.PAUSE)
+        self.__previous_game_state = self.__game_state
+
+    def __run_game_frame(self):
+        self.profiler.begin_frame()
+        now = time.perf_counter()
+        if self.__last_frame_time is None:
+            self.__last_frame_time = now - self.__TICK_SECONDS
+            self.__accumulator = 0.0
+        self.__accumulator += now - self.__last_frame_time
+        self.__last_frame_time = now
+
+        ticks = 0
+        while self.__accumulator >= self.__TICK_SECONDS and \
+                self.__game_state is GameState.GAME:
+            if ticks == self.__MAX_CATCH_UP_TICKS:
+                self.skipped_ticks += int(self.__accumulator
+                                          // self.__TICK_SECONDS)
+                self.__accumulator %= self.__TICK_SECONDS
+                break
+            self.step()
+            self.__accumulator -= self.__TICK_SECONDS
+            ticks += 1
+        self.__draw(self.__accumulator / self.__TICK_SECONDS)
+        self.profiler.end_frame()
+
+    def step(self, input_flags=None, ship_inputs=None):
+        if self.recorder is not None and self.recorder.wants_keyframe():
+            self.recorder.keyframe(self.capture_state())
+        if input_flags is None:
+            input_flags = self.__handle_input()
+        input_flags = InputFlag(input_flags)
+        if self.recorder is not None:
+            self.recorder.record(input_flags)
+        self.__apply_input(input_flags)
+        if ship_inputs:
+            for ship, flags in ship_inputs.items():
+                if ship.is_alive:
+                    self.__steer(ship, InputFlag(flags))
+        self.profiler.lap("input")
+        self.__entities.snapshot()
+        self.__process_game_logic()
+        self.__current_frame += 1
+
+    def simulate(self, max_frames):
+        start = time.perf_counter()
+        frames = 0
+        while frames < max_frames and self.__game_state is GameState.GAME:
+            self.profiler.begin_frame()
+            self.step()
+            self.profiler.end_frame()
+            frames += 1
+        elapsed = time.perf_counter() - start
+        return {"seed": self.seed,
+                "frames": frames,
+                "seconds": elapsed,
+                "fps": frames / elapsed if elapsed else float("inf"),
+                "level": self.__level,
+                "score": self.__spaceship.score,
+                "lives": self.__spaceship.lives,
+                "state": self.__game_state.name}
+
+    @property
+    def entities(self):
+        return self.__entities
+
+    @property
+    def spaceship(self):
+        return self.__spaceship
+
+    @property
+    def ships(self):
+        return [self.__spaceship, *self.__ships]
+
+    @property
+    def game_objects(self):
+        return self.__get_game_objects()
+
+    @property
+    def enemy_bullets(self):
+        return self.__bullets_ufo
+
+    def add_ship(self):
+        ship = Spaceship(self.__standard_spaceship_position, None,
+                         self.__entities, self.__bullet_pool)
+        self.__ships.append(ship)
+        return ship
+
+    def remove_ship(self, ship):
+        if ship in self.__ships:
+            ship.stop_music()
+            self.__ships.remove(ship)
+            self.__entities.release(ship.row, ship.generation)
+
+    @property
+    def level(self):
+        return self.__level
+
+    @property
+    def game_state(self):
+        return self.__game_state
+
+    @property
+    def screen_size(self):
+        return self.__screen.get_size()
+
+    def capture_state(self):
+        spaceship = self.__spaceship
+        return pack_world(WorldState(
+            self.__current_frame, self.__level, self.__ufo_quantity,
+            -1 if self.__ufo_timer is None else self.__ufo_timer.tick,
+            list(GameState).index(self.__game_state), random.getstate(),
+            (*spaceship.position, *spaceship.velocity, *spaceship.direction,
+             spaceship.score, spaceship.lives, spaceship.is_alive,
+             spaceship.was_rotating, spaceship.was_moved),
+            self.__capture_asteroids(),
+            self.__capture_motion(BULLET_RECORD, self.__bullets),
+            self.__capture_motion(BULLET_RECORD, self.__bullets_ufo),
+            self.__capture_ufos()))
+
+    def __capture_motion(self, dtype, objects):
+        rows = rows_of(objects)
+        records = np.empty(len(rows), dtype=dtype)
+        records["x"] = self.__entities.positions[rows, 0]
+        records["y"] = self.__entities.positions[rows, 1]
+        records["vx"] = self.__entities.velocities[rows, 0]
+        records["vy"] = self.__entities.velocities[rows, 1]
+        return records
+
+    def __capture_asteroids(self):
+        records = self.__capture_motion(ASTEROID_RECORD, self.__asteroids)
+        records["size"] = [asteroid.initial_size
+                           for asteroid in self.__asteroids]
+        records["reduction_size"] = [asteroid.reduction_size
+                                     for asteroid in self.__asteroids]
+        return records
+
+    def __capture_ufos(self):
+        records = self.__capture_motion(UFO_RECORD, self.__ufo)
+        records["age"] = self.__entities.ages[rows_of(self.__ufo)]
+        return records
+
+    def __restore_motion(self, objects, records):
+        rows = rows_of(objects)
+        self.__entities.positions[rows, 0] = records["x"]
+        self.__entities.positions[rows, 1] = records["y"]
+        self.__entities.velocities[rows, 0] = records["vx"]
+        self.__entities.velocities[rows, 1] = records["vy"]
+
+    def restore_state(self, data):
+        world = unpack_world(data)
+        self.__current_frame = world.frame
+        self.__level = world.level
+        self.__ufo_quantity = world.ufo_quantity
+        self.__game_state = list(GameState)[world.game_state]
+
+        x, y, velocity_x, velocity_y, direction_x, direction_y, score, \
+            lives, is_alive, was_rotating, was_moved = world.spaceship
+        self.__spaceship.position = (x, y)
+        self.__spaceship.velocity = (velocity_x, velocity_y)
+        self.__spaceship.direction = Vector2(direction_x, direction_y)
+        self.__spaceship.score = score
+        self.__spaceship.lives = lives
+        self.__spaceship.is_alive = is_alive
+        self.__spaceship.was_rotating = was_rotating
+        self.__spaceship.was_moved = was_moved
+
+        self.__asteroids[:] = [
+            Asteroid((0, 0), self.__asteroids.append, size, reduction_size,
+                     self.__entities)
+            for size, reduction_size in zip(
+                world.asteroids["size"].tolist(),
+                world.asteroids["reduction_size"].tolist())]
+        self.__restore_motion(self.__asteroids, world.asteroids)
+        for pool, bullets in ((self.__bullet_pool, world.bullets),
+                              (self.__ufo_bullet_pool, world.ufo_bullets)):
+            pool.clear()
+            for _ in range(len(bullets)):
+                pool.spawn((0, 0), (0, 0))
+            self.__restore_motion(pool.active, bullets)
+        self.__ufo[:] = [Ufo((0, 0), (0, 0), None, self.__entities,
+                             self.__ufo_bullet_pool)
+                         for _ in range(len(world.ufos))]
+        self.__restore_motion(self.__ufo, world.ufos)
+        self.__entities.ages[rows_of(self.__ufo)] = world.ufos["age"]
+        self.__restore_timers(world)
+
+        random.setstate(world.random_state)
+        self.__entities.snapshot()
+        self.__renderer.invalidate()
+
+    def __restore_timers(self, world):
+        self.__scheduler.clear(now=world.frame)
+        self.__ufo_timer = None
+        if world.ufo_spawn_frame >= 0:
+            self.__ufo_timer = self.__scheduler.schedule(
+                world.ufo_spawn_frame, self.__spawn_ufo)
+        self.__volleys.clear()
+        for ufo, age in zip(self.__ufo, world.ufos["age"].tolist()):
+            self.__schedule_volley(
+                ufo, world.frame + Ufo.BULLET_FREQUENCY - 1
+                - age % Ufo.BULLET_FREQUENCY)
 
     def __handle_input(self):
-        for event in pygame.event.get():
+        if self.__input_source is not None:
+            if not self.headless:
+                self.__handle_window_events(pygame.event.get())
+            return self.__input_source.next_input()
+        events = pygame.event.get()
+        self.__handle_window_events(events)
+        input_flags, _ = read_keyboard(events)
+        return input_flags
+
+    def __handle_window_events(self, events):
+        for event in events:
+            self.music.handle_event(event)
             if event.type == pygame.QUIT:
                 self.__game_state = GameState.QUIT
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.__game_state = GameState.PAUSE
-                elif self.__spaceship.is_alive and event.key == pygame.K_SPACE:
-                    self.__spaceship.shoot()
+        self.__handle_profiler_keys(events)
+        self.__handle_save_keys(events)
+
+    def __handle_profiler_keys(self, events):
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == self.__PROFILER_KEY:
+                self.profiler.toggle()
+                self.__profiler_lines = []
+                self.__renderer.invalidate()
+            elif event.key == self.__PROFILER_EXPORT_KEY:
+                self.profiler.export(
+                    time.strftime("profile_%Y%m%d_%H%M%S.csv"))
 
-        is_key_pressed = pygame.key.get_pressed()
+    def __handle_save_keys(self, events):
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == self.__QUICK_SAVE_KEY:
+                self.quick_save()
+            elif event.key == self.__QUICK_LOAD_KEY and \
+                    self.recorder is None and self.__input_source is None:
+                self.quick_load()
 
+    def quick_save(self, path=None):
+        if path is None:
+            path = self.__QUICK_SAVE_PATH
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as save_file:
+            save_file.write(self.capture_state())
+        os.replace(temporary_path, path)
+        self.__show_notice("Quick save")
+
+    def quick_load(self, path=None):
+        if path is None:
+            path = self.__QUICK_SAVE_PATH
+        try:
+            with open(path, "rb") as save_file:
+                self.restore_state(save_file.read())
+        except (OSError, SaveStateError):
+            self.__show_notice("No quick save")
+            return False
+        self.__show_notice("Quick load")
+        return True
+
+    def __show_notice(self, text):
+        self.__notice = (text, self.__current_frame + self.__NOTICE_TICKS)
+
+    def __apply_input(self, input_flags):
+        if input_flags & InputFlag.PAUSE and not self.headless and \
+                self.__input_source is None:
+            self.__game_state = GameState.PAUSE
         if self.__spaceship.is_alive:
-            if is_key_pressed[pygame.K_RIGHT]:
-                self.__spaceship.rotate(clockwise=True)
-            elif is_key_pressed[pygame.K_LEFT]:
-                self.__spaceship.rotate(clockwise=False)
-            else:
-                self.__spaceship.stop_rotating()
-            if is_key_pressed[pygame.K_UP]:
-                self.__spaceship.accelerate()
-            else:
-                self.__spaceship.not_accelerate()
+            self.__steer(self.__spaceship, input_flags)
+
+    def __steer(self, ship, input_flags):
+        if input_flags & InputFlag.SHOOT:
+            ship.shoot()
+        if input_flags & InputFlag.RIGHT:
+            ship.rotate(clockwise=True)
+        elif input_flags & InputFlag.LEFT:
+            ship.rotate(clockwise=False)
+        else:
+            ship.stop_rotating()
+        if input_flags & InputFlag.UP:
+            ship.accelerate()
+        else:
+            ship.not_accelerate()
 
     def __process_game_logic(self):
+        channel_pool.begin_frame()
         self.__move_objects()
+        self.profiler.lap("move")
         self.__process_bullets_logic()
-        if self.__ufo_quantity > 0:
-            self.__generate_ufo()
+        self.profiler.lap("bullets")
+        self.__scheduler.advance(self.__current_frame)
+        self.profiler.lap("timers")
         self.__process_ufo_logic()
+        self.profiler.lap("ufo")
         self.__check_bullets_collision()
+        self.profiler.lap("bullets_collision")
         self.__check_ufo_collision()
+        self.profiler.lap("ufo_collision")
         self.__check_asteroids_collision()
+        self.profiler.lap("asteroids_collision")
         self.__check_spaceship_collision()
+        self.profiler.lap("spaceship_collision")
         self.__check_game_state()
+        self.profiler.lap("game_state")
+        self.__spawn_planner.advance()
+        self.profiler.lap("spawn_planner")
 
-    def __draw(self):
-        self.__screen.fill(Color("black"))
+    def __draw(self, alpha=1.0):
+        self.__renderer.begin_frame()
         pygame.display.set_caption("Asteroids")
         if self.__spaceship.is_alive:
-            heart_image = load_sprite("heart")
-            heart_rect = heart_image.get_rect()
+            heart_rect = self.__heart_image.get_rect()
             for i in range(self.__spaceship.lives):
-                self.__screen.blit(heart_image,
-                                   (10 + i * heart_rect.width, 10))
-
-            print_text(self.__screen, f'Level {self.__level}',
-                       pygame.font.Font(None, 28),
-                       Vector2(48, 50), (150, 150, 150))
-            print_text(self.__screen, f'Score: {self.__spaceship.score}',
-                       pygame.font.Font(None, 32),
-                       Vector2(self.__screen.get_size()[0] // 2, 20))
-            print_text(self.__screen, self._nickname,
-                       pygame.font.Font(None, 32),
-                       Vector2(self.__screen.get_size()[0] // 2, 50),
-                       (150, 150, 150))
-
-        for game_object in self.__get_game_objects():
-            game_object.draw(self.__screen)
-
-        pygame.display.flip()
-        self.__clock.tick(self.__FRAMERATE)
-        self.__current_frame += 1
+                self.__renderer.blit(self.__heart_image,
+                                     (10 + i * heart_rect.width, 10))
+
+            self.__renderer.add(print_text(
+                self.__screen, f'Level {self.__level}', self.__level_font,
+                Vector2(48, 50), (150, 150, 150)))
+            self.__renderer.add(print_text(
+                self.__screen, f'Score: {self.__spaceship.score}',
+                self.__hud_font,
+                Vector2(self.__screen.get_size()[0] // 2, 20)))
+            self.__renderer.add(print_text(
+                self.__screen, self._nickname, self.__hud_font,
+                Vector2(self.__screen.get_size()[0] // 2, 50),
+                (150, 150, 150)))
+        if self.__notice is not None:
+            text, until = self.__notice
+            if self.__current_frame < until:
+                self.__renderer.add(print_text(
+                    self.__screen, text, self.__hud_font,
+                    Vector2(self.__screen.get_size()[0] // 2, 80),
+                    (200, 200, 0)))
+            else:
+                self.__notice = None
+        self.profiler.lap("hud")
+
+        game_objects = self.__get_game_objects()
+        rows = rows_of(game_objects)
+        positions = self.__entities.interpolate(rows, alpha,
+                                                *self.__screen.get_size())
+        self.__renderer.add_boxes(self.__render_queue.add_sprites(
+            DRAW_LAYERS[self.__entities.kinds[rows]],
+            [game_object.region for game_object in game_objects],
+            positions))
+        self.__render_queue.flush(self.__screen)
+        self.profiler.lap("objects")
+        if self.profiler.enabled:
+            self.__draw_profiler_overlay()
+            self.profiler.lap("overlay")
+
+        self.__renderer.end_frame()
+        self.profiler.lap("flip")
+        if self.render_fps:
+            self.__clock.tick(self.render_fps)
+        else:
+            self.__clock.tick()
+        self.profiler.lap("tick")
+
+    def __draw_profiler_overlay(self):
+        if not self.__profiler_lines or \
+                self.profiler.frames % self.__PROFILER_OVERLAY_REFRESH == 0:
+            self.__profiler_lines = self.profiler.overlay_lines()
+        top = 90
+        for line in self.__profiler_lines:
+            text = text_cache.render(self.__profiler_font, line,
+                                     (200, 200, 0))
+            self.__renderer.blit(text, (10, top))
+            top += text.get_height()
+
+    def __new_layout_seed(self):
+        if self.seed is not None:
+            return self.seed
+        return random.getrandbits(32)
 
     def __generate_enemies(self):
-        match self.__level:
-            case 1:
-                self.__generate_asteroids(1)
-                self.__ufo_quantity = 1
-            case 2:
-                self.__generate_asteroids(4)
-                self.__ufo_quantity = 2
-            case 3:
-                self.__generate_asteroids(6)
-                self.__ufo_quantity = 3
-
-    def __generate_asteroids(self, asteroids_quantity):
-        for _ in range(asteroids_quantity):
-            while True:
-                position = get_random_position(self.__screen)
-                if position.distance_to(self.__spaceship.position) \
-                        > self.__MIN_ASTEROID_DISTANCE:
-                    break
+        if self.__level not in self.__LEVELS:
+            return
+        asteroids_quantity, self.__ufo_quantity = self.__LEVELS[self.__level]
+        self.__schedule_ufo(self.__FRAMERATE * 3)
+        self.__generate_asteroids(self.__spawn_planner.layout(
+            self.__layout_seed, self.__level, asteroids_quantity,
+            self.__standard_spaceship_position))
+        next_level = self.__level + 1
+        if next_level in self.__LEVELS:
+            self.__spawn_planner.prepare(
+                self.__layout_seed, next_level, self.__LEVELS[next_level][0],
+                self.__standard_spaceship_position)
 
+    def __generate_asteroids(self, positions):
+        for position in positions:
             self.__asteroids.append(Asteroid(position, self.__asteroids.append,
-                                             get_random_size(0.8, 1.5)))
+                                             get_random_size(0.8, 1.5),
+                                             store=self.__entities))
 
     def __get_game_objects(self):
         game_objects = [*self.__asteroids, *self.__bullets, *self.__ufo,
                         *self.__bullets_ufo]
         if self.__spaceship.is_alive:
             game_objects.append(self.__spaceship)
+        game_objects.extend(ship for ship in self.__ships if ship.is_alive)
 
         return game_objects
 
     def __check_spaceship_collision(self):
-        for asteroid in self.__asteroids[:]:
-            self.__spaceship_wrecked_logic(asteroid, True)
-        for bullet in self.__bullets_ufo[:]:
-            self.__spaceship_wrecked_logic(bullet, False)
-        for ufo in self.__ufo[:]:
-            self.__spaceship_wrecked_logic(ufo, True)
-
-    def __spaceship_wrecked_logic(self, collision_object, teleport):
-        if self.__spaceship.is_alive \
-                and collision_object.collides_with(self.__spaceship):
+        self.__check_ship_collision(self.__spaceship)
+        for ship in self.__ships:
+            self.__check_ship_collision(ship)
+
+    def __check_ship_collision(self, ship):
+        objects = [*self.__asteroids, *self.__bullets_ufo, *self.__ufo]
+        if not ship.is_alive or not objects:
+            return
+        _, hits = self.__grid.store_pairs(self.__entities, [ship.row],
+                                          rows_of(objects))
+        if not len(hits):
+            return
+        for objects, teleport in ((self.__asteroids, True),
+                                  (self.__bullets_ufo, False),
+                                  (self.__ufo, True)):
+            if not ship.is_alive:
+                return
+            self.__check_spaceship_candidates(ship, objects, teleport)
+
+    def __check_spaceship_candidates(self, ship, objects, teleport,
+                                     first_index=0):
+        _, hits = self.__grid.store_pairs(ship.store, [ship.row],
+                                          rows_of(objects))
+        candidates = [(index, objects[index]) for index in hits.tolist()
+                      if index >= first_index]
+        for index, collision_object in candidates:
+            position = ship.position
+            self.__spaceship_wrecked_logic(ship, collision_object, teleport)
+            if ship.position != position:
+                self.__check_spaceship_candidates(ship, objects, teleport,
+                                                  index + 1)
+                return
+
+    def __spaceship_wrecked_logic(self, ship, collision_object, teleport):
+        if ship.is_alive and collision_object.collides_with(ship):
             if teleport:
-                self.__spaceship.position = self.__standard_spaceship_position
+                ship.place(self.__standard_spaceship_position)
             if type(collision_object) is Bullet:
-                self.__bullets_ufo.remove(collision_object)
-            self.__spaceship.lives -= 1
-            self.__check_death()
-            self.__spaceship.impact_sound.play()
+                self.__ufo_bullet_pool.despawn(collision_object)
+            ship.lives -= 1
+            self.__check_death(ship)
+            ship.impact_sound.play()
 
     def __process_bullets_logic(self):
-        for bullet in self.__bullets[:]:
-            if not self.__screen.get_rect().collidepoint(bullet.position):
-                self.__bullets.remove(bullet)
+        if self.__bullets:
+            outside = self.__entities.outside(rows_of(self.__bullets),
+                                              *self.__screen.get_size())
+            self.__bullet_pool.despawn_indices(np.flatnonzero(outside))
+
+    def __find_hits(self, objects, other_objects):
+        if not objects or not other_objects:
+            return []
+        return first_unclaimed(*self.__grid.store_pairs(
+            self.__entities, rows_of(objects), rows_of(other_objects)))
 
     def __check_bullets_collision(self):
-        for bullet in self.__bullets[:]:
-            for bullet_ufo in self.__bullets_ufo[:]:
-                if bullet.collides_with(bullet_ufo):
-                    self.__bullets.remove(bullet)
-                    self.__bullets_ufo.remove(bullet_ufo)
-                    break
+        hits = self.__find_hits(self.__bullets, self.__bullets_ufo)
+        self.__bullet_pool.despawn_indices([bullet for bullet, _ in hits])
+        self.__ufo_bullet_pool.despawn_indices([bullet for _, bullet in hits])
 
     def __check_ufo_collision(self):
-        for bullet in self.__bullets[:]:
-            for ufo in self.__ufo[:]:
-                if bullet.collides_with(ufo):
-                    ufo.destroy()
-                    self.__spaceship.score += 200
-                    self.__ufo.remove(ufo)
-                    self.__bullets.remove(bullet)
-                    break
+        hits = self.__find_hits(self.__bullets, self.__ufo)
+        for _, ufo in hits:
+            self.__ufo[ufo].destroy()
+            self.__spaceship.score += 200
+        self.__remove_ufos({ufo for _, ufo in hits})
+        self.__bullet_pool.despawn_indices([bullet for bullet, _ in hits])
 
     def __check_asteroids_collision(self):
-        for asteroid in self.__asteroids[:]:
-            for bullet in self.__bullets[:]:
-                if asteroid.collides_with(bullet):
-                    self.__asteroids.remove(asteroid)
-                    self.__bullets.remove(bullet)
-                    asteroid.split(self.__spaceship)
-                    break
-
-    def __generate_ufo(self):
-        directions = {0: (0, 1),
-                      1: (1, 0),
-                      2: (-1, 0),
-                      3: (0, -1)}
-        (random_x, random_y) = [random.randrange(self.__screen.get_width()),
-                                random.randrange(self.__screen.get_height())]
-        ufo_spawn = {(0, 1): (random_x, 0),
-                     (1, 0): (0, random_y),
-                     (-1, 0): (self.__screen.get_width() - 1, random_y),
-                     (0, -1): (random_x, self.__screen.get_height() - 1)}
-        if (self.__current_frame % (random.randrange(8, 12)
-                                    * self.__FRAMERATE)) == self.__FRAMERATE * 3:
-            direction = directions[random.randrange(4)]
-            position = ufo_spawn[direction]
-            self.__ufo.append(
-                Ufo(position, direction, self.__bullets_ufo.append))
-            self.__ufo_quantity -= 1
+        hits = self.__find_hits(self.__asteroids, self.__bullets)
+        asteroids = self.__asteroids[:]
+        for asteroid, _ in hits:
+            asteroids[asteroid].split(self.__spaceship)
+        remove_indices(self.__asteroids, {asteroid for asteroid, _ in hits})
+        self.__bullet_pool.despawn_indices([bullet for _, bullet in hits])
+
+    def __schedule_ufo(self, delay):
+        if self.__ufo_timer is not None:
+            self.__ufo_timer.cancel()
+        self.__ufo_timer = None
+        if self.__ufo_quantity > 0:
+            self.__ufo_timer = self.__scheduler.after(delay, self.__spawn_ufo)
+
+    def __spawn_ufo(self):
+        width, height = self.__screen.get_size()
+        direction = self.__UFO_DIRECTIONS[random.randrange(4)]
+        match direction:
+            case (0, 1):
+                position = (random.randrange(width), 0)
+            case (1, 0):
+                position = (0, random.randrange(height))
+            case (-1, 0):
+                position = (width - 1, random.randrange(height))
+            case _:
+                position = (random.randrange(width), height - 1)
+        ufo = Ufo(position, direction, None, self.__entities,
+                  self.__ufo_bullet_pool)
+        self.__ufo.append(ufo)
+        self.__schedule_volley(ufo, self.__scheduler.now)
+        self.__ufo_quantity -= 1
+        self.__schedule_ufo(random.randrange(8, 12) * self.__FRAMERATE)
+
+    def __schedule_volley(self, ufo, tick):
+        self.__volleys[ufo] = self.__scheduler.schedule(
+            tick, ufo.shoot, interval=ufo.BULLET_FREQUENCY)
+
+    def __remove_ufos(self, indices):
+        for index in indices:
+            volley = self.__volleys.pop(self.__ufo[index], None)
+            if volley is not None:
+                volley.cancel()
+        remove_indices(self.__ufo, indices)
 
     def __process_ufo_logic(self):
         if self.__ufo:
-            for ufo in self.__ufo[:]:
-                if ufo.current_frame_alive % ufo.BULLET_FREQUENCY == 0:
-                    ufo.shoot()
-                if not self.__screen.get_rect().collidepoint(ufo.position):
-                    self.__ufo.remove(ufo)
+            outside = self.__entities.outside(rows_of(self.__ufo),
+                                              *self.__screen.get_size())
+            self.__remove_ufos(set(np.flatnonzero(outside).tolist()))
 
     def __move_objects(self):
-        for game_object in self.__get_game_objects():
-            game_object.move(self.__screen)
+        self.__entities.move(*self.__screen.get_size())
 
-    def __check_death(self):
-        if self.__spaceship.lives == 0:
-            self.__spaceship.is_alive = False
-            self.__spaceship.stop_music()
+    def __check_death(self, ship):
+        if ship.lives == 0:
+            ship.is_alive = False
+            ship.velocity = Vector2(0)
+            ship.stop_music()
+            if ship is not self.__spaceship:
+                return
             for ufo in self.__ufo:
                 ufo.stop_music()
             for asteroid in self.__asteroids:
@@ -324,9 +779,26 @@ class Asteroids:
         print_text(self.__screen, text, self.__font,
                    self.__default_text_pos, color=color)
 
+    def __run_menu(self, game_state, draw, handle_event, buttons):
+        self.__menu.run(lambda: self.__game_state is game_state, draw,
+                        handle_event, buttons)
+
+    def __handle_quit_event(self, event):
+        if self.music.handle_event(event):
+            return False
+        if event.type == pygame.QUIT:
+            self.__game_state = GameState.QUIT
+            return True
+        return False
+
+    def __draw_menu_label(self, text, color):
+        def draw():
+            self.__screen.fill(Color("black"))
+            self.__draw_label(text, color)
+        return draw
+
     def __show_main_menu(self):
         pygame.display.set_caption("Menu")
-        self.__screen.fill(Color("black"))
         menu_buttons = [Button(self.__screen,
                                *(self.__default_button_pos
                                  - self.__default_button_size // 2),
@@ -347,17 +819,15 @@ class Asteroids:
                                onClick=lambda:
                                self.__change_game_state(
                                    GameState.LEADERBOARD))]
-        while self.__game_state is GameState.MAIN_MENU:
-            self.__draw_label("THE ASTEROIDS", "white")
-            draw_buttons(menu_buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                elif event.type == pygame.KEYDOWN:
-                    match event.key:
-                        case pygame.K_TAB:
-                            self.__game_state = GameState.LEADERBOARD
+        self.__run_menu(GameState.MAIN_MENU,
+                        self.__draw_menu_label("THE ASTEROIDS", "white"),
+                        self.__handle_main_menu_event, menu_buttons)
+
+    def __handle_main_menu_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+            self.__game_state = GameState.LEADERBOARD
+            return True
+        return self.__handle_quit_event(event)
 
     def __pause_game(self):
         pygame.display.set_caption("Paused")
@@ -370,23 +840,19 @@ class Asteroids:
                           radius=20,
                           onClick=lambda:
                           self.__change_game_state(GameState.MAIN_MENU))]
-        while self.__game_state is GameState.PAUSE:
-            self.__draw_label("PAUSED", "red")
-            draw_buttons(buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        pygame.display.set_caption("Asteroids")
-                        self.__game_state = GameState.GAME
-                        break
+        self.__run_menu(GameState.PAUSE,
+                        lambda: self.__draw_label("PAUSED", "red"),
+                        self.__handle_pause_event, buttons)
+
+    def __handle_pause_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            pygame.display.set_caption("Asteroids")
+            self.__game_state = GameState.GAME
+            return True
+        return self.__handle_quit_event(event)
 
     def __show_input_field(self):
         pygame.display.set_caption("Enter your name")
-        self.__screen.fill(Color("black"))
         buttons = [Button(self.__screen,
                           *(self.__default_button_pos -
                             self.__default_button_size // 2),
@@ -407,37 +873,63 @@ class Asteroids:
                           onClick=lambda:
                           self.__change_game_state(GameState.MAIN_MENU))
                    ]
-        while self.__game_state is GameState.ENTER_NAME:
-            draw_buttons(buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_BACKSPACE:
-                        self._nickname = self._nickname[:-1]
-                    elif event.key == pygame.K_RETURN:
-                        self.__game_state = GameState.GAME
-                        return
-                    elif len(self._nickname) <= 20:
-                        if self.__is_default_nickname:
-                            self._nickname = ""
-                            self.__is_default_nickname = False
-                        self._nickname += event.unicode
-            print_text(self.__screen, "Enter your name", self.__font,
-                       self.__default_text_pos - self.__default_delay * 1.8,
-                       Color("white"))
-            pygame.draw.rect(self.__screen, (156, 156, 156),
-                             self.__default_input_field_rect_pos)
-            print_text(self.__screen, self._nickname, self.__font,
-                       self.__default_text_pos - self.__default_delay // 2,
-                       Color("white"))
+        self.__run_menu(GameState.ENTER_NAME, self.__draw_input_field,
+                        self.__handle_input_field_event, buttons)
+
+    def __draw_input_field(self):
+        self.__screen.fill(Color("black"))
+        print_text(self.__screen, "Enter your name", self.__font,
+                   self.__default_text_pos - self.__default_delay * 1.8,
+                   Color("white"))
+        pygame.draw.rect(self.__screen, (156, 156, 156),
+                         self.__default_input_field_rect_pos)
+        print_text(self.__screen, self._nickname, self.__font,
+                   self.__default_text_pos - self.__default_delay // 2,
+                   Color("white"))
+
+    def __handle_input_field_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return self.__handle_quit_event(event)
+        if event.key == pygame.K_BACKSPACE:
+            self._nickname = self._nickname[:-1]
+        elif event.key == pygame.K_RETURN:
+            self.__game_state = GameState.GAME
+        elif len(self._nickname) <= 20:
+            if self.__is_default_nickname:
+                self._nickname = ""
+                self.__is_default_nickname = False
+            self._nickname += event.unicode
+        return True
 
     def __show_leaderboard(self):
         pygame.display.set_caption("Leaderboard")
-        self.__screen.fill(Color("black"))
+        self.__leaderboard_page = 0
+        page_button_size = Vector2(60, 50)
+        page_button_offset = Vector2(self.__default_button_size[0] // 2
+                                     + 20 + page_button_size[0] // 2, 0)
         menu_buttons = [Button(self.__screen,
+                               *(self.__default_button_pos
+                                 + self.__default_delay * 4
+                                 - page_button_offset
+                                 - page_button_size // 2),
+                               *page_button_size,
+                               text='<', fontSize=40,
+                               inactiveColour=(255, 0, 0),
+                               radius=20,
+                               onClick=lambda:
+                               self.__turn_leaderboard_page(-1)),
+                        Button(self.__screen,
+                               *(self.__default_button_pos
+                                 + self.__default_delay * 4
+                                 + page_button_offset
+                                 - page_button_size // 2),
+                               *page_button_size,
+                               text='>', fontSize=40,
+                               inactiveColour=(255, 0, 0),
+                               radius=20,
+                               onClick=lambda:
+                               self.__turn_leaderboard_page(1)),
+                        Button(self.__screen,
                                *(self.__default_button_pos
                                  + self.__default_delay * 4
                                  - self.__default_button_size // 2),
@@ -447,35 +939,65 @@ class Asteroids:
                                radius=20,
                                onClick=lambda:
                                self.__change_game_state(GameState.MAIN_MENU))]
-        print_text(self.__screen, "Leaderboard", pygame.font.Font(None, 90),
+        self.__run_menu(GameState.LEADERBOARD, self.__draw_leaderboard,
+                        self.__handle_leaderboard_event, menu_buttons)
+
+    def __draw_leaderboard(self):
+        self.__screen.fill(Color("black"))
+        print_text(self.__screen, "Leaderboard", self.__title_font,
                    (self.__screen.get_size()[0] // 2, self.__default_delay[1]),
                    Color("RED"))
+        page_count = self.__leaderboard.page_count(
+            self.__LEADERBOARD_PAGE_SIZE)
+        print_text(self.__screen,
+                   f"Page {self.__leaderboard_page + 1}/{page_count}",
+                   self.__level_font,
+                   (self.__screen.get_size()[0] // 2,
+                    self.__default_delay[1] * 1.8),
+                   Color("gray"))
         i = 1.5
-        for player, score in self.__leaderboard.items():
+        for rank, player, score in self.__leaderboard.page(
+                self.__leaderboard_page, self.__LEADERBOARD_PAGE_SIZE):
             i += 1
-            if i < 10:
-                print_text(self.__screen, f"{player}: {score}", self.__font,
-                           Vector2(self.__screen.get_size()[0] // 2,
-                                   self.__default_delay[1] * i),
-                           Color("white"))
-
-        pygame.display.flip()
-
-        while self.__game_state is GameState.LEADERBOARD:
-            draw_buttons(menu_buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                    return
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_TAB:
-                        self.__game_state = GameState.MAIN_MENU
-                        return
+            color = "yellow" if player == self._nickname else "white"
+            print_text(self.__screen, f"{rank}. {player}: {score}",
+                       self.__font,
+                       Vector2(self.__screen.get_size()[0] // 2,
+                               self.__default_delay[1] * i),
+                       Color(color))
+
+        rank = self.__leaderboard.rank(self._nickname)
+        if rank is not None:
+            score = self.__leaderboard.score(self._nickname)
+            print_text(self.__screen,
+                       f"Your position: {rank}. {self._nickname}: {score}",
+                       self.__hud_font,
+                       Vector2(self.__screen.get_size()[0] // 2,
+                               self.__default_delay[1] * 9),
+                       Color("yellow"))
+
+    def __turn_leaderboard_page(self, delta):
+        page_count = self.__leaderboard.page_count(
+            self.__LEADERBOARD_PAGE_SIZE)
+        self.__leaderboard_page = min(max(self.__leaderboard_page + delta, 0),
+                                      page_count - 1)
+
+    def __handle_leaderboard_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+            self.__game_state = GameState.MAIN_MENU
+            return True
+        if event.type == pygame.KEYDOWN and \
+                event.key in (pygame.K_LEFT, pygame.K_PAGEUP):
+            self.__turn_leaderboard_page(-1)
+            return True
+        if event.type == pygame.KEYDOWN and \
+                event.key in (pygame.K_RIGHT, pygame.K_PAGEDOWN):
+            self.__turn_leaderboard_page(1)
+            return True
+        return self.__handle_quit_event(event)
 
     def __show_win_menu(self):
         pygame.display.set_caption("WIN")
-        self.__screen.fill(Color("black"))
         win_buttons = [Button(self.__screen,
                               *(self.__default_button_pos -
                                 self.__default_button_size // 2),
@@ -496,18 +1018,12 @@ class Asteroids:
                               onClick=lambda:
                               self.__change_game_state(GameState.MAIN_MENU))
                        ]
-        while self.__game_state is GameState.WIN_MENU:
-            self.__draw_label("YOU WIN", "green")
-            draw_buttons(win_buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                    return
+        self.__run_menu(GameState.WIN_MENU,
+                        self.__draw_menu_label("YOU WIN", "green"),
+                        self.__handle_quit_event, win_buttons)
 
     def __show_lose_menu(self):
         pygame.display.set_caption("LOSE")
-        self.__screen.fill(Color("black"))
         lose_buttons = [Button(self.__screen,
                                *(self.__default_button_pos -
                                  self.__default_button_size // 2),
@@ -528,35 +1044,12 @@ class Asteroids:
                                onClick=lambda:
                                self.__change_game_state(GameState.MAIN_MENU))
                         ]
-        while self.__game_state is GameState.LOSE_MENU:
-            self.__draw_label("YOU LOSE", "red")
-            draw_buttons(lose_buttons)
-            pygame.display.flip()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.__game_state = GameState.QUIT
-                    return
-
-    def __record_score(self, filename):
-        if self._nickname not in self.__leaderboard:
-            self.__leaderboard[self._nickname] = self.__spaceship.score
-        if self.__spaceship.score > self.__leaderboard[self._nickname]:
-            self.__leaderboard[self._nickname] = self.__spaceship.score
-        self.__leaderboard = dict(sorted(self.__leaderboard.items(),
-                                         key=lambda item: item[1],
-                                         reverse=True))
-        with open(filename, "w") as record_table:
-            for player, score in self.__leaderboard.items():
-                record_table.write(f"{player}: {score} \n")
-
-    def __fill_leaderboard(self, filename):
-        with open(filename, "r") as record_table:
-            for string in record_table:
-                if not string.strip():
-                    return
-                player = string.split(":")[0]
-                score = int(string.split(":")[1][1:])
-                self.__leaderboard[player] = score
+        self.__run_menu(GameState.LOSE_MENU,
+                        self.__draw_menu_label("YOU LOSE", "red"),
+                        self.__handle_quit_event, lose_buttons)
+
+    def __record_score(self):
+        self.__leaderboard.record(self._nickname, self.__spaceship.score)
 
     def __check_game_state(self):
         if not self.__spaceship.is_alive:
@@ -564,10 +1057,11 @@ class Asteroids:
         elif not self.__asteroids and not self.__ufo and self.__level == 4:
             self.__game_state = GameState.WIN_MENU
         elif not self.__asteroids and not self.__ufo and self.__level < 4:
-            self.__spaceship.position = self.__standard_spaceship_position
-            self.__spaceship.direction = Vector2(0, -1)
-            self.__bullets.clear()
-            self.__bullets_ufo = []
+            for ship in self.ships:
+                ship.place(self.__standard_spaceship_position)
+                ship.direction = Vector2(0, -1)
+            self.__bullet_pool.clear()
+            self.__ufo_bullet_pool.clear()
             self.__level += 1
             self.__generate_enemies()
 
@@ -577,7 +1071,7 @@ class Asteroids:
                 if self.__previous_game_state not in [GameState.ENTER_NAME,
                                                       GameState.LEADERBOARD]:
                     self.stop_all_music()
-                    restart_game(self, True)
+                    self.restart(True)
                 else:
                     self.__game_state = GameState.MAIN_MENU
             case GameState.GAME:
@@ -587,27 +1081,23 @@ class Asteroids:
                 self.__game_state = game_state
 
     def stop_all_music(self):
-        for music in self.musics:
-            music.stop()
+        self.music.stop()
 
-    def __play_music(self):
-        if self.__game_state not in [GameState.QUIT, GameState.ENTER_NAME,
-                                     GameState.LEADERBOARD]:
-            self.game_state_music[self.__game_state].play()
-        if self.__game_state is GameState.PAUSE:
-            self.game_state_music[self.__game_state].set_volume(0.35)
 
-
-def init_pygame():
+def init_pygame(headless=False):
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
     pygame.init()
     pygame.display.set_caption("Asteroids")
 
 
+def remove_indices(objects, indices):
+    if indices:
+        objects[:] = [game_object
+                      for index, game_object in enumerate(objects)
+                      if index not in indices]
+
+
 def restart_game(asteroids, to_menu):
-    nickname = asteroids._nickname
-    asteroids.__init__()
-    if not to_menu:
-        asteroids._nickname = nickname
-        asteroids.__game_state = GameState.GAME
-    else:
-        asteroids.__game_state = GameState.MAIN_MENU
+    asteroids.restart(to_menu)
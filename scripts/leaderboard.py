@@ -0,0 +1,177 @@
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+
+from scripts.ranking import RankedIndex
+
+
+class Leaderboard:
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS scores ("
+              "player TEXT PRIMARY KEY, score INTEGER NOT NULL)",
+              "CREATE INDEX IF NOT EXISTS scores_by_score "
+              "ON scores (score DESC, player)",
+              "CREATE TABLE IF NOT EXISTS meta ("
+              "key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def __init__(self, path="leaderboard.db", legacy_path=None,
+                 build_index=True):
+        self.path = path
+        self.build_index = build_index
+        self.__index = None
+        self.__loading = None
+        self.__pending = []
+        self.__executor = None
+        self.__connection = sqlite3.connect(path, isolation_level=None)
+        if path != ":memory:":
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=FULL")
+        for statement in self.SCHEMA:
+            self.__connection.execute(statement)
+        if legacy_path is not None:
+            self.migrate(legacy_path)
+        if self.__loading is None and self.__index is None:
+            self.__start_index()
+
+    def record(self, player, score):
+        self.__connection.execute(
+            "INSERT INTO scores (player, score) VALUES (?, ?) "
+            "ON CONFLICT (player) DO UPDATE SET score = excluded.score "
+            "WHERE excluded.score > scores.score", (player, score))
+        if self.__index is not None:
+            self.__index.update(player, score)
+        elif self.__loading is not None:
+            self.__pending.append((player, score))
+
+    def best(self, player):
+        row = self.__connection.execute(
+            "SELECT score FROM scores WHERE player = ?", (player,)).fetchone()
+        return None if row is None else row[0]
+
+    def top(self, limit=10, offset=0):
+        return self.__connection.execute(
+            "SELECT player, score FROM scores "
+            "ORDER BY score DESC, player LIMIT ? OFFSET ?",
+            (limit, offset)).fetchall()
+
+    @property
+    def index(self):
+        if self.__loading is not None and self.__loading.done():
+            index = self.__loading.result()
+            for player, score in self.__pending:
+                index.update(player, score)
+            self.__index = index
+            self.__loading = None
+            self.__pending = []
+        return self.__index
+
+    def wait_for_index(self, timeout=None):
+        if self.__loading is not None:
+            self.__loading.result(timeout)
+        return self.index
+
+    def score(self, player):
+        if self.index is not None:
+            return self.__index.score(player)
+        return self.best(player)
+
+    def rank(self, player):
+        if self.index is not None:
+            return self.__index.rank(player)
+        score = self.best(player)
+        if score is None:
+            return None
+        return self.__connection.execute(
+            "SELECT (SELECT COUNT(*) FROM scores WHERE score > ?) + "
+            "(SELECT COUNT(*) FROM scores WHERE score = ? AND player < ?)",
+            (score, score, player)).fetchone()[0] + 1
+
+    def page(self, number, size):
+        if self.index is not None:
+            return self.__index.page(number, size)
+        if size <= 0:
+            return []
+        start = number * size
+        return [(start + position + 1, player, score)
+                for position, (player, score)
+                in enumerate(self.top(size, start))]
+
+    def page_count(self, size):
+        if self.index is not None:
+            return self.__index.page_count(size)
+        return max(1, -(-len(self) // size))
+
+    def migrate(self, legacy_path):
+        if self.__meta("migrated") is not None or \
+                not os.path.exists(legacy_path):
+            return 0
+        scores = parse_record_table(legacy_path)
+        with self.__transaction():
+            self.__connection.executemany(
+                "INSERT INTO scores (player, score) VALUES (?, ?) "
+                "ON CONFLICT (player) DO UPDATE SET score = excluded.score "
+                "WHERE excluded.score > scores.score", scores.items())
+            self.__connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated', ?)",
+                (os.path.abspath(legacy_path),))
+        self.__start_index()
+        return len(scores)
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True, cancel_futures=True)
+        self.__connection.close()
+
+    def __start_index(self):
+        self.__index = None
+        self.__loading = None
+        self.__pending = []
+        if not self.build_index:
+            return
+        if self.path == ":memory:":
+            self.__index = load_index(self.__connection)
+            return
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__loading = self.__executor.submit(self.__load_index)
+
+    def __load_index(self):
+        with closing(sqlite3.connect(self.path)) as connection:
+            return load_index(connection)
+
+    def __meta(self, key):
+        row = self.__connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    @contextmanager
+    def __transaction(self):
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.__connection
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+        self.__connection.execute("COMMIT")
+
+    def __len__(self):
+        return self.__connection.execute(
+            "SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+def load_index(connection):
+    return RankedIndex(connection.execute(
+        "SELECT player, score FROM scores ORDER BY score DESC, player"))
+
+
+def parse_record_table(filename):
+    scores = {}
+    with open(filename, "r") as record_table:
+        for string in record_table:
+            player, separator, score = string.rstrip("\n").rpartition(":")
+            if not separator or not score.strip().lstrip("-").isdigit():
+                continue
+            score = int(score)
+            if player not in scores or score > scores[player]:
+                scores[player] = score
+    return scores
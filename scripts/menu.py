@@ -0,0 +1,52 @@
+import pygame
+from pygame_widgets import Mouse
+
+
+class MenuRuntime:
+    EXPOSE_EVENTS = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE)
+
+    def __init__(self, max_fps=30, timeout=500):
+        self.max_fps = max_fps
+        self.timeout = timeout
+        self.redraws = 0
+        self.wakeups = 0
+        self.__clock = pygame.time.Clock()
+
+    def run(self, is_running, draw, handle_event, buttons=()):
+        needs_redraw = True
+        while is_running():
+            if needs_redraw:
+                draw()
+                for button in buttons:
+                    button.draw()
+                pygame.display.flip()
+                self.redraws += 1
+                needs_redraw = False
+                self.__clock.tick(self.max_fps)
+
+            events = self.wait_events()
+            if not events:
+                continue
+            needs_redraw = self.__listen_buttons(buttons, events)
+            for event in events:
+                if handle_event(event) or event.type in self.EXPOSE_EVENTS:
+                    needs_redraw = True
+                if not is_running():
+                    return
+
+    def wait_events(self):
+        event = pygame.event.wait(self.timeout)
+        self.wakeups += 1
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event, *pygame.event.get()]
+
+    @staticmethod
+    def __listen_buttons(buttons, events):
+        if not buttons:
+            return False
+        colours = [tuple(button.colour) for button in buttons]
+        Mouse.updateMouseState()
+        for button in buttons:
+            button.listen(events)
+        return colours != [tuple(button.colour) for button in buttons]
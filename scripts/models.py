@@ -1,19 +1,56 @@
+import weakref
+
 from pygame.math import Vector2
-from pygame.transform import rotozoom
-from scripts.utils import (get_random_velocity, load_sprite, wrap_position,
-                           load_sound)
+from scripts.audio import SoundEffect
+from scripts.entities import EntityKind, entity_store
+from scripts.utils import get_random_velocity, load_sprite, wrap_position, \
+    load_transformed_sprite, load_sprite_region
+
+UP = Vector2(0, -1)
 
 
 class GameObject:
-    def __init__(self, position, sprite, velocity):
-        self.position = Vector2(position)
-        self.sprite = sprite
-        self.radius = sprite.get_width() / 2
-        self.velocity = Vector2(velocity)
+    KIND = EntityKind.ASTEROID
+    WRAPS = True
 
-    def draw(self, surface):
-        blit_position = self.position - Vector2(self.radius)
-        surface.blit(self.sprite, blit_position)
+    def __init__(self, position, sprite, velocity, store=None, region=None):
+        self.store = entity_store if store is None else store
+        self.sprite = sprite
+        self.region = (sprite, sprite.get_rect()) if region is None \
+            else region
+        self.row, self.generation = self.store.allocate(
+            position, velocity, sprite.get_width() / 2, self.KIND, self.WRAPS)
+        weakref.finalize(self, self.store.release, self.row, self.generation)
+
+    @property
+    def position(self):
+        return Vector2(self.store.positions[self.row].tolist())
+
+    @position.setter
+    def position(self, position):
+        self.store.positions[self.row] = position[0], position[1]
+
+    def place(self, position):
+        self.store.place(self.row, position)
+
+    @property
+    def velocity(self):
+        return Vector2(self.store.velocities[self.row].tolist())
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self.store.velocities[self.row] = velocity[0], velocity[1]
+
+    @property
+    def radius(self):
+        return float(self.store.radii[self.row])
+
+    def draw(self, surface, position=None):
+        if position is None:
+            position = self.position
+        texture, area = self.region
+        return surface.blit(texture, (position[0] - area.width / 2,
+                                      position[1] - area.height / 2), area)
 
     def move(self, surface):
         self.position = wrap_position(self.position + self.velocity, surface)
@@ -28,28 +65,55 @@ class GameObject:
 
 
 class Spaceship(GameObject):
+    KIND = EntityKind.SPACESHIP
     MANEUVERABILITY = 3
     ACCELERATION = 0.25
     BULLET_SPEED = 3
     SPACESHIP_ANTIGRAVITY = 0.05
 
-    def __init__(self, position, create_bullet_callback):
+    def __init__(self, position, create_bullet_callback, store=None,
+                 bullet_pool=None):
         self.score = 0
         self.lives = 3
         self.create_bullet_callback = create_bullet_callback
+        self.bullet_pool = bullet_pool
         self.is_alive = True
         self.direction = Vector2(0, -1)
-        self.__was_moved = False
+        self.was_moved = False
+        self.was_rotating = False
+        self.__shoot_sound = SoundEffect("laser-pistol", 0.4)
+        self.__accelerating_sound = SoundEffect("rocket-boost-engine", 0.6,
+                                                priority=1)
+        self.__rotating_sound = SoundEffect("rocket-boost-engine", 0.3,
+                                            priority=1)
+        self.impact_sound = SoundEffect("spaceship_impact", priority=3)
+
+        super().__init__(position, load_sprite("spaceship"), Vector2(0),
+                         store, self.region)
+
+    @property
+    def direction(self):
+        return self.__direction
+
+    @direction.setter
+    def direction(self, direction):
+        self.__direction = direction
+        self.__update_region()
+
+    def __update_region(self):
+        self.region = load_sprite_region("spaceship",
+                                         self.__direction.angle_to(UP))
+
+    def reset(self, position):
+        self.stop_music()
+        self.place(position)
+        self.velocity = Vector2(0)
+        self.direction = Vector2(0, -1)
+        self.score = 0
+        self.lives = 3
+        self.is_alive = True
+        self.was_moved = False
         self.was_rotating = False
-        self.__shoot_sound = load_sound("laser-pistol")
-        self.__shoot_sound.set_volume(0.4)
-        self.__accelerating_sound = load_sound("rocket-boost-engine")
-        self.__accelerating_sound.set_volume(0.6)
-        self.__rotating_sound = load_sound("rocket-boost-engine")
-        self.__rotating_sound.set_volume(0.3)
-        self.impact_sound = load_sound("spaceship_impact")
-
-        super().__init__(position, load_sprite("spaceship"), Vector2(0))
 
     def add_score(self, score_value):
         self.score += score_value
@@ -58,6 +122,7 @@ class Spaceship(GameObject):
         sign = 1 if clockwise else -1
         angle = self.MANEUVERABILITY * sign
         self.direction.rotate_ip(angle)
+        self.__update_region()
         if (not self.was_rotating):
             self.__rotating_sound.play()
         self.was_rotating = True
@@ -66,30 +131,26 @@ class Spaceship(GameObject):
         self.was_rotating = False
         self.__rotating_sound.stop()
 
-    def draw(self, surface):
-        angle = self.direction.angle_to(Vector2(0, -1))
-        rotated_surface = rotozoom(self.sprite, angle, 1.0)
-        rotated_surface_size = Vector2(rotated_surface.get_size())
-        blit_position = self.position - rotated_surface_size * 0.5
-        surface.blit(rotated_surface, blit_position)
-
     def accelerate(self):
-        if (not self.__was_moved):
+        if (not self.was_moved):
             self.__accelerating_sound.play()
         self.velocity += self.direction * self.ACCELERATION
-        self.__was_moved = True
+        self.was_moved = True
 
     def not_accelerate(self):
-        if self.__was_moved:
+        if self.was_moved:
             self.__accelerating_sound.stop()
         if self.velocity != Vector2(0, 0):
             self.velocity -= self.velocity * self.SPACESHIP_ANTIGRAVITY
-        self.__was_moved = False
+        self.was_moved = False
 
     def shoot(self):
         bullet_velocity = self.direction * self.BULLET_SPEED + self.velocity
-        bullet = Bullet(self.position, bullet_velocity, True)
-        self.create_bullet_callback(bullet)
+        if self.bullet_pool is not None:
+            self.bullet_pool.spawn(self.position, bullet_velocity)
+        else:
+            bullet = Bullet(self.position, bullet_velocity, True, self.store)
+            self.create_bullet_callback(bullet)
         self.__shoot_sound.play()
 
     def stop_music(self):
@@ -99,8 +160,10 @@ class Spaceship(GameObject):
 
 
 class Asteroid(GameObject):
+    KIND = EntityKind.ASTEROID
+
     def __init__(self, position, create_asteroid_callback,
-                 initial_size, reduction_size=3):
+                 initial_size, reduction_size=3, store=None):
         self.create_asteroid_callback = create_asteroid_callback
         self.reduction_size = reduction_size
         self.initial_size = initial_size
@@ -112,13 +175,13 @@ class Asteroid(GameObject):
         }
 
         scale = size_to_scale[reduction_size]
-        sprite = rotozoom(load_sprite("asteroid"), 0, self.initial_size *
-                          scale)
-        self.__destroy_sound = load_sound("stone_crush")
-        self.__destroy_sound.set_volume(0.7)
+        sprite = load_transformed_sprite("asteroid", 0,
+                                         self.initial_size * scale)
+        self.__destroy_sound = SoundEffect("stone_crush", 0.7, priority=1)
 
         super().__init__(
-            position, sprite, get_random_velocity(0.25, 1)
+            position, sprite, get_random_velocity(0.25, 1), store,
+            load_sprite_region("asteroid", 0, self.initial_size * scale)
         )
 
     def split(self, spaceship):
@@ -134,7 +197,7 @@ class Asteroid(GameObject):
             for _ in range(2):
                 asteroid = Asteroid(
                     self.position, self.create_asteroid_callback,
-                    self.initial_size, self.reduction_size - 1
+                    self.initial_size, self.reduction_size - 1, self.store
                 )
                 self.create_asteroid_callback(asteroid)
 
@@ -143,30 +206,46 @@ class Asteroid(GameObject):
 
 
 class Bullet(GameObject):
-    def __init__(self, position, velocity, is_spaceship_bullet):
+    WRAPS = False
+
+    def __init__(self, position, velocity, is_spaceship_bullet, store=None):
         if is_spaceship_bullet:
-            super().__init__(position, load_sprite("bullet"), velocity)
+            self.KIND = EntityKind.BULLET
+            name = "bullet"
         else:
-            super().__init__(position, load_sprite("enemy_bullet"), velocity)
+            self.KIND = EntityKind.ENEMY_BULLET
+            name = "enemy_bullet"
+        super().__init__(position, load_sprite(name), velocity, store,
+                         load_sprite_region(name))
 
     def move(self, surface):
         self.position = self.position + self.velocity
 
 
 class Ufo(GameObject):
+    KIND = EntityKind.UFO
+    WRAPS = False
     BULLET_SPEED = 1
     BULLET_FREQUENCY = 25
 
-    def __init__(self, position, velocity, create_bullet_callback):
+    def __init__(self, position, velocity, create_bullet_callback,
+                 store=None, bullet_pool=None):
         self.create_bullet_callback = create_bullet_callback
-        self.current_frame_alive = 0
-        self.velocity = velocity
-        sprite = rotozoom(load_sprite("ufo"), 0, 1)
-        self.__shoot_sound = load_sound("ufo_laser")
-        self.__shoot_sound.set_volume(0.35)
-        self.__destroying_sound = load_sound("ufo_explosion")
+        self.bullet_pool = bullet_pool
+        sprite = load_transformed_sprite("ufo")
+        self.__shoot_sound = SoundEffect("ufo_laser", 0.35)
+        self.__destroying_sound = SoundEffect("ufo_explosion", priority=2)
+
+        super().__init__(position, sprite, velocity, store,
+                         load_sprite_region("ufo"))
 
-        super().__init__(position, sprite, self.velocity)
+    @property
+    def current_frame_alive(self):
+        return int(self.store.ages[self.row])
+
+    @current_frame_alive.setter
+    def current_frame_alive(self, frames):
+        self.store.ages[self.row] = frames
 
     def move(self, surface):
         self.position = self.position + self.velocity
@@ -175,8 +254,11 @@ class Ufo(GameObject):
     def shoot(self):
         bullet_velocity = get_random_velocity(1, 2) * self.BULLET_SPEED \
                           + self.velocity
-        bullet = Bullet(self.position, bullet_velocity, False)
-        self.create_bullet_callback(bullet)
+        if self.bullet_pool is not None:
+            self.bullet_pool.spawn(self.position, bullet_velocity)
+        else:
+            bullet = Bullet(self.position, bullet_velocity, False, self.store)
+            self.create_bullet_callback(bullet)
         self.__shoot_sound.play()
 
     def destroy(self):
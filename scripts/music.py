@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pygame
+
+MUSIC_END = pygame.event.custom_type()
+
+
+def warm_file_cache(path, chunk_size=1 << 16):
+    with open(path, "rb") as track:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(track.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            chunk = bytearray(chunk_size)
+            while track.readinto(chunk):
+                pass
+    return path
+
+
+class MusicPlayer:
+    EXTENSIONS = (".ogg", ".mp3", ".wav")
+
+    def __init__(self, directory="../assets/sounds", fade_ms=800,
+                 volume=1.0, duck_volume=0.25, enabled=True):
+        self.directory = directory
+        self.fade_ms = fade_ms
+        self.volume = volume
+        self.duck_volume = duck_volume
+        self.enabled = enabled
+        self.current = None
+        self.ducked = False
+        self.missing = set()
+        self.__next = None
+        self.__fading = False
+        self.__prefetched = {}
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def target(self):
+        return self.__next if self.__fading else self.current
+
+    def find_track(self, name):
+        for extension in self.EXTENSIONS:
+            path = Path(self.directory) / f"{name}{extension}"
+            if path.exists():
+                return path
+        return None
+
+    def preload(self, name):
+        if name is None or not self.enabled:
+            return None
+        if name in self.__prefetched:
+            return self.__prefetched[name]
+        path = self.find_track(name)
+        if path is None:
+            self.missing.add(name)
+            return None
+        future = self.__executor.submit(warm_file_cache, path)
+        self.__prefetched[name] = future
+        return future
+
+    def play(self, name):
+        if name == self.target:
+            return
+        self.preload(name)
+        if self.__is_playing():
+            self.__next = name
+            if not self.__fading:
+                self.__fading = True
+                pygame.mixer.music.fadeout(self.fade_ms)
+        else:
+            self.__start(name)
+
+    def stop(self):
+        self.play(None)
+
+    def duck(self, ducked=True):
+        if ducked != self.ducked:
+            self.ducked = ducked
+            self.__apply_volume()
+
+    def handle_event(self, event):
+        if event.type != MUSIC_END:
+            return False
+        if self.__fading:
+            self.__fading = False
+            self.__start(self.__next)
+        return True
+
+    def __start(self, name):
+        self.current = None
+        self.__next = None
+        if name is None or not self.__is_ready():
+            return
+        path = self.find_track(name)
+        if path is None:
+            self.missing.add(name)
+            return
+        try:
+            pygame.mixer.music.load(str(path))
+        except pygame.error:
+            self.missing.add(name)
+            return
+        pygame.mixer.music.set_endevent(MUSIC_END)
+        self.__apply_volume()
+        pygame.mixer.music.play(-1, fade_ms=self.fade_ms)
+        self.current = name
+
+    def __apply_volume(self):
+        if self.__is_ready():
+            pygame.mixer.music.set_volume(
+                self.volume * (self.duck_volume if self.ducked else 1.0))
+
+    def __is_ready(self):
+        return self.enabled and pygame.mixer.get_init() is not None
+
+    def __is_playing(self):
+        return self.__is_ready() and self.current is not None and \
+            pygame.mixer.music.get_busy()
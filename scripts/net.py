@@ -0,0 +1,499 @@
+import argparse
+import asyncio
+import random
+import struct
+import time
+
+import numpy as np
+import pygame
+from pygame import Color, Vector2
+
+from scripts.controls import InputFlag, read_keyboard
+from scripts.entities import EntityKind, rows_of
+from scripts.game import Asteroids, GameState, init_pygame
+from scripts.profiler import FrameProfiler
+from scripts.render import DRAW_LAYERS, RenderQueue
+from scripts.snapshot import ENTITY, NO_BASE, Snapshot, SnapshotCodec, \
+    SnapshotError, entity_id, predict
+from scripts.utils import load_font, load_sprite, load_sprite_region, \
+    preload_sprites, print_text
+
+HELLO = 1
+WELCOME = 2
+INPUT = 3
+SNAPSHOT = 4
+BYE = 5
+WELCOME_LAYOUT = struct.Struct("<BHIHHH")
+INPUT_LAYOUT = struct.Struct("<BHIIB")
+BYE_LAYOUT = struct.Struct("<BH")
+INPUT_MASK = int(InputFlag.LEFT | InputFlag.RIGHT | InputFlag.UP
+                 | InputFlag.SHOOT)
+UP = Vector2(0, -1)
+
+
+class LinkConditioner:
+    def __init__(self, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.transport = None
+        self.packets_sent = 0
+        self.packets_dropped = 0
+        self.bytes_sent = 0
+        self.__random = random.Random(seed)
+
+    def bind(self, transport):
+        self.transport = transport
+
+    def sendto(self, data, address=None):
+        self.packets_sent += 1
+        self.bytes_sent += len(data)
+        if self.loss and self.__random.random() < self.loss:
+            self.packets_dropped += 1
+            return
+        delay = self.latency
+        if self.jitter:
+            delay += self.__random.uniform(0, self.jitter)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self.__deliver, data,
+                                                  address)
+        else:
+            self.__deliver(data, address)
+
+    def __deliver(self, data, address):
+        if self.transport is None or self.transport.is_closing():
+            return
+        if address is None:
+            self.transport.sendto(data)
+        else:
+            self.transport.sendto(data, address)
+
+
+def capture_snapshot(game, tick):
+    objects = game.game_objects
+    rows = rows_of(objects)
+    store = game.entities
+    entities = np.zeros(len(rows), dtype=ENTITY)
+    entities["id"] = entity_id(rows, store.generations[rows])
+    entities["kind"] = store.kinds[rows]
+    entities["radius"] = store.radii[rows]
+    entities["x"] = store.positions[rows, 0]
+    entities["y"] = store.positions[rows, 1]
+    entities["vx"] = store.velocities[rows, 0]
+    entities["vy"] = store.velocities[rows, 1]
+    for index in np.flatnonzero(entities["kind"]
+                                == EntityKind.SPACESHIP).tolist():
+        entities["angle"][index] = round(
+            objects[index].direction.angle_to(UP))
+    entities = entities[np.argsort(entities["id"], kind="stable")]
+    return Snapshot(tick, game.spaceship.score, game.spaceship.lives,
+                    game.level, list(GameState).index(game.game_state),
+                    entities)
+
+
+class RemoteClient:
+    def __init__(self, client_id, address, ship, joined_tick):
+        self.client_id = client_id
+        self.address = address
+        self.ship = ship
+        self.joined_tick = joined_tick
+        self.flags = InputFlag.NONE
+        self.input_sequence = 0
+        self.acked = NO_BASE
+        self.history = {}
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.full_snapshots = 0
+        self.last_seen = time.monotonic()
+
+
+class GameServer(asyncio.DatagramProtocol):
+    HISTORY = 64
+    TIMEOUT = 5.0
+
+    def __init__(self, seed=None, max_clients=4, tick_rate=60,
+                 snapshot_interval=1, tolerance=0.25, link=None):
+        self.game = Asteroids(headless=True, seed=seed)
+        self.codec = SnapshotCodec(*self.game.screen_size, tolerance)
+        self.max_clients = max_clients
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.link = LinkConditioner() if link is None else link
+        self.profiler = FrameProfiler(enabled=True)
+        self.clients = {}
+        self.ticks = 0
+        self.sequence = 0
+        self.snapshot = None
+        self.address = None
+        self.__addresses = {}
+        self.__pilot = None
+        self.__next_client_id = 1
+        self.__transport = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: self, local_addr=(host, port))
+        return self.address
+
+    def connection_made(self, transport):
+        self.__transport = transport
+        self.link.bind(transport)
+        self.address = transport.get_extra_info("sockname")[:2]
+
+    def datagram_received(self, data, address):
+        if not data:
+            return
+        if data[0] == HELLO:
+            self.__welcome(address)
+        elif data[0] == INPUT and len(data) == INPUT_LAYOUT.size:
+            self.__receive_input(data, address)
+        elif data[0] == BYE:
+            self.__disconnect(self.__addresses.get(address))
+
+    async def run(self, ticks=None):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        deadline = loop.time()
+        count = 0
+        while ticks is None or count < ticks:
+            self.tick()
+            count += 1
+            deadline += interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+    def tick(self):
+        self.profiler.begin_frame()
+        if self.game.game_state is GameState.GAME:
+            pilot_flags = InputFlag.NONE if self.__pilot is None \
+                else self.__pilot.flags
+            self.game.step(pilot_flags, {
+                client.ship: client.flags
+                for client in self.clients.values()
+                if client is not self.__pilot})
+        self.ticks += 1
+        self.profiler.lap("simulate")
+        self.__drop_silent_clients()
+        if self.ticks % self.snapshot_interval == 0:
+            self.broadcast()
+        self.profiler.end_frame()
+
+    def broadcast(self):
+        self.snapshot = capture_snapshot(self.game, self.ticks)
+        self.profiler.lap("capture")
+        self.sequence += 1
+        for client in self.clients.values():
+            base = client.history.get(client.acked)
+            if base is None:
+                client.full_snapshots += 1
+            data, sent = self.codec.encode(
+                self.snapshot._replace(lives=client.ship.lives),
+                self.sequence, base, client.acked)
+            client.history[self.sequence] = sent
+            if len(client.history) > self.HISTORY:
+                del client.history[next(iter(client.history))]
+            packet = bytes((SNAPSHOT,)) + data
+            client.bytes_sent += len(packet)
+            client.snapshots_sent += 1
+            self.link.sendto(packet, client.address)
+        self.profiler.lap("send")
+
+    def stats(self):
+        clients = {}
+        for client in self.clients.values():
+            seconds = max(self.ticks - client.joined_tick, 1) / self.tick_rate
+            clients[client.client_id] = {
+                "bytes_sent": client.bytes_sent,
+                "snapshots": client.snapshots_sent,
+                "full_snapshots": client.full_snapshots,
+                "bytes_per_snapshot": client.bytes_sent
+                / max(client.snapshots_sent, 1),
+                "bytes_per_second": client.bytes_sent / seconds}
+        return {"ticks": self.ticks,
+                "entities": 0 if self.snapshot is None
+                else len(self.snapshot.entities),
+                "tick_ms": self.profiler.percentiles("total"),
+                "clients": clients}
+
+    def close(self):
+        if self.__transport is not None:
+            self.__transport.close()
+
+    def __welcome(self, address):
+        client = self.__addresses.get(address)
+        if client is None:
+            if len(self.clients) >= self.max_clients:
+                return
+            if self.__pilot is None:
+                ship = self.game.spaceship
+            else:
+                ship = self.game.add_ship()
+            client = RemoteClient(self.__next_client_id, address, ship,
+                                  self.ticks)
+            self.__next_client_id += 1
+            if self.__pilot is None:
+                self.__pilot = client
+            self.clients[client.client_id] = client
+            self.__addresses[address] = client
+        client.last_seen = time.monotonic()
+        width, height = self.game.screen_size
+        self.link.sendto(WELCOME_LAYOUT.pack(
+            WELCOME, client.client_id,
+            entity_id(client.ship.row, client.ship.generation),
+            width, height, self.tick_rate), address)
+
+    def __receive_input(self, data, address):
+        _, client_id, sequence, acked, flags = INPUT_LAYOUT.unpack(data)
+        client = self.__addresses.get(address)
+        if client is None or client.client_id != client_id:
+            return
+        client.last_seen = time.monotonic()
+        if sequence > client.input_sequence:
+            client.input_sequence = sequence
+            client.flags = InputFlag(flags & INPUT_MASK)
+        if acked in client.history and \
+                (client.acked == NO_BASE or acked > client.acked):
+            client.acked = acked
+            for sequence in [sequence for sequence in client.history
+                             if sequence < acked]:
+                del client.history[sequence]
+
+    def __disconnect(self, client):
+        if client is None:
+            return
+        del self.clients[client.client_id]
+        del self.__addresses[client.address]
+        if client is self.__pilot:
+            self.__pilot = None
+            client.flags = InputFlag.NONE
+        else:
+            self.game.remove_ship(client.ship)
+
+    def __drop_silent_clients(self):
+        now = time.monotonic()
+        for client in [client for client in self.clients.values()
+                       if now - client.last_seen > self.TIMEOUT]:
+            self.__disconnect(client)
+
+
+class GameClient(asyncio.DatagramProtocol):
+    HISTORY = 64
+    BYE_COPIES = 3
+
+    def __init__(self, link=None):
+        self.link = LinkConditioner() if link is None else link
+        self.codec = None
+        self.client_id = None
+        self.ship_id = None
+        self.screen_size = None
+        self.tick_rate = None
+        self.snapshot = None
+        self.sequence = NO_BASE
+        self.received_at = None
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.snapshots_skipped = 0
+        self.__snapshots = {}
+        self.__input_sequence = 0
+        self.__welcomed = None
+        self.__transport = None
+
+    async def connect(self, host, port, timeout=5.0, retry_interval=0.1):
+        loop = asyncio.get_running_loop()
+        self.__welcomed = loop.create_future()
+        await loop.create_datagram_endpoint(lambda: self,
+                                            remote_addr=(host, port))
+        deadline = loop.time() + timeout
+        while not self.__welcomed.done():
+            if loop.time() >= deadline:
+                self.close()
+                raise TimeoutError(f"no answer from {host}:{port}")
+            self.link.sendto(bytes((HELLO,)))
+            try:
+                await asyncio.wait_for(asyncio.shield(self.__welcomed),
+                                       retry_interval)
+            except asyncio.TimeoutError:
+                pass
+        return self.client_id
+
+    def connection_made(self, transport):
+        self.__transport = transport
+        self.link.bind(transport)
+
+    def datagram_received(self, data, address):
+        self.bytes_received += len(data)
+        if not data:
+            return
+        if data[0] == WELCOME and len(data) == WELCOME_LAYOUT.size:
+            self.__receive_welcome(data)
+        elif data[0] == SNAPSHOT and self.codec is not None:
+            self.__receive_snapshot(memoryview(data)[1:])
+
+    def send_input(self, flags):
+        if self.client_id is None:
+            return
+        self.__input_sequence += 1
+        self.link.sendto(INPUT_LAYOUT.pack(INPUT, self.client_id,
+                                           self.__input_sequence,
+                                           self.sequence,
+                                           int(flags) & INPUT_MASK))
+
+    def disconnect(self):
+        if self.client_id is not None:
+            for _ in range(self.BYE_COPIES):
+                self.link.sendto(BYE_LAYOUT.pack(BYE, self.client_id))
+        self.close()
+
+    def close(self):
+        if self.__transport is not None:
+            self.__transport.close()
+
+    def __receive_welcome(self, data):
+        if self.__welcomed is None or self.__welcomed.done():
+            return
+        _, self.client_id, self.ship_id, width, height, self.tick_rate = \
+            WELCOME_LAYOUT.unpack(data)
+        self.screen_size = (width, height)
+        self.codec = SnapshotCodec(width, height)
+        self.__welcomed.set_result(self.client_id)
+
+    def __receive_snapshot(self, data):
+        self.snapshots_received += 1
+        try:
+            sequence, _, snapshot = self.codec.decode(data, self.__snapshots)
+        except SnapshotError:
+            self.snapshots_skipped += 1
+            return
+        self.__snapshots[sequence] = snapshot
+        if len(self.__snapshots) > self.HISTORY:
+            del self.__snapshots[min(self.__snapshots)]
+        if self.sequence == NO_BASE or sequence > self.sequence:
+            self.sequence = sequence
+            self.snapshot = snapshot
+            self.received_at = time.perf_counter()
+
+
+class SnapshotRenderer:
+    def __init__(self, screen):
+        self.screen = screen
+        self.__heart_image = load_sprite("heart")
+        self.__asteroid_width = load_sprite("asteroid").get_width()
+        self.__hud_font = load_font(None, 32)
+        self.__font = load_font(None, 64)
+        self.__regions = {EntityKind.BULLET: load_sprite_region("bullet"),
+                          EntityKind.ENEMY_BULLET:
+                              load_sprite_region("enemy_bullet"),
+                          EntityKind.UFO: load_sprite_region("ufo")}
+        self.__queue = RenderQueue()
+
+    def draw(self, snapshot, elapsed_ticks=0.0):
+        self.screen.fill(Color("black"))
+        entities = snapshot.entities
+        positions = predict(entities, elapsed_ticks,
+                            np.array(self.screen.get_size()))
+        regions = []
+        for kind, radius, angle in zip(entities["kind"].tolist(),
+                                       entities["radius"].tolist(),
+                                       entities["angle"].tolist()):
+            if kind == EntityKind.SPACESHIP:
+                regions.append(load_sprite_region("spaceship", angle))
+            elif kind == EntityKind.ASTEROID:
+                regions.append(load_sprite_region(
+                    "asteroid", 0, radius * 2 / self.__asteroid_width))
+            else:
+                regions.append(self.__regions[kind])
+        self.__queue.add_sprites(DRAW_LAYERS[entities["kind"]], regions,
+                                 positions)
+        self.__queue.flush(self.screen)
+
+        heart_width = self.__heart_image.get_width()
+        for i in range(snapshot.lives):
+            self.screen.blit(self.__heart_image, (10 + i * heart_width, 10))
+        width = self.screen.get_width()
+        print_text(self.screen, f"Level {snapshot.level}", self.__hud_font,
+                   Vector2(48, 50), (150, 150, 150))
+        print_text(self.screen, f"Score: {snapshot.score}", self.__hud_font,
+                   Vector2(width // 2, 20))
+        state = list(GameState)[snapshot.state]
+        if state is not GameState.GAME:
+            print_text(self.screen, state.name.replace("_", " "), self.__font,
+                       Vector2(width // 2, self.screen.get_height() // 2))
+
+
+async def serve(host, port, seed, max_clients, link, stats_interval):
+    server = GameServer(seed=seed, max_clients=max_clients, link=link)
+    host, port = await server.start(host, port)
+    print(f"Serving on {host}:{port}")
+    task = asyncio.create_task(server.run())
+    try:
+        while not task.done():
+            await asyncio.sleep(stats_interval)
+            stats = server.stats()
+            tick_ms = stats["tick_ms"]
+            print(f"tick {stats['ticks']}, {stats['entities']} entities, "
+                  f"tick p50 {tick_ms[50]:.2f} ms p99 {tick_ms[99]:.2f} ms")
+            for client_id, client in stats["clients"].items():
+                print(f"  client {client_id}: "
+                      f"{client['bytes_per_second'] / 1024:.1f} KiB/s, "
+                      f"{client['bytes_per_snapshot']:.0f} B/snapshot, "
+                      f"{client['full_snapshots']} full")
+    finally:
+        task.cancel()
+        server.close()
+
+
+async def play(host, port, link):
+    init_pygame()
+    screen = pygame.display.set_mode((1500, 700))
+    preload_sprites()
+    client = GameClient(link)
+    await client.connect(host, port)
+    if screen.get_size() != client.screen_size:
+        screen = pygame.display.set_mode(client.screen_size)
+    pygame.display.set_caption(f"Asteroids - client {client.client_id}")
+    renderer = SnapshotRenderer(screen)
+    clock = pygame.time.Clock()
+    try:
+        while True:
+            flags, quit_requested = read_keyboard(pygame.event.get())
+            if quit_requested:
+                break
+            client.send_input(flags)
+            if client.snapshot is not None:
+                elapsed = (time.perf_counter() - client.received_at) \
+                    * client.tick_rate
+                renderer.draw(client.snapshot, elapsed)
+                pygame.display.flip()
+            clock.tick(60)
+            await asyncio.sleep(0)
+    finally:
+        client.disconnect()
+        pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Authoritative Asteroids server and thin client")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server = commands.add_parser("server")
+    server.add_argument("--seed", type=int, default=None)
+    server.add_argument("--max-clients", type=int, default=4)
+    server.add_argument("--stats-interval", type=float, default=5.0)
+    client = commands.add_parser("client")
+    for command in (server, client):
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=5555)
+        command.add_argument("--latency", type=float, default=0.0)
+        command.add_argument("--jitter", type=float, default=0.0)
+        command.add_argument("--loss", type=float, default=0.0)
+    args = parser.parse_args()
+
+    link = LinkConditioner(args.latency, args.jitter, args.loss)
+    if args.command == "server":
+        asyncio.run(serve(args.host, args.port, args.seed, args.max_clients,
+                          link, args.stats_interval))
+    else:
+        asyncio.run(play(args.host, args.port, link))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from scripts.models import Bullet
+
+
+class ProjectilePool:
+    def __init__(self, is_spaceship_bullet, store=None, capacity=64):
+        self.is_spaceship_bullet = is_spaceship_bullet
+        self.store = store
+        self.active = []
+        self.high_water_mark = 0
+        self.allocated = 0
+        self.__free = []
+        self.__grow(capacity)
+
+    def spawn(self, position, velocity):
+        if not self.__free:
+            self.__grow(max(1, self.allocated))
+        bullet = self.__free.pop()
+        bullet.store.activate(bullet.row)
+        bullet.place(position)
+        bullet.velocity = velocity
+        bullet.pool_index = len(self.active)
+        self.active.append(bullet)
+        self.high_water_mark = max(self.high_water_mark, len(self.active))
+        return bullet
+
+    def despawn(self, bullet):
+        index = bullet.pool_index
+        last = self.active.pop()
+        if last is not bullet:
+            self.active[index] = last
+            last.pool_index = index
+        bullet.pool_index = -1
+        bullet.store.deactivate(bullet.row)
+        self.__free.append(bullet)
+
+    def despawn_indices(self, indices):
+        for index in sorted(indices, reverse=True):
+            self.despawn(self.active[index])
+
+    def clear(self):
+        while self.active:
+            self.despawn(self.active[-1])
+
+    def stats(self):
+        return {"active": len(self.active),
+                "free": len(self.__free),
+                "allocated": self.allocated,
+                "high_water_mark": self.high_water_mark}
+
+    def __grow(self, count):
+        for _ in range(count):
+            bullet = Bullet((0, 0), (0, 0), self.is_spaceship_bullet,
+                            self.store)
+            bullet.pool_index = -1
+            bullet.store.deactivate(bullet.row)
+            self.__free.append(bullet)
+        self.allocated += count
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
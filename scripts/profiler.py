@@ -0,0 +1,95 @@
+import csv
+import json
+from collections import deque
+from time import perf_counter_ns
+
+import numpy as np
+
+
+class FrameProfiler:
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, enabled=False, window=300, history=3600):
+        self.enabled = enabled
+        self.window = window
+        self.frames = 0
+        self.rows = deque(maxlen=history)
+        self.phases = []
+        self.__samples = {}
+        self.__current = {}
+        self.__frame_start = 0
+        self.__last = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.__current = {}
+        self.__frame_start = 0
+        return self.enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.__current = {}
+        self.__frame_start = self.__last = perf_counter_ns()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self.__current[phase] = self.__current.get(phase, 0) + \
+            now - self.__last
+        self.__last = now
+
+    def end_frame(self):
+        if not self.enabled or not self.__frame_start:
+            return
+        self.__current["total"] = perf_counter_ns() - self.__frame_start
+        self.__frame_start = 0
+        for phase, duration in self.__current.items():
+            if phase not in self.__samples:
+                self.__samples[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            self.__samples[phase].append(duration)
+        self.rows.append({"frame": self.frames, **self.__current})
+        self.frames += 1
+
+    def percentiles(self, phase):
+        samples = self.__samples.get(phase)
+        if not samples:
+            return dict.fromkeys(self.PERCENTILES, 0.0)
+        values = np.percentile(np.fromiter(samples, dtype=np.int64,
+                                           count=len(samples)),
+                               self.PERCENTILES)
+        return {percentile: value / 1e6
+                for percentile, value in zip(self.PERCENTILES, values)}
+
+    def summary(self):
+        return {phase: self.percentiles(phase) for phase in self.phases}
+
+    def overlay_lines(self):
+        lines = []
+        for phase, values in self.summary().items():
+            lines.append(f"{phase:<20}" + " ".join(
+                f"p{percentile} {value:6.2f}"
+                for percentile, value in values.items()))
+        return lines
+
+    def export(self, path):
+        if str(path).endswith(".json"):
+            with open(path, "w") as file:
+                json.dump({"phases": self.phases,
+                           "summary_ms": self.summary(),
+                           "frames_ns": list(self.rows)}, file)
+            return
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, ["frame", *self.phases], restval=0)
+            writer.writeheader()
+            writer.writerows(self.rows)
+
+    def reset(self):
+        self.frames = 0
+        self.rows.clear()
+        self.phases = []
+        self.__samples = {}
+        self.__current = {}
+        self.__frame_start = 0
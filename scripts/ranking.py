@@ -0,0 +1,135 @@
+from bisect import bisect_left, insort
+
+
+class RankedIndex:
+    LOAD = 512
+
+    def __init__(self, scores=()):
+        self.__scores = {}
+        for player, score in scores:
+            if player not in self.__scores or score > self.__scores[player]:
+                self.__scores[player] = score
+        keys = sorted((-score, player)
+                      for player, score in self.__scores.items())
+        self.__blocks = [keys[i:i + self.LOAD]
+                         for i in range(0, len(keys), self.LOAD)]
+        self.__rebuild()
+
+    def update(self, player, score, keep_best=True):
+        previous = self.__scores.get(player)
+        if previous is not None:
+            if keep_best and score <= previous:
+                return False
+            self.__remove((-previous, player))
+        self.__scores[player] = score
+        self.__insert((-score, player))
+        return True
+
+    def remove(self, player):
+        score = self.__scores.pop(player, None)
+        if score is not None:
+            self.__remove((-score, player))
+
+    def score(self, player):
+        return self.__scores.get(player)
+
+    def rank(self, player):
+        score = self.__scores.get(player)
+        if score is None:
+            return None
+        key = (-score, player)
+        block = bisect_left(self.__maxes, key)
+        return self.__prefix(block) + \
+            bisect_left(self.__blocks[block], key) + 1
+
+    def at(self, rank):
+        if not 1 <= rank <= len(self):
+            raise IndexError("rank out of range")
+        block, offset = self.__find(rank - 1)
+        score, player = self.__blocks[block][offset]
+        return player, -score
+
+    def top(self, count):
+        return self.page(0, count)
+
+    def page(self, number, size):
+        start = number * size
+        if start >= len(self) or size <= 0:
+            return []
+        rows = []
+        block, offset = self.__find(start)
+        while block < len(self.__blocks) and len(rows) < size:
+            for score, player in self.__blocks[block][offset:
+                                                      offset + size
+                                                      - len(rows)]:
+                rows.append((start + len(rows) + 1, player, -score))
+            block += 1
+            offset = 0
+        return rows
+
+    def page_count(self, size):
+        return max(1, -(-len(self) // size))
+
+    def __insert(self, key):
+        if not self.__blocks:
+            self.__blocks.append([key])
+            self.__rebuild()
+            return
+        block = min(bisect_left(self.__maxes, key), len(self.__blocks) - 1)
+        insort(self.__blocks[block], key)
+        self.__maxes[block] = self.__blocks[block][-1]
+        if len(self.__blocks[block]) > 2 * self.LOAD:
+            half = self.__blocks[block][self.LOAD:]
+            del self.__blocks[block][self.LOAD:]
+            self.__blocks.insert(block + 1, half)
+            self.__rebuild()
+        else:
+            self.__add(block, 1)
+
+    def __remove(self, key):
+        block = bisect_left(self.__maxes, key)
+        items = self.__blocks[block]
+        del items[bisect_left(items, key)]
+        if items:
+            self.__maxes[block] = items[-1]
+            self.__add(block, -1)
+        else:
+            del self.__blocks[block]
+            self.__rebuild()
+
+    def __rebuild(self):
+        self.__maxes = [block[-1] for block in self.__blocks]
+        self.__tree = [0] * (len(self.__blocks) + 1)
+        for block, items in enumerate(self.__blocks):
+            self.__add(block, len(items))
+
+    def __add(self, block, delta):
+        index = block + 1
+        while index < len(self.__tree):
+            self.__tree[index] += delta
+            index += index & -index
+
+    def __prefix(self, block):
+        total = 0
+        while block > 0:
+            total += self.__tree[block]
+            block -= block & -block
+        return total
+
+    def __find(self, position):
+        block = 0
+        step = 1 << (len(self.__tree) - 1).bit_length()
+        while step:
+            following = block + step
+            if following < len(self.__tree) and \
+                    self.__tree[following] <= position:
+                block = following
+                position -= self.__tree[following]
+            step >>= 1
+        return block, position
+
+    def __len__(self):
+        return len(self.__scores)
+
+    def __contains__(self, player):
+        return player in self.__scores
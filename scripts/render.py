@@ -0,0 +1,146 @@
+from collections import deque
+from operator import itemgetter
+
+import numpy as np
+import pygame
+from pygame import Color, Rect
+from scripts.entities import EntityKind
+
+DRAW_ORDER = (EntityKind.ASTEROID, EntityKind.BULLET, EntityKind.UFO,
+              EntityKind.ENEMY_BULLET, EntityKind.SPACESHIP)
+DRAW_LAYERS = np.argsort(DRAW_ORDER)
+
+
+class DirtyRectRenderer:
+    def __init__(self, screen, background=Color("black"), threshold=0.5,
+                 enabled=True, history=120):
+        self.screen = screen
+        self.background = background
+        self.threshold = threshold
+        self.enabled = enabled
+        self.dirty_fraction = 1.0
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.history = deque(maxlen=history)
+        self.__screen_rect = screen.get_rect()
+        self.__previous_rects = []
+        self.__current_rects = []
+        self.__needs_full_redraw = True
+        self.__overflowed = False
+
+    def invalidate(self):
+        self.__needs_full_redraw = True
+
+    def begin_frame(self):
+        self.__current_rects = []
+        if not self.enabled or self.__needs_full_redraw:
+            self.screen.fill(self.background)
+        else:
+            for rect in self.__previous_rects:
+                self.screen.fill(self.background, rect)
+
+    def add(self, rect):
+        if rect is not None:
+            self.__current_rects.append(rect)
+
+    def add_boxes(self, boxes):
+        if not len(boxes) or not self.enabled:
+            return
+        screen_area = self.__screen_rect.width * self.__screen_rect.height
+        if float(np.dot(boxes[:, 2], boxes[:, 3])) > \
+                self.threshold * screen_area:
+            self.__overflowed = True
+        else:
+            self.__current_rects.extend(map(Rect, boxes.tolist()))
+
+    def blit(self, source, destination, area=None):
+        rect = self.screen.blit(source, destination, area)
+        self.__current_rects.append(rect)
+        return rect
+
+    def end_frame(self):
+        dirty_rects = [rect.clip(self.__screen_rect)
+                       for rect in self.__previous_rects + self.__current_rects]
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+        screen_area = self.__screen_rect.width * self.__screen_rect.height
+        self.dirty_fraction = min(1.0, dirty_area / screen_area)
+
+        if not self.enabled or self.__needs_full_redraw or \
+                self.__overflowed or self.dirty_fraction > self.threshold:
+            pygame.display.flip()
+            self.dirty_fraction = 1.0
+            self.full_flips += 1
+        else:
+            pygame.display.update(dirty_rects)
+            self.partial_updates += 1
+        self.history.append(self.dirty_fraction)
+        self.__previous_rects = self.__current_rects
+        self.__needs_full_redraw = self.__overflowed
+        self.__overflowed = False
+
+    def average_dirty_fraction(self):
+        if not self.history:
+            return 0.0
+        return sum(self.history) / len(self.history)
+
+
+TEXTURE = itemgetter(0)
+AREA = itemgetter(1)
+
+
+class RenderQueue:
+    def __init__(self):
+        self.submitted = 0
+        self.batches = 0
+        self.__layers = []
+        self.__textures = []
+        self.__blits = []
+
+    def push(self, layer, source, destination, area=None):
+        self.__layers.append(np.array([layer], dtype=np.intp))
+        self.__textures.append(np.array([id(source)], dtype=np.uint64))
+        self.__blits.append((source, destination, area))
+
+    def add_sprites(self, layers, regions, centers):
+        if not regions:
+            return np.zeros((0, 4))
+        ids = np.fromiter(map(id, regions), dtype=np.uint64,
+                          count=len(regions))
+        _, first, inverse = np.unique(ids, return_index=True,
+                                      return_inverse=True)
+        unique = [regions[index] for index in first.tolist()]
+        sizes = np.array([area.size for _, area in unique],
+                         dtype=float)[inverse]
+        corners = np.floor(centers - sizes / 2)
+        self.__layers.append(layers)
+        self.__textures.append(np.array([id(texture)
+                                         for texture, _ in unique],
+                                        dtype=np.uint64)[inverse])
+        self.__blits.extend(zip(map(TEXTURE, regions), corners.tolist(),
+                                map(AREA, regions)))
+        return np.hstack((corners, sizes))
+
+    def flush(self, surface):
+        blits = self.__blits
+        if blits:
+            layers = np.concatenate(self.__layers)
+            textures = np.concatenate(self.__textures)
+            order = np.lexsort((textures, layers))
+            changes = (np.diff(layers[order]) != 0) | \
+                (np.diff(textures[order]) != 0)
+            self.batches = int(np.count_nonzero(changes)) + 1
+            if np.any(np.diff(order) < 0):
+                blits = [blits[index] for index in order.tolist()]
+            surface.blits(blits, doreturn=False)
+        else:
+            self.batches = 0
+        self.submitted = len(blits)
+        self.clear()
+
+    def clear(self):
+        self.__layers = []
+        self.__textures = []
+        self.__blits = []
+
+    def __len__(self):
+        return len(self.__blits)
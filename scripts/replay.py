@@ -0,0 +1,290 @@
+import argparse
+import mmap
+import os
+import struct
+from bisect import bisect_right
+
+from scripts.controls import InputFlag
+from scripts.game import Asteroids
+
+MAGIC = b"ASRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHqI")
+TRAILER = struct.Struct("<QQ4s")
+INPUT_RUN = 1
+KEYFRAME = 2
+INDEX = 3
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def encode_varint(value):
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def decode_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ReplayError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayRecorder:
+    def __init__(self, path, seed, keyframe_interval=1800):
+        self.path = path
+        self.seed = seed
+        self.keyframe_interval = keyframe_interval
+        self.ticks = 0
+        self.keyframes = []
+        self.__file = open(path, "wb")
+        self.__file.write(HEADER.pack(MAGIC, VERSION, seed, keyframe_interval))
+        self.__flags = None
+        self.__run = 0
+
+    def wants_keyframe(self):
+        return self.ticks % self.keyframe_interval == 0 and \
+            (not self.keyframes or self.keyframes[-1][0] != self.ticks)
+
+    def keyframe(self, state):
+        self.__flush_run()
+        self.keyframes.append((self.ticks, self.__file.tell()))
+        self.__file.write(bytes((KEYFRAME,)) + encode_varint(self.ticks)
+                          + encode_varint(len(state)) + state)
+        self.__file.flush()
+
+    def record(self, flags):
+        flags = int(flags)
+        if flags != self.__flags:
+            self.__flush_run()
+            self.__flags = flags
+        self.__run += 1
+        self.ticks += 1
+
+    def close(self):
+        if self.__file.closed:
+            return
+        self.__flush_run()
+        index_offset = self.__file.tell()
+        index = bytearray((INDEX,))
+        index += encode_varint(len(self.keyframes))
+        for tick, offset in self.keyframes:
+            index += encode_varint(tick) + encode_varint(offset)
+        self.__file.write(bytes(index))
+        self.__file.write(TRAILER.pack(index_offset, self.ticks, MAGIC))
+        self.__file.close()
+
+    def __flush_run(self):
+        if self.__run:
+            self.__file.write(bytes((INPUT_RUN, self.__flags))
+                              + encode_varint(self.__run))
+            self.__run = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+        return False
+
+
+class ReplayPlayer:
+    def __init__(self, path):
+        self.path = path
+        self.__file = open(path, "rb")
+        if os.fstat(self.__file.fileno()).st_size < HEADER.size:
+            self.__file.close()
+            raise ReplayError("not a replay file")
+        self.__data = mmap.mmap(self.__file.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+        magic, version, self.seed, self.keyframe_interval = \
+            HEADER.unpack_from(self.__data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            self.close()
+            raise ReplayError(f"unsupported replay version {version}")
+        self.__end = len(self.__data)
+        self.keyframes, self.ticks = self.__read_index()
+        self.__keyframe_ticks = [tick for tick, _ in self.keyframes]
+        self.rewind()
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+    def rewind(self, tick=0):
+        position = bisect_right(self.__keyframe_ticks, tick) - 1
+        if position < 0:
+            self.tick = 0
+            self.__offset = HEADER.size
+            self.__flags = InputFlag.NONE
+            self.__remaining = 0
+            return None
+        keyframe_tick, offset = self.keyframes[position]
+        state, self.__offset = self.__read_keyframe(offset)
+        self.tick = keyframe_tick
+        self.__flags = InputFlag.NONE
+        self.__remaining = 0
+        return state
+
+    def seek(self, game, tick):
+        state = self.rewind(tick)
+        if state is not None:
+            game.restore_state(state)
+        while self.tick < tick and not self.finished:
+            game.step(self.next_input())
+
+    def next_input(self):
+        if self.finished:
+            return InputFlag.NONE
+        while not self.__remaining:
+            chunk = self.__data[self.__offset]
+            if chunk == INPUT_RUN:
+                self.__flags = InputFlag(self.__data[self.__offset + 1])
+                self.__remaining, self.__offset = decode_varint(
+                    self.__data, self.__offset + 2)
+            elif chunk == KEYFRAME:
+                _, self.__offset = self.__read_keyframe(self.__offset)
+            else:
+                raise ReplayError("replay ends before its last tick")
+        self.__remaining -= 1
+        self.tick += 1
+        return self.__flags
+
+    def inputs(self):
+        while not self.finished:
+            yield self.next_input()
+
+    def close(self):
+        self.__data.close()
+        self.__file.close()
+
+    def __read_keyframe(self, offset):
+        if self.__data[offset] != KEYFRAME:
+            raise ReplayError("keyframe index points at a non-keyframe")
+        _, offset = decode_varint(self.__data, offset + 1)
+        length, offset = decode_varint(self.__data, offset)
+        if offset + length > self.__end:
+            raise ReplayError("truncated keyframe")
+        return self.__data[offset:offset + length], offset + length
+
+    def __read_index(self):
+        if len(self.__data) >= HEADER.size + TRAILER.size:
+            index_offset, ticks, magic = TRAILER.unpack_from(
+                self.__data, len(self.__data) - TRAILER.size)
+            if magic == MAGIC and index_offset < len(self.__data) and \
+                    self.__data[index_offset] == INDEX:
+                count, offset = decode_varint(self.__data, index_offset + 1)
+                keyframes = []
+                for _ in range(count):
+                    tick, offset = decode_varint(self.__data, offset)
+                    keyframe_offset, offset = decode_varint(self.__data,
+                                                            offset)
+                    keyframes.append((tick, keyframe_offset))
+                self.__end = index_offset
+                return keyframes, ticks
+        return self.__scan()
+
+    def __scan(self):
+        keyframes = []
+        ticks = 0
+        offset = HEADER.size
+        while offset < len(self.__data):
+            chunk_start = offset
+            try:
+                if self.__data[offset] == INPUT_RUN and \
+                        offset + 1 < len(self.__data):
+                    run, offset = decode_varint(self.__data, offset + 2)
+                    ticks += run
+                elif self.__data[offset] == KEYFRAME:
+                    tick, offset = decode_varint(self.__data, offset + 1)
+                    length, offset = decode_varint(self.__data, offset)
+                    if offset + length > len(self.__data):
+                        raise ReplayError("truncated keyframe")
+                    keyframes.append((tick, chunk_start))
+                    offset += length
+                else:
+                    break
+            except ReplayError:
+                break
+            self.__end = offset
+        return keyframes, ticks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+        return False
+
+
+def play_replay(path, headless=True, seek=0):
+    with ReplayPlayer(path) as player:
+        game = Asteroids(headless=headless, seed=player.seed,
+                         input_source=player)
+        player.seek(game, seek)
+        if not headless:
+            game.start_game()
+            return None
+        result = game.simulate(player.ticks - player.tick)
+        result["ticks"] = player.ticks
+        return result
+
+
+def record_session(path, seed=None, keyframe_interval=1800):
+    if seed is None:
+        seed = int.from_bytes(os.urandom(4), "little")
+    with ReplayRecorder(path, seed, keyframe_interval) as recorder:
+        game = Asteroids(seed=seed, recorder=recorder)
+        game.start_game()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record and play back Asteroids input replays")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record")
+    record.add_argument("path")
+    record.add_argument("--seed", type=int, default=None)
+    record.add_argument("--keyframe-interval", type=int, default=1800)
+    play = commands.add_parser("play")
+    play.add_argument("path")
+    play.add_argument("--headless", action="store_true")
+    play.add_argument("--seek", type=int, default=0)
+    info = commands.add_parser("info")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_session(args.path, args.seed, args.keyframe_interval)
+    elif args.command == "play":
+        result = play_replay(args.path, args.headless, args.seek)
+        print(f"{result['state']} level {result['level']} score "
+              f"{result['score']} after {result['ticks']} ticks")
+    else:
+        with ReplayPlayer(args.path) as player:
+            size = os.path.getsize(args.path)
+            print(f"seed {player.seed}, {player.ticks} ticks, "
+                  f"{len(player.keyframes)} keyframes, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
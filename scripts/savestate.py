@@ -0,0 +1,114 @@
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b"ASTS"
+VERSION = 2
+
+HEADER = struct.Struct("<4sH")
+GAME = struct.Struct("<QIIqB")
+RANDOM = struct.Struct("<I625I?d")
+SPACESHIP = struct.Struct("<6dqI3?")
+COUNTS = struct.Struct("<4I")
+ASTEROID_RECORD = np.dtype([("x", "<f8"), ("y", "<f8"), ("vx", "<f8"),
+                            ("vy", "<f8"), ("size", "<f8"),
+                            ("reduction_size", "u1")])
+BULLET_RECORD = np.dtype([("x", "<f8"), ("y", "<f8"), ("vx", "<f8"),
+                          ("vy", "<f8")])
+UFO_RECORD = np.dtype([("x", "<f8"), ("y", "<f8"), ("vx", "<f8"),
+                       ("vy", "<f8"), ("age", "<i8")])
+
+WorldState = namedtuple("WorldState", ["frame", "level", "ufo_quantity",
+                                       "ufo_spawn_frame", "game_state",
+                                       "random_state", "spaceship",
+                                       "asteroids", "bullets", "ufo_bullets",
+                                       "ufos"])
+
+
+class SaveStateError(ValueError):
+    pass
+
+
+def pack_random_state(state):
+    version, internal, gauss_next = state
+    return (version, *internal, gauss_next is not None,
+            0.0 if gauss_next is None else gauss_next)
+
+
+def unpack_random_state(values):
+    version, *internal, has_gauss, gauss_next = values
+    return version, tuple(internal), gauss_next if has_gauss else None
+
+
+def packed_size(world):
+    return HEADER.size + GAME.size + RANDOM.size + SPACESHIP.size + \
+        COUNTS.size + ASTEROID_RECORD.itemsize * len(world.asteroids) + \
+        BULLET_RECORD.itemsize * (len(world.bullets)
+                                  + len(world.ufo_bullets)) + \
+        UFO_RECORD.itemsize * len(world.ufos)
+
+
+def pack_world(world):
+    buffer = bytearray(packed_size(world))
+    offset = 0
+
+    def put(layout, *values):
+        nonlocal offset
+        layout.pack_into(buffer, offset, *values)
+        offset += layout.size
+
+    put(HEADER, MAGIC, VERSION)
+    put(GAME, world.frame, world.level, world.ufo_quantity,
+        world.ufo_spawn_frame, world.game_state)
+    put(RANDOM, *pack_random_state(world.random_state))
+    put(SPACESHIP, *world.spaceship)
+    put(COUNTS, len(world.asteroids), len(world.bullets),
+        len(world.ufo_bullets), len(world.ufos))
+    for dtype, records in ((ASTEROID_RECORD, world.asteroids),
+                           (BULLET_RECORD, world.bullets),
+                           (BULLET_RECORD, world.ufo_bullets),
+                           (UFO_RECORD, world.ufos)):
+        records = np.asarray(records, dtype=dtype)
+        np.frombuffer(buffer, dtype=dtype, count=len(records),
+                      offset=offset)[:] = records
+        offset += dtype.itemsize * len(records)
+    return bytes(buffer)
+
+
+def unpack_world(data):
+    view = memoryview(data)
+    offset = 0
+
+    def take(layout):
+        nonlocal offset
+        if offset + layout.size > len(view):
+            raise SaveStateError("truncated save state")
+        values = layout.unpack_from(view, offset)
+        offset += layout.size
+        return values
+
+    def take_records(dtype, count):
+        nonlocal offset
+        if offset + dtype.itemsize * count > len(view):
+            raise SaveStateError("truncated save state")
+        records = np.frombuffer(view, dtype=dtype, count=count,
+                                offset=offset)
+        offset += dtype.itemsize * count
+        return records
+
+    magic, version = take(HEADER)
+    if magic != MAGIC:
+        raise SaveStateError("not a save state")
+    if version != VERSION:
+        raise SaveStateError(f"unsupported save state version {version}")
+    frame, level, ufo_quantity, ufo_spawn_frame, game_state = take(GAME)
+    random_state = unpack_random_state(take(RANDOM))
+    spaceship = take(SPACESHIP)
+    asteroids, bullets, ufo_bullets, ufos = take(COUNTS)
+    return WorldState(frame, level, ufo_quantity, ufo_spawn_frame, game_state,
+                      random_state, spaceship,
+                      take_records(ASTEROID_RECORD, asteroids),
+                      take_records(BULLET_RECORD, bullets),
+                      take_records(BULLET_RECORD, ufo_bullets),
+                      take_records(UFO_RECORD, ufos))
@@ -0,0 +1,69 @@
+import heapq
+from itertools import count
+
+
+class Timer:
+    __slots__ = ("tick", "callback", "args", "interval", "cancelled")
+
+    def __init__(self, tick, callback, args, interval):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self, now=0):
+        self.now = now
+        self.fired = 0
+        self.__heap = []
+        self.__sequence = count()
+
+    def schedule(self, tick, callback, *args, interval=None):
+        timer = Timer(tick, callback, args, interval)
+        self.__push(timer)
+        return timer
+
+    def after(self, delay, callback, *args, interval=None):
+        return self.schedule(self.now + delay, callback, *args,
+                             interval=interval)
+
+    def advance(self, tick):
+        heap = self.__heap
+        fired = 0
+        while heap and heap[0][0] <= tick:
+            deadline, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            self.now = deadline
+            if timer.interval is not None:
+                timer.tick = deadline + timer.interval
+                self.__push(timer)
+            timer.callback(*timer.args)
+            fired += 1
+        self.now = tick
+        self.fired += fired
+        return fired
+
+    def next_deadline(self):
+        heap = self.__heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def clear(self, now=None):
+        for _, _, timer in self.__heap:
+            timer.cancel()
+        self.__heap.clear()
+        if now is not None:
+            self.now = now
+
+    def __push(self, timer):
+        heapq.heappush(self.__heap, (timer.tick, next(self.__sequence), timer))
+
+    def __len__(self):
+        return sum(not timer.cancelled for _, _, timer in self.__heap)
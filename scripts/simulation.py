@@ -0,0 +1,110 @@
+import argparse
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scripts.controls import RandomInput, ScriptedInput, InputFlag
+from scripts.game import Asteroids
+
+DEFAULT_SCRIPT = [InputFlag.UP | InputFlag.RIGHT,
+                  InputFlag.RIGHT | InputFlag.SHOOT,
+                  InputFlag.RIGHT,
+                  InputFlag.UP | InputFlag.LEFT | InputFlag.SHOOT,
+                  InputFlag.LEFT]
+
+
+def run_round(seed, max_frames=36000, agent="random"):
+    if agent == "random":
+        input_source = RandomInput(seed)
+    else:
+        input_source = ScriptedInput(DEFAULT_SCRIPT)
+    game = Asteroids(headless=True, seed=seed, input_source=input_source)
+    return game.simulate(max_frames)
+
+
+def run_rounds(rounds, seed=0, max_frames=36000, agent="random"):
+    return [run_round(seed + i, max_frames, agent) for i in range(rounds)]
+
+
+def run_rounds_parallel(rounds, seed=0, max_frames=36000, agent="random",
+                        workers=None):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_round, seed + i, max_frames, agent)
+                   for i in range(rounds)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results, wall_seconds=None, tick_rate=60):
+    frames = sum(result["frames"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    scores = sorted(result["score"] for result in results) or [0]
+    survival = [result["frames"] / tick_rate for result in results] or [0]
+    summary = {"rounds": len(results),
+               "frames": frames,
+               "seconds": seconds,
+               "fps": frames / seconds if seconds else float("inf"),
+               "wins": sum(result["state"] == "WIN_MENU"
+                           for result in results),
+               "losses": sum(result["state"] == "LOSE_MENU"
+                             for result in results),
+               "levels": dict(sorted(Counter(result["level"]
+                                             for result in results).items())),
+               "score_min": scores[0],
+               "score_median": statistics.median(scores),
+               "score_mean": statistics.fmean(scores),
+               "score_p90": scores[min(len(scores) - 1,
+                                       int(len(scores) * 0.9))],
+               "score_max": scores[-1],
+               "survival_mean": statistics.fmean(survival),
+               "survival_median": statistics.median(survival)}
+    if wall_seconds is not None:
+        summary["wall_seconds"] = wall_seconds
+        summary["throughput"] = frames / wall_seconds \
+            if wall_seconds else float("inf")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run headless Asteroids rounds as fast as possible")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", type=int, default=36000)
+    parser.add_argument("--agent", choices=["random", "scripted"],
+                        default="random")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, 0 = one per CPU")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.workers == 1:
+        rounds = (run_round(args.seed + i, args.frames, args.agent)
+                  for i in range(args.rounds))
+    else:
+        rounds = run_rounds_parallel(args.rounds, args.seed, args.frames,
+                                     args.agent, args.workers or None)
+    results = []
+    for result in rounds:
+        results.append(result)
+        print(f"seed {result['seed']}: {result['state']} level "
+              f"{result['level']} score {result['score']} after "
+              f"{result['frames']} frames ({result['fps']:.0f} fps)")
+    summary = summarize(results, time.perf_counter() - start)
+    print(f"{summary['rounds']} rounds, {summary['frames']} frames, "
+          f"{summary['fps']:.0f} simulated fps per process, "
+          f"{summary['throughput']:.0f} fps overall "
+          f"({args.workers or os.cpu_count()} workers)")
+    print(f"wins {summary['wins']}, losses {summary['losses']}, "
+          f"levels reached {summary['levels']}")
+    print(f"score min {summary['score_min']} median "
+          f"{summary['score_median']} mean {summary['score_mean']:.0f} "
+          f"p90 {summary['score_p90']} max {summary['score_max']}")
+    print(f"survival mean {summary['survival_mean']:.1f} s, median "
+          f"{summary['survival_median']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from scripts.entities import EntityKind
+
+NO_BASE = 0xFFFFFFFF
+HEADER = struct.Struct("<IIIIBBB5H")
+ENTITY = np.dtype([("id", "<u4"), ("kind", "u1"), ("radius", "<f4"),
+                   ("x", "<f4"), ("y", "<f4"), ("vx", "<f4"), ("vy", "<f4"),
+                   ("angle", "<i2")])
+REMOVED = np.dtype("<u4")
+POSITION = np.dtype([("id", "<u4"), ("x", "<f4"), ("y", "<f4")])
+VELOCITY = np.dtype([("id", "<u4"), ("vx", "<f4"), ("vy", "<f4")])
+ANGLE = np.dtype([("id", "<u4"), ("angle", "<i2")])
+WRAPS = np.zeros(256, dtype=bool)
+WRAPS[[EntityKind.SPACESHIP, EntityKind.ASTEROID]] = True
+
+Snapshot = namedtuple("Snapshot", ["tick", "score", "lives", "level",
+                                   "state", "entities"])
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def entity_id(row, generation):
+    return (generation & 0xFFFF) << 16 | row
+
+
+def predict(entities, elapsed, size):
+    positions = np.stack((entities["x"], entities["y"]), axis=1) \
+        .astype(np.float64)
+    positions[:, 0] += entities["vx"] * elapsed
+    positions[:, 1] += entities["vy"] * elapsed
+    np.mod(positions, size, out=positions,
+           where=WRAPS[entities["kind"]][:, None])
+    return positions.astype(np.float32)
+
+
+def pack_fields(dtype, entities):
+    packed = np.empty(len(entities), dtype=dtype)
+    for name in dtype.names:
+        packed[name] = entities[name]
+    return packed.tobytes()
+
+
+class SnapshotCodec:
+    def __init__(self, width, height, tolerance=0.25):
+        self.size = np.array((width, height), dtype=np.float64)
+        self.tolerance = tolerance
+
+    def encode(self, snapshot, sequence, base=None, base_sequence=NO_BASE):
+        current = snapshot.entities
+        if base is None:
+            base_sequence = NO_BASE
+            sent = current
+            removed = np.zeros(0, dtype=REMOVED)
+            spawned = current
+            moved = turned = steered = current[:0]
+        else:
+            sent = current.copy()
+            previous = base.entities
+            index = np.minimum(np.searchsorted(previous["id"], current["id"]),
+                               max(len(previous) - 1, 0))
+            known = previous["id"][index] == current["id"] \
+                if len(previous) else np.zeros(len(current), dtype=bool)
+            removed = np.setdiff1d(previous["id"], current["id"],
+                                   assume_unique=True).astype(REMOVED)
+            spawned = current[~known]
+            before = previous[index[known]]
+            after = sent[known]
+
+            predicted = predict(before, snapshot.tick - base.tick, self.size)
+            error = np.abs(predicted - np.stack((after["x"], after["y"]),
+                                                axis=1)).astype(np.float64)
+            error = np.where(WRAPS[after["kind"]][:, None],
+                             np.minimum(error, self.size - error), error)
+            is_moved = (error > self.tolerance).any(axis=1)
+            after["x"] = np.where(is_moved, after["x"], predicted[:, 0])
+            after["y"] = np.where(is_moved, after["y"], predicted[:, 1])
+            sent[known] = after
+            moved = after[is_moved]
+            steered = after[(after["vx"] != before["vx"])
+                            | (after["vy"] != before["vy"])]
+            turned = after[after["angle"] != before["angle"]]
+
+        header = HEADER.pack(sequence, base_sequence, snapshot.tick,
+                             snapshot.score, snapshot.lives, snapshot.level,
+                             snapshot.state, len(removed), len(spawned),
+                             len(moved), len(steered), len(turned))
+        data = b"".join((header, removed.tobytes(), spawned.tobytes(),
+                         pack_fields(POSITION, moved),
+                         pack_fields(VELOCITY, steered),
+                         pack_fields(ANGLE, turned)))
+        return data, snapshot._replace(entities=sent)
+
+    def decode(self, data, bases):
+        view = memoryview(data)
+        if len(view) < HEADER.size:
+            raise SnapshotError("truncated snapshot")
+        sequence, base_sequence, tick, score, lives, level, state, \
+            removed, spawned, moved, steered, turned = \
+            HEADER.unpack_from(view, 0)
+        offset = HEADER.size
+
+        def take(dtype, count):
+            nonlocal offset
+            if offset + dtype.itemsize * count > len(view):
+                raise SnapshotError("truncated snapshot")
+            values = np.frombuffer(view, dtype=dtype, count=count,
+                                   offset=offset)
+            offset += dtype.itemsize * count
+            return values
+
+        removed = take(REMOVED, removed)
+        spawned = take(ENTITY, spawned)
+        moved = take(POSITION, moved)
+        steered = take(VELOCITY, steered)
+        turned = take(ANGLE, turned)
+
+        if base_sequence == NO_BASE:
+            entities = spawned.copy()
+        else:
+            base = bases.get(base_sequence)
+            if base is None:
+                raise SnapshotError(f"missing base snapshot {base_sequence}")
+            entities = base.entities[~np.isin(base.entities["id"], removed)]
+            predicted = predict(entities, tick - base.tick, self.size)
+            entities["x"] = predicted[:, 0]
+            entities["y"] = predicted[:, 1]
+            for updates, names in ((moved, ("x", "y")),
+                                   (steered, ("vx", "vy")),
+                                   (turned, ("angle",))):
+                index = np.searchsorted(entities["id"], updates["id"])
+                for name in names:
+                    entities[name][index] = updates[name]
+            entities = np.concatenate((entities, spawned))
+            entities = entities[np.argsort(entities["id"], kind="stable")]
+        return sequence, base_sequence, Snapshot(tick, score, lives, level,
+                                                 state, entities)
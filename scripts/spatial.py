@@ -0,0 +1,109 @@
+from math import sqrt
+
+import numpy as np
+
+
+NEIGHBOURS = np.array([(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+
+
+class SpatialHash:
+    SCALAR_PAIRS = 32
+    BRUTE_FORCE_PAIRS = 4096
+
+    def __init__(self, width, height, cell_size=128):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+
+    def pairs(self, positions, radii, other_positions, other_radii):
+        count, other_count = len(positions), len(other_positions)
+        if not count or not other_count:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        if count * other_count <= self.SCALAR_PAIRS:
+            return scalar_pairs(positions.tolist(), radii.tolist(),
+                                other_positions.tolist(), other_radii.tolist())
+        if count * other_count <= self.BRUTE_FORCE_PAIRS:
+            return brute_force_pairs(positions, radii, other_positions,
+                                     other_radii)
+        candidates = self.__candidates(positions, radii, other_positions,
+                                       other_radii)
+
+        indices, other_indices = np.divmod(candidates, other_count)
+        delta = positions[indices] - other_positions[other_indices]
+        distances = np.sqrt(delta[:, 0] * delta[:, 0]
+                            + delta[:, 1] * delta[:, 1])
+        hits = distances < radii[indices] + other_radii[other_indices]
+        return indices[hits], other_indices[hits]
+
+    def store_pairs(self, store, rows, other_rows):
+        return self.pairs(store.positions[rows], store.radii[rows],
+                          store.positions[other_rows],
+                          store.radii[other_rows])
+
+    def __candidates(self, positions, radii, other_positions, other_radii):
+        reach = max(self.cell_size, radii.max() + other_radii.max())
+        columns = max(1, int(self.width // reach))
+        rows = max(1, int(self.height // reach))
+        cell_size = np.array((self.width / columns, self.height / rows))
+
+        cells = np.floor(positions / cell_size).astype(np.intp)
+        other_cells = np.floor(other_positions / cell_size).astype(np.intp)
+        other_keys = (other_cells[:, 1] % rows) * columns \
+            + other_cells[:, 0] % columns
+        order = np.argsort(other_keys, kind="stable")
+        sorted_keys = other_keys[order]
+
+        neighbours = cells[:, None, :] + NEIGHBOURS[None, :, :]
+        keys = ((neighbours[..., 1] % rows) * columns
+                + neighbours[..., 0] % columns).ravel()
+        starts = np.searchsorted(sorted_keys, keys, "left")
+        counts = np.searchsorted(sorted_keys, keys, "right") - starts
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, dtype=np.intp)
+
+        indices = np.repeat(np.arange(len(keys)) // len(NEIGHBOURS), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts,
+                                               counts)
+        candidates = indices * len(other_positions) \
+            + order[np.repeat(starts, counts) + offsets]
+        if columns < 3 or rows < 3:
+            return np.unique(candidates)
+        candidates.sort()
+        return candidates
+
+
+def brute_force_pairs(positions, radii, other_positions, other_radii):
+    delta_x = positions[:, 0, None] - other_positions[None, :, 0]
+    delta_y = positions[:, 1, None] - other_positions[None, :, 1]
+    distances = np.sqrt(delta_x * delta_x + delta_y * delta_y)
+    return np.nonzero(distances < radii[:, None] + other_radii[None, :])
+
+
+def scalar_pairs(positions, radii, other_positions, other_radii):
+    indices = []
+    other_indices = []
+    for index, ((x, y), radius) in enumerate(zip(positions, radii)):
+        for other_index, ((other_x, other_y), other_radius) in enumerate(
+                zip(other_positions, other_radii)):
+            delta_x = x - other_x
+            delta_y = y - other_y
+            if sqrt(delta_x * delta_x + delta_y * delta_y) < \
+                    radius + other_radius:
+                indices.append(index)
+                other_indices.append(other_index)
+    return np.array(indices, dtype=np.intp), \
+        np.array(other_indices, dtype=np.intp)
+
+
+def first_unclaimed(indices, other_indices):
+    claimed = set()
+    matched = -1
+    matches = []
+    for index, other_index in zip(indices.tolist(), other_indices.tolist()):
+        if index == matched or other_index in claimed:
+            continue
+        claimed.add(other_index)
+        matched = index
+        matches.append((index, other_index))
+    return matches
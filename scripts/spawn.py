@@ -0,0 +1,100 @@
+import random
+from itertools import islice
+from math import ceil, hypot
+
+
+class SpawnGrid:
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.__cells = {}
+
+    def add(self, x, y):
+        key = (int(x // self.cell_size), int(y // self.cell_size))
+        self.__cells.setdefault(key, []).append((x, y))
+
+    def is_free(self, x, y, spacing):
+        column, row = int(x // self.cell_size), int(y // self.cell_size)
+        reach = ceil(spacing / self.cell_size)
+        for dy in range(-reach, reach + 1):
+            for dx in range(-reach, reach + 1):
+                for other_x, other_y in self.__cells.get(
+                        (column + dx, row + dy), ()):
+                    if hypot(x - other_x, y - other_y) < spacing:
+                        return False
+        return True
+
+
+def exclusion_margin(x, y, exclusions):
+    return min((hypot(x - center_x, y - center_y) - radius
+                for (center_x, center_y), radius in exclusions),
+               default=float("inf"))
+
+
+def poisson_disk(width, height, count, spacing, rng, exclusions=(),
+                 attempts=30, shrink=0.7, passes=4):
+    grid = SpawnGrid(spacing)
+    placed = 0
+    for _ in range(passes):
+        while placed < count:
+            for _ in range(attempts):
+                x, y = rng.uniform(0, width), rng.uniform(0, height)
+                if exclusion_margin(x, y, exclusions) > 0 and \
+                        grid.is_free(x, y, spacing):
+                    break
+            else:
+                break
+            grid.add(x, y)
+            placed += 1
+            yield x, y
+        spacing *= shrink
+
+    while placed < count:
+        candidates = [(rng.uniform(0, width), rng.uniform(0, height))
+                      for _ in range(attempts)]
+        x, y = max(candidates, key=lambda candidate: exclusion_margin(
+            *candidate, exclusions))
+        placed += 1
+        yield x, y
+
+
+class SpawnPlanner:
+    def __init__(self, width, height, spacing=150, exclusion_radius=250,
+                 attempts=30, points_per_tick=16):
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.exclusion_radius = exclusion_radius
+        self.attempts = attempts
+        self.points_per_tick = points_per_tick
+        self.__key = None
+        self.__points = []
+        self.__pending = iter(())
+
+    def sampler(self, seed, level, count, center):
+        return poisson_disk(self.width, self.height, count, self.spacing,
+                            random.Random((seed << 8) | level),
+                            [(tuple(center), self.exclusion_radius)],
+                            self.attempts)
+
+    def prepare(self, seed, level, count, center):
+        key = (seed, level, count, tuple(center))
+        if key != self.__key:
+            self.__key = key
+            self.__points = []
+            self.__pending = self.sampler(seed, level, count, center)
+
+    def advance(self, budget=None):
+        budget = self.points_per_tick if budget is None else budget
+        self.__points.extend(islice(self.__pending, budget))
+
+    def is_ready(self):
+        return self.__key is not None and \
+            len(self.__points) == self.__key[2]
+
+    def layout(self, seed, level, count, center):
+        self.prepare(seed, level, count, center)
+        self.__points.extend(self.__pending)
+        points = self.__points
+        self.__key = None
+        self.__points = []
+        return points
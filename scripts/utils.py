@@ -1,25 +1,263 @@
 import random
+from collections import OrderedDict
+from pathlib import Path
 
-from pygame import Color, event
+from pygame import BLEND_RGBA_MAX, SRCALPHA, Color, Rect, Surface, event
+from pygame.font import Font
 from pygame.image import load
 from pygame.math import Vector2
+from pygame.transform import rotozoom
 from pygame_widgets import Mouse
-from pygame.mixer import Sound
+from scripts.audio import sound_bank
+
+
+class SpriteCache:
+    def __init__(self, directory="../assets/sprites"):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.__sprites = {}
+
+    def get(self, name, with_alpha=True):
+        key = (name, with_alpha)
+        sprite = self.__sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        loaded_sprite = load(f"{self.directory}/{name}.png")
+        if with_alpha:
+            sprite = loaded_sprite.convert_alpha()
+        else:
+            sprite = loaded_sprite.convert()
+        self.__sprites[key] = sprite
+        return sprite
+
+    def preload(self, with_alpha=True):
+        for path in sorted(Path(self.directory).glob("*.png")):
+            if (path.stem, with_alpha) not in self.__sprites:
+                self.get(path.stem, with_alpha)
+
+    def stats(self):
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "sprites": len(self.__sprites)}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.__sprites.clear()
+        self.reset_stats()
+
+    def __contains__(self, name):
+        return (name, True) in self.__sprites or \
+            (name, False) in self.__sprites
+
+    def __len__(self):
+        return len(self.__sprites)
+
+
+sprite_cache = SpriteCache()
+
+
+class TransformCache:
+    def __init__(self, byte_budget=32 * 1024 * 1024, angle_step=3,
+                 scale_step=0.05):
+        self.byte_budget = byte_budget
+        self.angle_step = angle_step
+        self.scale_step = scale_step
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self.__surfaces = OrderedDict()
+
+    def quantize(self, angle, scale):
+        angle = round(angle / self.angle_step) * self.angle_step % 360
+        scale = max(self.scale_step,
+                    round(scale / self.scale_step) * self.scale_step)
+        return angle, round(scale, 6)
+
+    def get(self, name, angle=0, scale=1.0):
+        key = (name, *self.quantize(angle, scale))
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = rotozoom(load_sprite(name), key[1], key[2])
+        self.__surfaces[key] = surface
+        self.resident_bytes += surface_bytes(surface)
+        self.__evict()
+        return surface
+
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hit_rate(),
+                "resident_bytes": self.resident_bytes,
+                "surfaces": len(self.__surfaces)}
+
+    def clear(self):
+        self.__surfaces.clear()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __evict(self):
+        while self.resident_bytes > self.byte_budget and \
+                len(self.__surfaces) > 1:
+            _, surface = self.__surfaces.popitem(last=False)
+            self.resident_bytes -= surface_bytes(surface)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+transform_cache = TransformCache()
+
+
+class SpriteAtlas:
+    def __init__(self, size=1024, padding=1, max_pages=4):
+        self.size = size
+        self.padding = padding
+        self.max_pages = max_pages
+        self.overflows = 0
+        self.pages = []
+        self.__shelves = []
+        self.__regions = {}
+
+    def get(self, key):
+        return self.__regions.get(key)
+
+    def add(self, key, surface):
+        region = self.__regions.get(key)
+        if region is not None:
+            return region
+
+        width, height = surface.get_size()
+        placement = self.__place(width + self.padding,
+                                 height + self.padding, surface)
+        if placement is None:
+            self.overflows += 1
+            return surface, surface.get_rect()
+        page, x, y = placement
+        page.blit(surface, (x, y), special_flags=BLEND_RGBA_MAX)
+        region = (page, Rect(x, y, width, height))
+        self.__regions[key] = region
+        return region
+
+    @property
+    def byte_budget(self):
+        return self.max_pages * self.size * self.size * 4
+
+    @property
+    def resident_bytes(self):
+        return sum(map(surface_bytes, self.pages))
+
+    def stats(self):
+        return {"pages": len(self.pages),
+                "regions": len(self.__regions),
+                "overflows": self.overflows,
+                "resident_bytes": self.resident_bytes}
+
+    def clear(self):
+        self.pages.clear()
+        self.__shelves.clear()
+        self.__regions.clear()
+        self.overflows = 0
+
+    def __place(self, width, height, surface):
+        if width > self.size or height > self.size:
+            return None
+        for page, shelves in zip(self.pages, self.__shelves):
+            position = self.__place_on(shelves, width, height)
+            if position is not None:
+                return (page, *position)
+        if len(self.pages) >= self.max_pages:
+            return None
+
+        page = Surface((self.size, self.size), SRCALPHA, surface)
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.__shelves.append([])
+        return (page, *self.__place_on(self.__shelves[-1], width, height))
+
+    def __place_on(self, shelves, width, height):
+        best = None
+        for shelf in shelves:
+            top, shelf_height, x = shelf
+            if height <= shelf_height and x + width <= self.size and \
+                    (best is None or shelf_height < best[1]):
+                best = shelf
+        if best is None:
+            top = shelves[-1][0] + shelves[-1][1] if shelves else 0
+            if top + height > self.size:
+                return None
+            best = [top, height, 0]
+            shelves.append(best)
+        position = (best[2], best[0])
+        best[2] += width
+        return position
+
+    def __contains__(self, key):
+        return key in self.__regions
+
+    def __len__(self):
+        return len(self.__regions)
+
+
+sprite_atlas = SpriteAtlas()
 
 
 def load_sprite(name, with_alpha=True):
-    path = f"../assets/sprites/{name}.png"
-    loaded_sprite = load(path)
+    return sprite_cache.get(name, with_alpha)
+
+
+def preload_sprites():
+    sprite_cache.preload()
+    sprites = {path.stem: load_sprite(path.stem)
+               for path in Path(sprite_cache.directory).glob("*.png")}
+    for name in sorted(sprites, key=lambda name: -sprites[name].get_height()):
+        load_sprite_region(name)
 
-    if with_alpha:
-        return loaded_sprite.convert_alpha()
-    else:
-        return loaded_sprite.convert()
+
+def load_transformed_sprite(name, angle=0, scale=1.0):
+    return transform_cache.get(name, angle, scale)
+
+
+def load_sprite_region(name, angle=0, scale=1.0):
+    key = (name, *transform_cache.quantize(angle, scale))
+    region = sprite_atlas.get(key)
+    if region is None:
+        if key[1:] == (0, 1.0):
+            sprite = load_sprite(name)
+        else:
+            sprite = load_transformed_sprite(name, angle, scale)
+        region = sprite_atlas.add(key, sprite)
+    return region
 
 
 def load_sound(name):
-    path = f"../assets/sounds/{name}.wav"
-    return Sound(path)
+    return sound_bank.get(name)
+
 
 def wrap_position(position, surface):
     x, y = position
@@ -45,13 +283,72 @@ def get_random_size(min_size, max_size):
     return size
 
 
+class FontRegistry:
+    def __init__(self):
+        self.__fonts = {}
+
+    def get(self, face, size):
+        font = self.__fonts.get((face, size))
+        if font is None:
+            font = Font(face, size)
+            self.__fonts[(face, size)] = font
+        return font
+
+    def __len__(self):
+        return len(self.__fonts)
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(Color(color)), antialias)
+        text_surface = self.__surfaces.get(key)
+        if text_surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return text_surface
+
+        self.misses += 1
+        text_surface = font.render(text, antialias, color)
+        self.__surfaces[key] = text_surface
+        if len(self.__surfaces) > self.max_entries:
+            self.__surfaces.popitem(last=False)
+        return text_surface
+
+    def stats(self):
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "surfaces": len(self.__surfaces)}
+
+    def clear(self):
+        self.__surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+
+font_registry = FontRegistry()
+text_cache = TextCache()
+
+
+def load_font(face, size):
+    return font_registry.get(face, size)
+
+
 def print_text(surface, text, font, rect_center, color=Color("red")):
-    text_surface = font.render(text, True, color)
+    text_surface = text_cache.render(font, text, color)
 
     rect = text_surface.get_rect()
     rect.center = rect_center
 
-    surface.blit(text_surface, rect)
+    return surface.blit(text_surface, rect)
 
 
 def draw_label(self, text, color):
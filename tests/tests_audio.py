@@ -0,0 +1,82 @@
+from unittest import TestCase, main
+
+import pygame
+
+from scripts.audio import SoundBank, ChannelPool, SoundEffect, sound_bank
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestSoundBank(TestCase):
+    def setUp(self):
+        self.bank = SoundBank()
+
+    def test_get_decodes_once(self):
+        first = self.bank.get("stone_crush")
+        second = self.bank.get("stone_crush")
+        self.assertIs(first, second)
+        self.assertEqual(self.bank.stats(),
+                         {"hits": 1, "misses": 1, "sounds": 1})
+
+    def test_preload(self):
+        self.bank.preload()
+        self.assertIn("laser-pistol", self.bank)
+        self.assertIn("ufo_explosion", self.bank)
+        self.assertEqual(self.bank.hits, 0)
+
+
+class TestChannelPool(TestCase):
+    def setUp(self):
+        self.bank = SoundBank()
+        self.pool = ChannelPool(size=2)
+        if not pygame.mixer.get_init():
+            self.skipTest("mixer is not available")
+
+    def tearDown(self):
+        self.pool.stop_all()
+
+    def test_deduplicates_same_frame(self):
+        sound = self.bank.get("stone_crush")
+        self.assertIsNotNone(self.pool.play(sound, 0.7))
+        self.assertIsNone(self.pool.play(sound, 0.7))
+        self.assertEqual(self.pool.deduplicated, 1)
+        self.pool.begin_frame()
+        self.assertIsNotNone(self.pool.play(sound, 0.7))
+
+    def test_steals_lowest_priority_voice(self):
+        sound = self.bank.get("stone_crush")
+        low = self.pool.play(sound, 0.1, priority=0, loops=-1)
+        self.pool.play(sound, 0.2, priority=2, loops=-1)
+        stolen = self.pool.play(self.bank.get("spaceship_impact"),
+                                priority=1)
+        self.assertIs(stolen, low)
+        self.assertEqual(self.pool.stolen, 1)
+
+    def test_drops_when_all_voices_outrank(self):
+        sound = self.bank.get("stone_crush")
+        self.pool.play(sound, 0.1, priority=3, loops=-1)
+        self.pool.play(sound, 0.2, priority=3, loops=-1)
+        self.assertIsNone(self.pool.play(self.bank.get("ufo_laser")))
+        self.assertEqual(self.pool.dropped, 1)
+
+    def test_stop_only_owner(self):
+        sound = self.bank.get("stone_crush")
+        first, second = object(), object()
+        self.pool.play(sound, 0.1, loops=-1, owner=first)
+        self.pool.play(sound, 0.2, loops=-1, owner=second)
+        self.pool.stop(first)
+        self.assertEqual(self.pool.busy_channels(), 1)
+
+
+class TestSoundEffect(TestCase):
+    def test_effects_share_decoded_sound(self):
+        SoundEffect("stone_crush", 0.7).play()
+        misses = sound_bank.misses
+        for _ in range(10):
+            SoundEffect("stone_crush", 0.7).play()
+        self.assertEqual(sound_bank.misses, misses)
+
+
+if __name__ == '__main__':
+    main()
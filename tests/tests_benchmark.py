@@ -0,0 +1,47 @@
+from unittest import TestCase, main
+
+import pygame
+
+from scripts.benchmark import World, PHASES, run_benchmark, compare
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestWorld(TestCase):
+    def test_world_is_proportional(self):
+        world = World(40, seed=1)
+        self.assertEqual(len(world.asteroids), 40)
+        self.assertEqual(len(world.bullets), 20)
+        self.assertEqual(len(world.ufo_bullets), 20)
+        self.assertEqual(len(world.ufos), 1)
+        self.assertEqual(len(world.objects()), 82)
+
+    def test_split_cascade_consumes_all_fragments(self):
+        world = World(3, seed=1)
+        world.split_cascade(world.asteroids[:])
+        self.assertEqual(world.spaceship.score, 3 * (25 + 2 * 50 + 4 * 100))
+
+
+class TestBenchmark(TestCase):
+    def test_run_benchmark_times_every_phase(self):
+        results = run_benchmark(sizes=(10,), repeats=1)
+        scenario = results["scenarios"]["10"]
+        for phase in PHASES:
+            self.assertGreaterEqual(scenario[phase]["median_ms"], 0)
+            self.assertEqual(scenario[phase]["repeats"], 1)
+
+    def test_compare_flags_regressions_over_threshold(self):
+        def results(move, draw):
+            return {"scenarios": {"10": {"move": {"median_ms": move},
+                                         "draw": {"median_ms": draw}}}}
+
+        comparison = compare(results(1.1, 1.5), results(1.0, 1.0),
+                             threshold=0.2)
+        self.assertEqual([(row["phase"], row["regression"])
+                          for row in comparison],
+                         [("move", False), ("draw", True)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import gc
+from unittest import TestCase, main
+
+import numpy as np
+from pygame import Surface, Vector2
+
+from scripts.entities import EntityStore, EntityKind, rows_of
+from scripts.models import GameObject, Bullet, Ufo
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestEntityStore(TestCase):
+    def setUp(self):
+        self.store = EntityStore(capacity=2)
+
+    def test_allocate_grows_capacity(self):
+        rows = [self.store.allocate((i, i), (0, 0), 1, EntityKind.ASTEROID)[0]
+                for i in range(5)]
+        self.assertEqual(rows, [0, 1, 2, 3, 4])
+        self.assertGreaterEqual(self.store.capacity, 5)
+        self.assertEqual(self.store.positions[4].tolist(), [4, 4])
+
+    def test_release_reuses_row_and_ignores_stale_generation(self):
+        row, generation = self.store.allocate((0, 0), (1, 1), 1,
+                                              EntityKind.BULLET)
+        self.store.release(row, generation)
+        new_row, new_generation = self.store.allocate((0, 0), (1, 1), 1,
+                                                      EntityKind.BULLET)
+        self.assertEqual(new_row, row)
+        self.store.release(row, generation)
+        self.assertTrue(self.store.alive[row])
+        self.assertEqual(self.store.count(EntityKind.BULLET), 1)
+
+    def test_move_wraps_only_wrapping_rows(self):
+        self.store.allocate((99, 99), (2, 2), 1, EntityKind.ASTEROID)
+        self.store.allocate((99, 99), (2, 2), 1, EntityKind.BULLET,
+                            wraps=False)
+        self.store.move(100, 100)
+        self.assertEqual(self.store.positions[0].tolist(), [1, 1])
+        self.assertEqual(self.store.positions[1].tolist(), [101, 101])
+
+    def test_interpolate_between_snapshot_and_current(self):
+        self.store.allocate((10, 10), (4, 2), 1, EntityKind.ASTEROID)
+        self.store.snapshot()
+        self.store.move(100, 100)
+        positions = self.store.interpolate([0], 0.5, 100, 100)
+        self.assertEqual(positions.tolist(), [[12, 11]])
+
+    def test_interpolate_snaps_across_wrap(self):
+        self.store.allocate((99, 50), (2, 0), 1, EntityKind.ASTEROID)
+        self.store.snapshot()
+        self.store.move(100, 100)
+        positions = self.store.interpolate([0], 0.5, 100, 100)
+        self.assertEqual(positions.tolist(), [[1, 50]])
+
+    def test_new_row_does_not_interpolate_from_stale_position(self):
+        row, generation = self.store.allocate((0, 0), (0, 0), 1,
+                                              EntityKind.BULLET)
+        self.store.snapshot()
+        self.store.release(row, generation)
+        self.store.allocate((30, 30), (0, 0), 1, EntityKind.BULLET)
+        positions = self.store.interpolate([row], 0.25, 100, 100)
+        self.assertEqual(positions.tolist(), [[30, 30]])
+
+    def test_placed_row_does_not_interpolate(self):
+        self.store.allocate((10, 10), (0, 0), 1, EntityKind.BULLET)
+        self.store.snapshot()
+        self.store.place(0, (40, 20))
+        positions = self.store.interpolate([0], 0.0, 100, 100)
+        self.assertEqual(positions.tolist(), [[40, 20]])
+
+    def test_outside_matches_screen_rect(self):
+        rect = pygame.Rect(0, 0, 100, 100)
+        points = [(-0.5, 5), (-1, 5), (99.9, 5), (100, 5), (5, 50)]
+        rows = [self.store.allocate(point, (0, 0), 1, EntityKind.BULLET)[0]
+                for point in points]
+        outside = self.store.outside(rows, 100, 100)
+        self.assertEqual(outside.tolist(),
+                         [not rect.collidepoint(point) for point in points])
+
+
+class TestGameObjectView(TestCase):
+    def setUp(self):
+        self.store = EntityStore()
+
+    def test_object_reads_and_writes_its_row(self):
+        game_object = GameObject((10, 20), Surface((30, 30)), (1, 2),
+                                 self.store)
+        game_object.velocity += Vector2(1, 1)
+        self.assertEqual(self.store.velocities[game_object.row].tolist(),
+                         [2, 3])
+        self.assertEqual(game_object.radius, 15)
+        self.store.move(100, 100)
+        self.assertEqual(game_object.position, Vector2(12, 23))
+
+    def test_collected_object_frees_its_row(self):
+        Bullet((10, 10), (1, 0), True, self.store)
+        gc.collect()
+        self.assertEqual(self.store.count(), 0)
+
+    def test_ufo_age_follows_store(self):
+        ufo = Ufo((10, 10), (1, 0), None, self.store)
+        self.store.move(100, 100)
+        self.assertEqual(ufo.current_frame_alive, 1)
+        self.assertEqual(rows_of([ufo]).dtype, np.intp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from scripts.controls import InputFlag
+from scripts.entities import EntityKind
+from scripts.env import AsteroidsEnv
+
+
+class TestAsteroidsEnv(TestCase):
+    def setUp(self):
+        self.env = AsteroidsEnv(nearest_asteroids=4, nearest_ufos=1,
+                                nearest_bullets=2, max_steps=400)
+
+    def test_observation_has_fixed_shape(self):
+        observation = self.env.reset(seed=1)
+        self.assertEqual(observation.shape, (8 + 7 * 6,))
+        self.assertEqual(observation.dtype, np.float32)
+        self.assertEqual(observation[6], 3)
+        self.assertEqual(observation[7], 1)
+        self.assertEqual(observation[8], 1)
+        self.assertEqual(observation[14], 0)
+
+    def test_idle_pool_bullets_are_not_observed(self):
+        observation = self.env.reset(seed=1)
+        bullets = observation[8 + 5 * 6:].reshape(2, 6)
+        np.testing.assert_array_equal(bullets, 0)
+        for _ in range(181):
+            observation = self.env.step(InputFlag.NONE)[0]
+        bullets = observation[8 + 5 * 6:].reshape(2, 6)
+        self.assertEqual(bullets[:, 0].tolist(), [1, 0])
+
+    def test_step_reuses_buffers(self):
+        observation = self.env.reset(seed=1)
+        info = self.env.info
+        result, reward, done, step_info = self.env.step(InputFlag.UP)
+        self.assertIs(result, observation)
+        self.assertIs(step_info, info)
+        self.assertEqual(reward, 0)
+        self.assertFalse(done)
+        self.assertEqual(step_info["steps"], 1)
+
+    def test_same_seed_and_actions_give_same_observations(self):
+        actions = np.random.default_rng(4).integers(0, 16, 300).tolist()
+        runs = []
+        for _ in range(2):
+            self.env.reset(seed=9)
+            observations = [self.env.step(action)[0].copy()
+                            for action in actions]
+            runs.append(np.array(observations))
+        np.testing.assert_array_equal(runs[0], runs[1])
+
+    def test_reset_restarts_the_same_game(self):
+        first = self.env.reset(seed=3).copy()
+        game = self.env.game
+        for _ in range(50):
+            self.env.step(InputFlag.UP | InputFlag.SHOOT)
+        np.testing.assert_array_equal(self.env.reset(seed=3), first)
+        self.assertIs(self.env.game, game)
+        self.assertEqual(self.env.info["steps"], 0)
+
+    def test_asteroids_are_sorted_by_distance(self):
+        self.env.reset(seed=2)
+        for _ in range(200):
+            observation, _, done, _ = self.env.step(
+                InputFlag.RIGHT | InputFlag.SHOOT)
+            asteroids = observation[8:8 + 4 * 6].reshape(4, 6)
+            present = asteroids[asteroids[:, 0] == 1]
+            distances = np.hypot(present[:, 1] * 1500, present[:, 2] * 700)
+            self.assertTrue(np.all(np.diff(distances) >= -1e-3))
+            if done:
+                break
+
+    def test_offsets_wrap_for_objects_outside_the_screen(self):
+        self.env.reset(seed=1)
+        store = self.env.game.entities
+        size = store.size
+        row = np.flatnonzero((store.kinds[:size] == EntityKind.ASTEROID)
+                             & store.alive[:size])[0]
+        x, y = store.positions[self.env.game.spaceship.row]
+        store.positions[row] = x + 3120, y - 1400
+        store.velocities[row] = 0
+        store.wraps[row] = False
+        observation = self.env.step(InputFlag.NONE)[0]
+        np.testing.assert_allclose(observation[8:11], (1, 120 / 1500, 0),
+                                   atol=1e-6)
+
+    def test_rewards_track_score_and_episode_ends(self):
+        self.env.reset(seed=2)
+        total = 0
+        done = False
+        while not done:
+            _, reward, done, info = self.env.step(
+                InputFlag.RIGHT | InputFlag.SHOOT)
+            total += reward
+        lives_lost = 3 - info["lives"]
+        self.assertEqual(total, info["score"] - 100 * lives_lost)
+        self.assertLessEqual(info["steps"], 400)
+
+
+if __name__ == '__main__':
+    main()
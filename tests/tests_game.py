@@ -1,9 +1,15 @@
+import os
+import tempfile
+import threading
 import pygame
 
 from unittest import TestCase, main
 from pygame import Vector2
 from scripts.game import GameState, Asteroids, restart_game
 from scripts.models import Spaceship, Asteroid, Bullet, Ufo
+from scripts import leaderboard as leaderboard_module
+from scripts.leaderboard import Leaderboard
+from scripts.entities import EntityKind
 from unittest.mock import patch
 
 pygame.init()
@@ -385,11 +391,11 @@ class TestAsteroids(TestCase):
         spaceship.score = 1000
         asteroids_game.__spaceship = spaceship
         asteroids_game.__nickname = "Player1"
-        asteroids_game.__leaderboard = {}
+        asteroids_game.__leaderboard = Leaderboard(":memory:")
 
-        asteroids_game.__record_score("record_table.txt")
+        asteroids_game.__record_score()
 
-        self.assertEqual(asteroids_game.__leaderboard["Player1"], 1000)
+        self.assertEqual(asteroids_game.__leaderboard.best("Player1"), 1000)
 
     def test_record_score_higher_score(self):
         asteroids_game = Asteroids()
@@ -397,11 +403,12 @@ class TestAsteroids(TestCase):
         spaceship.score = 2000
         asteroids_game.__spaceship = spaceship
         asteroids_game.__nickname = "Player1"
-        asteroids_game.__leaderboard = {"Player1": 1500}
+        asteroids_game.__leaderboard = Leaderboard(":memory:")
+        asteroids_game.__leaderboard.record("Player1", 1500)
 
-        asteroids_game.__record_score("record_table.txt")
+        asteroids_game.__record_score()
 
-        self.assertEqual(asteroids_game.__leaderboard["Player1"], 2000)
+        self.assertEqual(asteroids_game.__leaderboard.best("Player1"), 2000)
 
     def test_record_score_lower_score(self):
         asteroids_game = Asteroids()
@@ -409,20 +416,18 @@ class TestAsteroids(TestCase):
         spaceship.score = 800
         asteroids_game.__spaceship = spaceship
         asteroids_game.__nickname = "Player1"
-        asteroids_game.__leaderboard = {"Player1": 1000}
+        asteroids_game.__leaderboard = Leaderboard(":memory:")
+        asteroids_game.__leaderboard.record("Player1", 1000)
 
-        asteroids_game.__record_score("record_table.txt")
+        asteroids_game.__record_score()
 
-        self.assertEqual(asteroids_game.__leaderboard["Player1"], 1000)
+        self.assertEqual(asteroids_game.__leaderboard.best("Player1"), 1000)
 
-    def test_fill_leaderboard(self):
-        asteroids_game = Asteroids()
-        asteroids_game.__leaderboard = {}
-
-        asteroids_game.__fill_leaderboard("record_table.txt")
+    def test_migrate_leaderboard(self):
+        leaderboard = Leaderboard(":memory:", "record_table.txt")
 
-        expected_leaderboard = {"Player1": 1000}
-        self.assertEqual(asteroids_game.__leaderboard, expected_leaderboard)
+        expected_leaderboard = [("Player1", 1000)]
+        self.assertEqual(leaderboard.top(), expected_leaderboard)
 
     def test_check_game_state_spaceship_dead(self):
         asteroids_game = Asteroids()
@@ -544,5 +549,141 @@ class TestAsteroids(TestCase):
         self.assertEqual(asteroids_game.__nickname, expected_nickname)
 
 
+class TestRestart(TestCase):
+    def setUp(self):
+        self.game = Asteroids(headless=True, seed=2)
+        self.fresh = self.game.capture_state()
+        for _ in range(400):
+            self.game.step(8 | 2 | 4)
+
+    def test_restart_matches_fresh_game(self):
+        self.game.restart(to_menu=False)
+        self.assertEqual(self.game.capture_state(), self.fresh)
+        self.assertEqual(self.game.game_state, GameState.GAME)
+
+    def test_restart_to_menu_resets_nickname(self):
+        self.game._nickname = "Player1"
+        self.game.restart(to_menu=True)
+        self.assertEqual(self.game.game_state, GameState.MAIN_MENU)
+        self.assertEqual(self.game._nickname, "Default")
+
+    def test_restart_keeps_resources(self):
+        ship = self.game.add_ship()
+        store = self.game.entities
+        capacity = store.capacity
+        self.game.restart(to_menu=False)
+        self.assertIs(self.game.entities, store)
+        self.assertEqual(self.game.ships, [self.game.spaceship])
+        self.assertNotIn(ship, self.game.ships)
+        self.assertFalse(store.alive[ship.row] and
+                         store.generations[ship.row] == ship.generation)
+        self.assertEqual(store.count(EntityKind.SPACESHIP), 1)
+        for _ in range(20):
+            for _ in range(100):
+                self.game.step(8)
+            self.game.restart(to_menu=False)
+        self.assertEqual(store.capacity, capacity)
+        self.assertLess(self.game.restart_seconds, 0.05)
+
+
+class TestLeaderboardScreen(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.game = Asteroids(headless=True, seed=2)
+        self.game._nickname = "Player3"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_draw_while_index_is_loading(self):
+        path = os.path.join(self.directory.name, "leaderboard.db")
+        leaderboard = Leaderboard(path, build_index=False)
+        for i in range(10):
+            leaderboard.record(f"Player{i}", i * 100)
+        leaderboard.close()
+        loaded = threading.Event()
+        load_index = leaderboard_module.load_index
+
+        def slow_load_index(connection):
+            loaded.wait(5)
+            return load_index(connection)
+
+        with patch.object(leaderboard_module, "load_index",
+                          slow_load_index):
+            leaderboard = Leaderboard(path)
+            self.game._Asteroids__leaderboard = leaderboard
+            self.assertIsNone(leaderboard.index)
+            self.game._Asteroids__draw_leaderboard()
+            self.assertEqual(leaderboard.score("Player3"), 300)
+            self.assertEqual(leaderboard.rank("Player3"), 7)
+            loaded.set()
+            self.assertIsNotNone(leaderboard.wait_for_index(5))
+        self.game._Asteroids__draw_leaderboard()
+        self.assertEqual(leaderboard.score("Player3"), 300)
+        leaderboard.close()
+
+
+class TestSpawnLayout(TestCase):
+    def test_levels_spawn_away_from_ship(self):
+        game = Asteroids(headless=True, seed=5)
+        center = game.spaceship.position
+        for level in range(1, 4):
+            self.assertEqual(game.level, level)
+            asteroids = [game_object for game_object in game.game_objects
+                         if isinstance(game_object, Asteroid)]
+            self.assertTrue(all(asteroid.position.distance_to(center) > 250
+                                for asteroid in asteroids))
+            for asteroid in asteroids:
+                asteroid.store.release(asteroid.row, asteroid.generation)
+            game._Asteroids__asteroids.clear()
+            game._Asteroids__ufo_quantity = 0
+            game.step(0)
+
+    def test_layout_survives_save_and_load(self):
+        def next_level(game):
+            game._Asteroids__asteroids.clear()
+            game._Asteroids__ufo_quantity = 0
+            game.step(0)
+            return game.capture_state()
+
+        game = Asteroids(headless=True, seed=5)
+        game.step(0)
+        state = game.capture_state()
+        expected = next_level(game)
+        other = Asteroids(headless=True, seed=5)
+        for _ in range(50):
+            other.step(8 | 4)
+        other.restore_state(state)
+        self.assertEqual(next_level(other), expected)
+
+
+class TestUfoTimers(TestCase):
+    def test_first_ufo_spawns_and_fires_on_schedule(self):
+        game = Asteroids(headless=True, seed=3)
+        for _ in range(180):
+            game.step(0)
+        self.assertFalse(any(isinstance(game_object, Ufo)
+                             for game_object in game.game_objects))
+        game.step(0)
+        self.assertEqual(sum(isinstance(game_object, Ufo)
+                             for game_object in game.game_objects), 1)
+        self.assertEqual(sum(type(game_object) is Bullet
+                             for game_object in game.game_objects), 1)
+
+    def test_timers_survive_save_and_load(self):
+        game = Asteroids(headless=True, seed=3)
+        for _ in range(200):
+            game.step(0)
+        state = game.capture_state()
+        for _ in range(700):
+            game.step(0)
+        expected = game.capture_state()
+        other = Asteroids(headless=True, seed=3)
+        other.restore_state(state)
+        for _ in range(700):
+            other.step(0)
+        self.assertEqual(other.capture_state(), expected)
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+from unittest import TestCase, main
+
+from scripts.leaderboard import Leaderboard, parse_record_table
+
+
+class TestLeaderboard(TestCase):
+    def setUp(self):
+        self.leaderboard = Leaderboard(":memory:")
+
+    def test_record_keeps_best_score(self):
+        self.leaderboard.record("Player1", 1000)
+        self.leaderboard.record("Player1", 800)
+        self.assertEqual(self.leaderboard.best("Player1"), 1000)
+        self.leaderboard.record("Player1", 1500)
+        self.assertEqual(self.leaderboard.best("Player1"), 1500)
+        self.assertEqual(len(self.leaderboard), 1)
+
+    def test_unknown_player_has_no_score(self):
+        self.assertIsNone(self.leaderboard.best("Nobody"))
+
+    def test_top_is_sorted_and_paged(self):
+        for i in range(10):
+            self.leaderboard.record(f"Player{i}", i * 100)
+        self.assertEqual(self.leaderboard.top(3),
+                         [("Player9", 900), ("Player8", 800),
+                          ("Player7", 700)])
+        self.assertEqual(self.leaderboard.top(2, offset=8),
+                         [("Player1", 100), ("Player0", 0)])
+
+    def test_rank_and_page_follow_records(self):
+        for i in range(10):
+            self.leaderboard.record(f"Player{i}", i * 100)
+        self.assertEqual(self.leaderboard.rank("Player7"), 3)
+        self.leaderboard.record("Player0", 2000)
+        self.assertEqual(self.leaderboard.rank("Player0"), 1)
+        self.assertEqual(self.leaderboard.rank("Player7"), 4)
+        self.assertEqual(self.leaderboard.page(1, 4),
+                         [(5, "Player6", 600), (6, "Player5", 500),
+                          (7, "Player4", 400), (8, "Player3", 300)])
+        self.assertEqual(self.leaderboard.page_count(4), 3)
+
+    def test_queries_fall_back_to_sql_without_index(self):
+        leaderboard = Leaderboard(":memory:", build_index=False)
+        for i in range(10):
+            leaderboard.record(f"Player{i}", i * 100)
+        leaderboard.record("Tie", 700)
+        self.assertIsNone(leaderboard.index)
+        self.assertEqual(leaderboard.rank("Player7"), 3)
+        self.assertEqual(leaderboard.rank("Tie"), 4)
+        self.assertIsNone(leaderboard.rank("Nobody"))
+        self.assertEqual(leaderboard.page(1, 4),
+                         [(5, "Player6", 600), (6, "Player5", 500),
+                          (7, "Player4", 400), (8, "Player3", 300)])
+        self.assertEqual(leaderboard.page_count(4), 3)
+        leaderboard.close()
+
+
+class TestMigration(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.legacy_path = os.path.join(self.directory.name,
+                                        "record_table.txt")
+        self.database_path = os.path.join(self.directory.name,
+                                          "leaderboard.db")
+        with open(self.legacy_path, "w") as record_table:
+            record_table.write("Player1: 1000 \n"
+                               "\n"
+                               "a:b:c: 300 \n"
+                               "broken line\n"
+                               "Player2: 500 \n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_handles_colons_and_blank_lines(self):
+        self.assertEqual(parse_record_table(self.legacy_path),
+                         {"Player1": 1000, "a:b:c": 300, "Player2": 500})
+
+    def test_text_file_is_migrated_once(self):
+        leaderboard = Leaderboard(self.database_path, self.legacy_path)
+        self.assertEqual(leaderboard.top(),
+                         [("Player1", 1000), ("Player2", 500),
+                          ("a:b:c", 300)])
+        leaderboard.close()
+
+        with open(self.legacy_path, "a") as record_table:
+            record_table.write("Player3: 5000 \n")
+        leaderboard = Leaderboard(self.database_path, self.legacy_path)
+        self.assertIsNone(leaderboard.best("Player3"))
+        self.assertEqual(leaderboard.migrate(self.legacy_path), 0)
+        leaderboard.close()
+
+    def test_index_is_built_in_background(self):
+        leaderboard = Leaderboard(self.database_path, self.legacy_path)
+        leaderboard.record("Player3", 2000)
+        leaderboard.record("Player2", 100)
+        self.assertEqual(leaderboard.rank("Player3"), 1)
+        index = leaderboard.wait_for_index(5)
+        self.assertIsNotNone(index)
+        self.assertEqual(leaderboard.page(0, 10),
+                         [(1, "Player3", 2000), (2, "Player1", 1000),
+                          (3, "Player2", 500), (4, "a:b:c", 300)])
+        leaderboard.close()
+
+    def test_scores_survive_reopening(self):
+        leaderboard = Leaderboard(self.database_path)
+        leaderboard.record("Player1", 42)
+        leaderboard.close()
+        leaderboard = Leaderboard(self.database_path)
+        self.assertEqual(leaderboard.best("Player1"), 42)
+        leaderboard.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from unittest import TestCase, main
+
+import pygame
+
+from scripts.menu import MenuRuntime
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestMenuRuntime(TestCase):
+    def setUp(self):
+        pygame.event.clear()
+        self.runtime = MenuRuntime(max_fps=1000, timeout=5)
+        self.draws = 0
+
+    def draw(self):
+        self.draws += 1
+
+    def test_idle_menu_draws_once(self):
+        self.runtime.run(lambda: self.runtime.wakeups < 5, self.draw,
+                         lambda event: False)
+        self.assertEqual(self.draws, 1)
+        self.assertEqual(self.runtime.redraws, 1)
+
+    def test_redraws_when_event_changes_state(self):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN,
+                                             {"key": pygame.K_a,
+                                              "unicode": "a"}))
+        self.runtime.run(lambda: self.runtime.wakeups < 3, self.draw,
+                         lambda event: event.type == pygame.KEYDOWN)
+        self.assertEqual(self.draws, 2)
+
+    def test_ignored_event_does_not_redraw(self):
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        self.runtime.run(lambda: self.runtime.wakeups < 3, self.draw,
+                         lambda event: False)
+        self.assertEqual(self.draws, 1)
+
+    def test_stops_when_handler_leaves_menu(self):
+        running = [True]
+
+        def handle_event(event):
+            running[0] = False
+            return True
+
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        self.runtime.run(lambda: running[0], self.draw, handle_event)
+        self.assertEqual(self.draws, 1)
+
+
+if __name__ == '__main__':
+    main()
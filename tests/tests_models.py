@@ -5,7 +5,7 @@ import pygame
 from pygame import Surface, Vector2
 
 from scripts.models import GameObject, Spaceship, Asteroid, Bullet, Ufo
-from scripts.utils import wrap_position
+from scripts.utils import wrap_position, load_sprite_region
 
 pygame.init()
 pygame.display.set_mode((100, 100))
@@ -73,6 +73,17 @@ class TestSpaceship(TestCase):
             -self.spaceship.MANEUVERABILITY)
         self.assertEqual(self.spaceship.direction, expected_direction)
 
+    def test_region_follows_direction(self):
+        self.assertIs(self.spaceship.region,
+                      load_sprite_region("spaceship"))
+        for _ in range(30):
+            self.spaceship.rotate(clockwise=True)
+        self.assertIs(self.spaceship.region,
+                      load_sprite_region("spaceship", -90))
+        self.spaceship.direction = Vector2(0, -1)
+        self.assertIs(self.spaceship.region,
+                      load_sprite_region("spaceship"))
+
     def test_accelerate(self):
         initial_velocity = self.spaceship.velocity.copy()
         self.spaceship.accelerate()
@@ -90,6 +101,21 @@ class TestSpaceship(TestCase):
         self.spaceship.not_accelerate()
         self.assertEqual(self.spaceship.velocity, Vector2(0, 0))
 
+    def test_reset(self):
+        self.spaceship.rotate()
+        self.spaceship.accelerate()
+        self.spaceship.score = 500
+        self.spaceship.lives = 0
+        self.spaceship.is_alive = False
+        self.spaceship.reset(Vector2(10, 20))
+        self.assertEqual(self.spaceship.position, Vector2(10, 20))
+        self.assertEqual(self.spaceship.velocity, Vector2(0, 0))
+        self.assertEqual(self.spaceship.direction, Vector2(0, -1))
+        self.assertEqual((self.spaceship.score, self.spaceship.lives), (0, 3))
+        self.assertTrue(self.spaceship.is_alive)
+        self.assertFalse(self.spaceship.was_moved)
+        self.assertFalse(self.spaceship.was_rotating)
+
 
 class TestAsteroid(TestCase):
     def setUp(self):
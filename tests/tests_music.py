@@ -0,0 +1,90 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import pygame
+
+from scripts.music import MUSIC_END, MusicPlayer
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestMusicPlayer(TestCase):
+    def setUp(self):
+        pygame.mixer.music.stop()
+        pygame.event.clear()
+        self.player = MusicPlayer(fade_ms=50)
+
+    def tearDown(self):
+        pygame.mixer.music.stop()
+        pygame.event.clear()
+
+    def wait_for_end(self):
+        for _ in range(40):
+            for event in pygame.event.get():
+                if self.player.handle_event(event):
+                    return True
+            pygame.time.wait(25)
+        return False
+
+    def test_play_streams_track(self):
+        self.player.play("Win_m")
+        self.assertEqual(self.player.current, "Win_m")
+        self.assertTrue(pygame.mixer.music.get_busy())
+
+    def test_crossfade_to_next_track(self):
+        self.player.play("Win_m")
+        self.player.play("Lose_m")
+        self.assertEqual(self.player.current, "Win_m")
+        self.assertEqual(self.player.target, "Lose_m")
+        self.assertTrue(self.wait_for_end())
+        self.assertEqual(self.player.current, "Lose_m")
+        self.assertTrue(pygame.mixer.music.get_busy())
+
+    def test_same_track_keeps_playing(self):
+        self.player.play("Win_m")
+        self.player.play("Win_m")
+        self.assertEqual(self.player.target, "Win_m")
+        self.assertFalse(pygame.event.peek(MUSIC_END))
+
+    def test_stop_fades_out(self):
+        self.player.play("Win_m")
+        self.player.stop()
+        self.assertIsNone(self.player.target)
+        self.assertTrue(self.wait_for_end())
+        self.assertIsNone(self.player.current)
+        self.assertFalse(pygame.mixer.music.get_busy())
+
+    def test_duck(self):
+        self.player.play("Win_m")
+        self.player.duck()
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(),
+                               self.player.duck_volume, 1)
+        self.player.duck(False)
+        self.assertAlmostEqual(pygame.mixer.music.get_volume(), 1, 1)
+
+    def test_missing_track_is_silent(self):
+        self.player.play("No_such_track")
+        self.assertIsNone(self.player.current)
+        self.assertIn("No_such_track", self.player.missing)
+
+    def test_preload_only_warms_file_cache(self):
+        future = self.player.preload("Win_m")
+        self.assertIs(self.player.preload("Win_m"), future)
+        self.assertEqual(future.result(), self.player.find_track("Win_m"))
+
+    def test_track_is_streamed_from_disk(self):
+        with patch("pygame.mixer.music.load",
+                   wraps=pygame.mixer.music.load) as load:
+            self.player.play("Win_m")
+        load.assert_called_once_with(str(self.player.find_track("Win_m")))
+
+    def test_disabled_player(self):
+        player = MusicPlayer(enabled=False)
+        player.play("Win_m")
+        self.assertIsNone(player.current)
+        self.assertIsNone(player.preload("Win_m"))
+
+
+if __name__ == '__main__':
+    main()
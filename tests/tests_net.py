@@ -0,0 +1,136 @@
+import asyncio
+from unittest import TestCase, main
+
+import numpy as np
+
+from scripts.controls import InputFlag, RandomInput
+from scripts.game import Asteroids
+from scripts.net import GameClient, GameServer, LinkConditioner, \
+    capture_snapshot
+from scripts.snapshot import ENTITY
+
+
+class TestLinkConditioner(TestCase):
+    class Transport:
+        def __init__(self):
+            self.sent = []
+
+        def sendto(self, data, address=None):
+            self.sent.append(data)
+
+        def is_closing(self):
+            return False
+
+    def test_loss_and_latency(self):
+        async def send():
+            link = LinkConditioner(latency=0.05, loss=0.25, seed=1)
+            transport = self.Transport()
+            link.bind(transport)
+            for _ in range(200):
+                link.sendto(b"x")
+            self.assertEqual(transport.sent, [])
+            await asyncio.sleep(0.1)
+            return link, transport
+
+        link, transport = asyncio.run(send())
+        self.assertEqual(link.packets_sent, 200)
+        self.assertEqual(len(transport.sent), 200 - link.packets_dropped)
+        self.assertTrue(30 < link.packets_dropped < 70)
+
+
+class TestExtraShips(TestCase):
+    def test_extra_ship_is_steered_and_removed(self):
+        game = Asteroids(headless=True, seed=1)
+        ship = game.add_ship()
+        self.assertEqual(game.ships, [game.spaceship, ship])
+        game.step(InputFlag.NONE, {ship: InputFlag.UP | InputFlag.RIGHT})
+        self.assertNotEqual(ship.velocity.length(), 0)
+        self.assertEqual(game.spaceship.velocity.length(), 0)
+        self.assertIn(ship, game.game_objects)
+
+        snapshot = capture_snapshot(game, 1)
+        self.assertEqual(len(snapshot.entities), len(game.game_objects))
+        self.assertEqual(int(snapshot.entities["angle"][
+            snapshot.entities["id"] == (1 << 16 | ship.row)][0]), -3)
+
+        game.remove_ship(ship)
+        self.assertEqual(game.ships, [game.spaceship])
+        self.assertNotIn(ship, game.game_objects)
+
+
+class TestLoopback(TestCase):
+    TICKS = 240
+
+    async def play(self, latency, loss):
+        server = GameServer(seed=3, tick_rate=240,
+                            link=LinkConditioner(latency, latency / 2, loss,
+                                                 seed=1))
+        host, port = await server.start()
+        clients = [GameClient(LinkConditioner(latency, latency / 2, loss,
+                                              seed=index + 2))
+                   for index in range(2)]
+        running = asyncio.create_task(server.run(self.TICKS))
+        for client in clients:
+            await client.connect(host, port, timeout=5.0)
+        inputs = [RandomInput(index) for index in range(len(clients))]
+        while not running.done():
+            for client, source in zip(clients, inputs):
+                client.send_input(source.next_input())
+            await asyncio.sleep(1 / 240)
+
+        for _ in range(100):
+            if all(client.snapshot is not None and
+                   client.snapshot.tick == server.ticks
+                   for client in clients):
+                break
+            server.broadcast()
+            for client in clients:
+                client.send_input(InputFlag.NONE)
+            await asyncio.sleep(latency * 2 + 0.01)
+        stats = server.stats()
+        for client in clients:
+            client.disconnect()
+        await asyncio.sleep(latency * 2 + 0.01)
+        server.close()
+        return server, clients, stats
+
+    def check(self, server, clients, stats):
+        self.assertEqual(len({client.client_id for client in clients}), 2)
+        self.assertEqual(len({client.ship_id for client in clients}), 2)
+        self.assertEqual(server.ticks, self.TICKS)
+        expected = server.snapshot.entities
+        for client in clients:
+            self.assertEqual(client.snapshot.tick, server.ticks)
+            entities = client.snapshot.entities
+            np.testing.assert_array_equal(entities["id"], expected["id"])
+            np.testing.assert_array_equal(entities["vx"], expected["vx"])
+            np.testing.assert_array_equal(entities["angle"],
+                                          expected["angle"])
+            error = np.abs(entities["x"] - expected["x"])
+            error = np.minimum(error, 1500 - error)
+            self.assertLessEqual(float(error.max()), server.codec.tolerance)
+        self.assertEqual(len(stats["clients"]), 2)
+        for client in stats["clients"].values():
+            self.assertGreater(client["snapshots"],
+                               client["full_snapshots"])
+            self.assertLess(client["bytes_per_snapshot"],
+                            stats["entities"] * ENTITY.itemsize)
+            self.assertGreater(client["bytes_per_second"], 0)
+        self.assertGreater(stats["tick_ms"][50], 0)
+
+    def test_clean_link(self):
+        server, clients, stats = asyncio.run(self.play(0.0, 0.0))
+        self.check(server, clients, stats)
+        self.assertEqual(server.clients, {})
+        for client in clients:
+            self.assertEqual(client.snapshots_skipped, 0)
+
+    def test_latency_and_loss(self):
+        server, clients, stats = asyncio.run(self.play(0.02, 0.2))
+        self.check(server, clients, stats)
+        self.assertTrue(any(client["full_snapshots"] > 1
+                            for client in stats["clients"].values()))
+
+
+if __name__ == "__main__":
+    main()
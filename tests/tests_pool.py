@@ -0,0 +1,77 @@
+from unittest import TestCase, main
+from unittest.mock import Mock
+
+import pygame
+from pygame import Vector2
+
+from scripts.entities import EntityKind, EntityStore
+from scripts.models import Spaceship, Bullet
+from scripts.pool import ProjectilePool
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+
+class TestProjectilePool(TestCase):
+    def setUp(self):
+        self.store = EntityStore()
+        self.pool = ProjectilePool(True, self.store, capacity=4)
+
+    def test_spawn_reuses_preallocated_bullets(self):
+        bullet = self.pool.spawn((10, 10), (1, 0))
+        self.assertIsInstance(bullet, Bullet)
+        self.assertEqual(bullet.position, Vector2(10, 10))
+        self.pool.despawn(bullet)
+        self.assertIs(self.pool.spawn((20, 20), (0, 1)), bullet)
+        self.assertEqual(self.pool.allocated, 4)
+
+    def test_idle_bullets_are_not_alive_in_store(self):
+        self.assertEqual(self.store.count(), 0)
+        bullets = [self.pool.spawn((i, i), (1, 0)) for i in range(3)]
+        self.assertEqual(self.store.count(EntityKind.BULLET), 3)
+        self.pool.despawn(bullets[1])
+        self.assertEqual(self.store.count(EntityKind.BULLET), 2)
+        self.store.move(100, 100)
+        self.assertEqual(bullets[1].position, Vector2(1, 1))
+        self.assertIs(self.pool.spawn((5, 5), (0, 1)), bullets[1])
+        self.assertEqual(self.store.count(EntityKind.BULLET), 3)
+
+    def test_spawned_bullet_is_drawn_at_spawn_point(self):
+        bullet = self.pool.spawn((10, 10), (1, 0))
+        self.pool.despawn(bullet)
+        self.store.snapshot()
+        bullet = self.pool.spawn((60, 40), (1, 0))
+        positions = self.store.interpolate([bullet.row], 0.0, 100, 100)
+        self.assertEqual(positions.tolist(), [[60, 40]])
+
+    def test_swap_remove_keeps_indices_consistent(self):
+        bullets = [self.pool.spawn((i, i), (0, 0)) for i in range(4)]
+        self.pool.despawn(bullets[1])
+        self.assertEqual(self.pool.active, [bullets[0], bullets[3],
+                                            bullets[2]])
+        for index, bullet in enumerate(self.pool.active):
+            self.assertEqual(bullet.pool_index, index)
+
+    def test_despawn_indices(self):
+        bullets = [self.pool.spawn((i, i), (0, 0)) for i in range(4)]
+        self.pool.despawn_indices([0, 3, 2])
+        self.assertEqual(self.pool.active, [bullets[1]])
+
+    def test_grows_and_tracks_high_water_mark(self):
+        for i in range(6):
+            self.pool.spawn((i, i), (0, 0))
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
+        self.assertEqual(self.pool.stats(), {"active": 0, "free": 8,
+                                             "allocated": 8,
+                                             "high_water_mark": 6})
+
+    def test_spaceship_fires_into_pool(self):
+        spaceship = Spaceship((50, 50), Mock(), self.store, self.pool)
+        spaceship.shoot()
+        self.assertEqual(len(self.pool), 1)
+        spaceship.create_bullet_callback.assert_not_called()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import tempfile
+from unittest import TestCase, main
+
+from scripts.profiler import FrameProfiler
+
+
+class TestFrameProfiler(TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(enabled=True, window=10)
+
+    def record_frames(self, count):
+        for _ in range(count):
+            self.profiler.begin_frame()
+            self.profiler.lap("move")
+            self.profiler.lap("draw")
+            self.profiler.lap("move")
+            self.profiler.end_frame()
+
+    def test_disabled_profiler_records_nothing(self):
+        self.profiler.enabled = False
+        self.record_frames(5)
+        self.assertEqual(self.profiler.frames, 0)
+        self.assertEqual(len(self.profiler.rows), 0)
+        self.assertEqual(self.profiler.summary(), {})
+
+    def test_laps_accumulate_per_phase(self):
+        self.record_frames(3)
+        self.assertEqual(self.profiler.phases, ["move", "draw", "total"])
+        row = self.profiler.rows[-1]
+        self.assertEqual(row["frame"], 2)
+        self.assertGreaterEqual(row["total"], row["move"] + row["draw"])
+
+    def test_percentiles_are_ordered(self):
+        self.record_frames(20)
+        values = self.profiler.percentiles("total")
+        self.assertEqual(list(values), [50, 95, 99])
+        self.assertLessEqual(values[50], values[95])
+        self.assertLessEqual(values[95], values[99])
+        self.assertEqual(len(self.profiler.overlay_lines()), 3)
+
+    def test_unknown_phase_percentiles_are_zero(self):
+        self.assertEqual(self.profiler.percentiles("flip"),
+                         {50: 0.0, 95: 0.0, 99: 0.0})
+
+    def test_export_csv_and_json(self):
+        self.record_frames(4)
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "profile.csv")
+            self.profiler.export(csv_path)
+            with open(csv_path) as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(list(rows[0]), ["frame", "move", "draw", "total"])
+
+            json_path = os.path.join(directory, "profile.json")
+            self.profiler.export(json_path)
+            with open(json_path) as file:
+                data = json.load(file)
+            self.assertEqual(len(data["frames_ns"]), 4)
+            self.assertIn("total", data["summary_ms"])
+
+    def test_toggle_discards_partial_frame(self):
+        self.profiler.begin_frame()
+        self.profiler.lap("move")
+        self.profiler.toggle()
+        self.profiler.toggle()
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.frames, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import random
+from unittest import TestCase, main
+
+from scripts.ranking import RankedIndex
+
+
+class TestRankedIndex(TestCase):
+    def setUp(self):
+        RankedIndex.LOAD = 4
+        self.index = RankedIndex([("Bob", 300), ("Ann", 300), ("Eve", 100),
+                                  ("Eve", 50)])
+
+    def tearDown(self):
+        RankedIndex.LOAD = 512
+
+    def test_ties_are_ordered_by_name(self):
+        self.assertEqual(self.index.top(3), [(1, "Ann", 300), (2, "Bob", 300),
+                                             (3, "Eve", 100)])
+        self.assertEqual(self.index.rank("Bob"), 2)
+
+    def test_update_keeps_best_score(self):
+        self.assertFalse(self.index.update("Eve", 90))
+        self.assertTrue(self.index.update("Eve", 400))
+        self.assertEqual(self.index.rank("Eve"), 1)
+        self.assertEqual(self.index.score("Eve"), 400)
+        self.assertEqual(len(self.index), 3)
+
+    def test_unknown_player_has_no_rank(self):
+        self.assertIsNone(self.index.rank("Nobody"))
+        self.assertNotIn("Nobody", self.index)
+
+    def test_pages(self):
+        self.assertEqual(self.index.page(1, 2), [(3, "Eve", 100)])
+        self.assertEqual(self.index.page(2, 2), [])
+        self.assertEqual(self.index.page_count(2), 2)
+        self.assertEqual(RankedIndex().page_count(2), 1)
+
+    def test_matches_sorted_reference(self):
+        generator = random.Random(7)
+        index = RankedIndex()
+        scores = {}
+        for _ in range(2000):
+            player = f"p{generator.randrange(300)}"
+            if generator.random() < 0.1 and player in scores:
+                index.remove(player)
+                del scores[player]
+                continue
+            score = generator.randrange(1000)
+            index.update(player, score)
+            scores[player] = max(score, scores.get(player, score))
+
+        reference = sorted(scores.items(), key=lambda item: (-item[1],
+                                                             item[0]))
+        self.assertEqual([(player, score) for _, player, score
+                          in index.page(0, len(reference))], reference)
+        for position, (player, _) in enumerate(reference, 1):
+            self.assertEqual(index.rank(player), position)
+            self.assertEqual(index.at(position), reference[position - 1])
+        self.assertEqual([row[1:] for row in index.page(5, 7)],
+                         reference[35:42])
+
+
+if __name__ == '__main__':
+    main()
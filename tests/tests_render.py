@@ -0,0 +1,132 @@
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import numpy as np
+import pygame
+from pygame import Surface, Color, Rect
+
+from scripts.render import DirtyRectRenderer, RenderQueue
+
+pygame.init()
+
+
+class TestDirtyRectRenderer(TestCase):
+    def setUp(self):
+        self.screen = pygame.display.set_mode((100, 100))
+        self.renderer = DirtyRectRenderer(self.screen)
+        self.sprite = Surface((10, 10))
+        self.sprite.fill(Color("white"))
+
+    def test_first_frame_is_full_flip(self):
+        self.renderer.begin_frame()
+        self.renderer.blit(self.sprite, (0, 0))
+        self.renderer.end_frame()
+        self.assertEqual(self.renderer.full_flips, 1)
+        self.assertEqual(self.renderer.dirty_fraction, 1.0)
+
+    def test_erases_previous_rects(self):
+        for position in [(0, 0), (50, 50)]:
+            self.renderer.begin_frame()
+            self.renderer.blit(self.sprite, position)
+            self.renderer.end_frame()
+        self.assertEqual(self.screen.get_at((5, 5)), Color("black"))
+        self.assertEqual(self.screen.get_at((55, 55)), Color("white"))
+        self.assertEqual(self.renderer.partial_updates, 1)
+        self.assertAlmostEqual(self.renderer.dirty_fraction, 0.02)
+
+    def test_falls_back_to_flip_over_threshold(self):
+        big_sprite = Surface((90, 90))
+        for _ in range(2):
+            self.renderer.begin_frame()
+            self.renderer.blit(big_sprite, (0, 0))
+            self.renderer.end_frame()
+        self.assertEqual(self.renderer.full_flips, 2)
+        self.assertEqual(self.renderer.partial_updates, 0)
+
+    def test_invalidate_forces_full_redraw(self):
+        self.renderer.begin_frame()
+        self.renderer.end_frame()
+        self.screen.fill(Color("red"))
+        self.renderer.invalidate()
+        self.renderer.begin_frame()
+        self.renderer.end_frame()
+        self.assertEqual(self.screen.get_at((50, 50)), Color("black"))
+        self.assertEqual(self.renderer.full_flips, 2)
+
+    def test_boxes_over_threshold_force_full_redraw(self):
+        self.renderer.begin_frame()
+        self.renderer.end_frame()
+        for boxes in [[[0, 0, 10, 10]], [[0, 0, 90, 90]], [[0, 0, 10, 10]]]:
+            self.renderer.begin_frame()
+            self.renderer.add_boxes(np.array(boxes))
+            self.renderer.end_frame()
+        self.assertEqual(self.renderer.partial_updates, 1)
+        self.assertEqual(self.renderer.full_flips, 3)
+
+
+class TestRenderQueue(TestCase):
+    def setUp(self):
+        self.screen = pygame.display.set_mode((100, 100))
+        self.screen.fill(Color("black"))
+        self.queue = RenderQueue()
+        self.atlas = Surface((20, 10))
+        self.atlas.fill(Color("red"), Rect(0, 0, 10, 10))
+        self.atlas.fill(Color("blue"), Rect(10, 0, 10, 10))
+        self.red = (self.atlas, Rect(0, 0, 10, 10))
+        self.blue = (self.atlas, Rect(10, 0, 10, 10))
+
+    def test_sprites_are_centered(self):
+        boxes = self.queue.add_sprites(np.array([0, 0]),
+                                       [self.red, self.blue],
+                                       np.array([[10.0, 10.0], [50.5, 50]]))
+        np.testing.assert_array_equal(boxes, [[5, 5, 10, 10],
+                                              [45, 45, 10, 10]])
+        self.queue.flush(self.screen)
+        self.assertEqual(self.screen.get_at((5, 5)), Color("red"))
+        self.assertEqual(self.screen.get_at((54, 54)), Color("blue"))
+        self.assertEqual(self.screen.get_at((4, 4)), Color("black"))
+        self.assertEqual(self.queue.submitted, 2)
+        self.assertEqual(self.queue.batches, 1)
+        self.assertEqual(len(self.queue), 0)
+
+    def test_higher_layers_are_drawn_on_top(self):
+        self.queue.add_sprites(np.array([1]), [self.blue],
+                               np.array([[10.0, 10.0]]))
+        self.queue.add_sprites(np.array([0]), [self.red],
+                               np.array([[10.0, 10.0]]))
+        self.queue.push(2, Surface((2, 2)), (9, 9))
+        self.queue.flush(self.screen)
+        self.assertEqual(self.screen.get_at((5, 5)), Color("blue"))
+        self.assertEqual(self.screen.get_at((10, 10)), Color("black"))
+        self.assertEqual(self.queue.batches, 3)
+
+    def test_groups_by_texture_within_layer(self):
+        other = (Surface((10, 10)), Rect(0, 0, 10, 10))
+        regions = [self.red, other, self.blue, other]
+        self.queue.add_sprites(np.zeros(4, dtype=int), regions,
+                               np.full((4, 2), 10.0))
+        self.queue.flush(self.screen)
+        self.assertEqual(self.queue.batches, 2)
+
+    def test_pushed_texture_ids_keep_full_precision(self):
+        first, second = Surface((2, 2)), Surface((2, 2))
+        ids = {id(first): 2 ** 60, id(second): 2 ** 60 + 1}
+        with patch("scripts.render.id", create=True,
+                   side_effect=lambda source: ids.get(id(source),
+                                                      id(source))):
+            for source in (first, second, first):
+                self.queue.push(0, source, (0, 0))
+            self.queue.add_sprites(np.array([0]), [self.red],
+                                   np.array([[10.0, 10.0]]))
+            self.queue.flush(self.screen)
+        self.assertEqual(self.queue.batches, 3)
+
+    def test_empty_flush(self):
+        self.assertEqual(self.queue.add_sprites([], [], None).shape, (0, 4))
+        self.queue.flush(self.screen)
+        self.assertEqual(self.queue.submitted, 0)
+        self.assertEqual(self.queue.batches, 0)
+
+
+if __name__ == '__main__':
+    main()
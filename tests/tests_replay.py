@@ -0,0 +1,97 @@
+import os
+import tempfile
+from unittest import TestCase, main
+
+from scripts.controls import InputFlag, RandomInput
+from scripts.game import Asteroids
+from scripts.replay import ReplayRecorder, ReplayPlayer, ReplayError, \
+    encode_varint, decode_varint, play_replay
+from scripts.savestate import unpack_world
+
+
+class TestVarint(TestCase):
+    def test_roundtrip(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 40):
+            encoded = encode_varint(value)
+            self.assertEqual(decode_varint(encoded + b"\x00", 0),
+                             (value, len(encoded)))
+
+    def test_truncated(self):
+        with self.assertRaises(ReplayError):
+            decode_varint(b"\x80", 0)
+
+
+class TestReplay(TestCase):
+    TICKS = 450
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.rpl")
+        with ReplayRecorder(self.path, 3, keyframe_interval=100) as recorder:
+            game = Asteroids(headless=True, seed=3,
+                             input_source=RandomInput(3), recorder=recorder)
+            self.result = game.simulate(self.TICKS)
+            self.final_state = game.capture_state()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_header_and_keyframes(self):
+        with ReplayPlayer(self.path) as player:
+            self.assertEqual(player.seed, 3)
+            self.assertEqual(player.ticks, self.TICKS)
+            self.assertEqual([tick for tick, _ in player.keyframes],
+                             [0, 100, 200, 300, 400])
+
+    def test_inputs_match_recording(self):
+        source = RandomInput(3)
+        with ReplayPlayer(self.path) as player:
+            self.assertEqual(list(player.inputs()),
+                             [source.next_input() for _ in range(self.TICKS)])
+            self.assertTrue(player.finished)
+            self.assertEqual(player.next_input(), InputFlag.NONE)
+
+    def test_playback_reproduces_session(self):
+        with ReplayPlayer(self.path) as player:
+            game = Asteroids(headless=True, seed=player.seed,
+                             input_source=player)
+            game.simulate(player.ticks)
+            self.assertEqual(game.capture_state(), self.final_state)
+
+    def test_seek_restores_keyframe_and_fast_forwards(self):
+        with ReplayPlayer(self.path) as player:
+            game = Asteroids(headless=True, seed=0, input_source=player)
+            player.seek(game, 333)
+            self.assertEqual(player.tick, 333)
+            self.assertEqual(unpack_world(game.capture_state()).frame, 333)
+            game.simulate(player.ticks - player.tick)
+            self.assertEqual(game.capture_state(), self.final_state)
+
+    def test_play_replay_headless(self):
+        result = play_replay(self.path, seek=250)
+        self.assertEqual(result["ticks"], self.TICKS)
+        self.assertEqual(result["score"], self.result["score"])
+        self.assertEqual(result["lives"], self.result["lives"])
+
+    def test_truncated_replay_is_scanned(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with ReplayPlayer(self.path) as player:
+            last_keyframe = player.keyframes[-1][1]
+        with open(self.path, "wb") as file:
+            file.write(data[:last_keyframe + 10])
+        with ReplayPlayer(self.path) as player:
+            self.assertEqual([tick for tick, _ in player.keyframes],
+                             [0, 100, 200, 300])
+            self.assertEqual(player.ticks, 400)
+            self.assertEqual(len(list(player.inputs())), 400)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a replay at all, clearly")
+        with self.assertRaises(ReplayError):
+            ReplayPlayer(self.path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import os
+import random
+import struct
+import tempfile
+from unittest import TestCase, main
+
+from scripts.controls import RandomInput
+from scripts.game import Asteroids
+from scripts.savestate import WorldState, pack_world, unpack_world, \
+    SaveStateError, HEADER, MAGIC
+
+
+class TestSaveState(TestCase):
+    def setUp(self):
+        self.world = WorldState(
+            120, 2, 1, 300, 1, random.Random(5).getstate(),
+            (1.5, 2.5, 0.25, -0.5, 0.0, -1.0, 300, 2, True, False, True),
+            [(10.0, 20.0, 0.5, 0.5, 1.2, 3), (30.0, 40.0, -1.0, 0.0, 0.9, 1)],
+            [(5.0, 6.0, 3.0, 0.0)],
+            [],
+            [(0.0, 100.0, 1.0, 0.0, 25)])
+
+    def test_roundtrip(self):
+        restored = unpack_world(pack_world(self.world))
+        self.assertEqual(restored.random_state, self.world.random_state)
+        self.assertEqual(restored.spaceship, self.world.spaceship)
+        self.assertEqual(restored.asteroids.tolist(), self.world.asteroids)
+        self.assertEqual(restored.bullets.tolist(), self.world.bullets)
+        self.assertEqual(restored.ufo_bullets.tolist(), [])
+        self.assertEqual(restored.ufos.tolist(), self.world.ufos)
+        self.assertEqual(restored[:5], (120, 2, 1, 300, 1))
+
+    def test_rejects_bad_header(self):
+        data = bytearray(pack_world(self.world))
+        with self.assertRaises(SaveStateError):
+            unpack_world(b"XXXX" + bytes(data[4:]))
+        struct.pack_into(HEADER.format, data, 0, MAGIC, 99)
+        with self.assertRaises(SaveStateError):
+            unpack_world(data)
+
+    def test_rejects_truncated_state(self):
+        with self.assertRaises(SaveStateError):
+            unpack_world(pack_world(self.world)[:-1])
+
+
+class TestQuickSave(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "quicksave.sav")
+        self.game = Asteroids(headless=True, seed=4)
+        source = RandomInput(4)
+        for _ in range(200):
+            self.game.step(source.next_input())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_quick_load_restores_saved_world(self):
+        self.game.quick_save(self.path)
+        saved = self.game.capture_state()
+        source = RandomInput(5)
+        for _ in range(100):
+            self.game.step(source.next_input())
+        self.assertNotEqual(self.game.capture_state(), saved)
+        self.assertTrue(self.game.quick_load(self.path))
+        self.assertEqual(self.game.capture_state(), saved)
+
+    def test_quick_load_without_save(self):
+        state = self.game.capture_state()
+        self.assertFalse(self.game.quick_load(self.path))
+        with open(self.path, "wb") as save_file:
+            save_file.write(b"garbage")
+        self.assertFalse(self.game.quick_load(self.path))
+        self.assertEqual(self.game.capture_state(), state)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+from unittest import TestCase, main
+
+from scripts.scheduler import Scheduler
+
+
+class TestScheduler(TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()
+        self.fired = []
+
+    def record(self, name):
+        self.fired.append((self.scheduler.now, name))
+
+    def test_fires_in_deadline_order(self):
+        self.scheduler.schedule(5, self.record, "b")
+        self.scheduler.schedule(3, self.record, "a")
+        self.scheduler.schedule(5, self.record, "c")
+        self.assertEqual(self.scheduler.advance(4), 1)
+        self.assertEqual(self.scheduler.advance(10), 2)
+        self.assertEqual(self.fired, [(3, "a"), (5, "b"), (5, "c")])
+        self.assertEqual(self.scheduler.now, 10)
+        self.assertEqual(self.scheduler.fired, 3)
+
+    def test_repeating_timer(self):
+        timer = self.scheduler.after(2, self.record, "volley", interval=3)
+        self.scheduler.advance(8)
+        self.assertEqual(self.fired, [(2, "volley"), (5, "volley"),
+                                      (8, "volley")])
+        timer.cancel()
+        self.assertEqual(self.scheduler.advance(20), 0)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_callback_can_schedule_same_tick(self):
+        def spawn():
+            self.record("spawn")
+            self.scheduler.schedule(self.scheduler.now, self.record, "shot")
+
+        self.scheduler.schedule(1, spawn)
+        self.scheduler.advance(1)
+        self.assertEqual(self.fired, [(1, "spawn"), (1, "shot")])
+
+    def test_cancel_and_clear(self):
+        timer = self.scheduler.schedule(1, self.record, "a")
+        self.scheduler.schedule(2, self.record, "b")
+        timer.cancel()
+        self.assertEqual(self.scheduler.next_deadline(), 2)
+        self.scheduler.clear(now=50)
+        self.assertIsNone(self.scheduler.next_deadline())
+        self.assertEqual(self.scheduler.advance(100), 0)
+        self.assertEqual(self.scheduler.now, 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+from unittest import TestCase, main
+
+from scripts.controls import InputFlag, ScriptedInput, RandomInput
+from scripts.game import Asteroids
+from scripts.simulation import run_round, run_rounds, \
+    run_rounds_parallel, summarize
+
+
+class TestScriptedInput(TestCase):
+    def test_loops_over_script(self):
+        source = ScriptedInput([InputFlag.LEFT, InputFlag.UP])
+        flags = [source.next_input() for _ in range(3)]
+        self.assertEqual(flags, [InputFlag.LEFT, InputFlag.UP,
+                                 InputFlag.LEFT])
+
+    def test_returns_no_input_after_end(self):
+        source = ScriptedInput([InputFlag.SHOOT], loop=False)
+        source.next_input()
+        self.assertEqual(source.next_input(), InputFlag.NONE)
+
+    def test_random_input_is_seeded(self):
+        first = RandomInput(3)
+        second = RandomInput(3)
+        self.assertEqual([first.next_input() for _ in range(50)],
+                         [second.next_input() for _ in range(50)])
+
+
+class TestHeadlessSimulation(TestCase):
+    def test_same_seed_gives_same_round(self):
+        first = run_round(5, max_frames=600)
+        second = run_round(5, max_frames=600)
+        for key in ("frames", "level", "score", "lives", "state"):
+            self.assertEqual(first[key], second[key])
+
+    def test_simulate_reports_fps(self):
+        game = Asteroids(headless=True, seed=1,
+                         input_source=ScriptedInput([InputFlag.NONE]))
+        result = game.simulate(120)
+        self.assertEqual(result["frames"], 120)
+        self.assertGreater(result["fps"], 0)
+        self.assertEqual(result["state"], "GAME")
+
+    def test_summarize(self):
+        summary = summarize([{"frames": 10, "seconds": 1.0, "level": 3,
+                              "score": 500, "state": "WIN_MENU"},
+                             {"frames": 30, "seconds": 1.0, "level": 1,
+                              "score": 100, "state": "LOSE_MENU"}],
+                            wall_seconds=0.5, tick_rate=10)
+        self.assertEqual(summary["fps"], 20)
+        self.assertEqual(summary["throughput"], 80)
+        self.assertEqual(summary["wins"], 1)
+        self.assertEqual(summary["losses"], 1)
+        self.assertEqual(summary["levels"], {1: 1, 3: 1})
+        self.assertEqual(summary["score_median"], 300)
+        self.assertEqual(summary["score_max"], 500)
+        self.assertEqual(summary["survival_mean"], 2)
+
+    def test_parallel_rounds_match_sequential(self):
+        sequential = run_rounds(3, seed=10, max_frames=300)
+        parallel = sorted(run_rounds_parallel(3, seed=10, max_frames=300,
+                                              workers=2),
+                          key=lambda result: result["seed"])
+        for key in ("seed", "frames", "level", "score", "lives", "state"):
+            self.assertEqual([result[key] for result in parallel],
+                             [result[key] for result in sequential])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from scripts.entities import EntityKind
+from scripts.snapshot import ENTITY, HEADER, NO_BASE, Snapshot, \
+    SnapshotCodec, SnapshotError, entity_id
+
+
+def make_snapshot(tick, records):
+    entities = np.array(records, dtype=ENTITY)
+    return Snapshot(tick, 100, 3, 1, 1, entities)
+
+
+def advance(snapshot, ticks, width=1000, height=500):
+    entities = snapshot.entities.copy()
+    for _ in range(ticks):
+        entities["x"] += entities["vx"]
+        entities["y"] += entities["vy"]
+        wraps = entities["kind"] != EntityKind.BULLET
+        entities["x"][wraps] %= width
+        entities["y"][wraps] %= height
+    return snapshot._replace(tick=snapshot.tick + ticks, entities=entities)
+
+
+class TestSnapshotCodec(TestCase):
+    def setUp(self):
+        self.codec = SnapshotCodec(1000, 500)
+        self.base = make_snapshot(10, [
+            (entity_id(0, 1), EntityKind.SPACESHIP, 20, 500, 250, 0, 0, 90),
+            (entity_id(1, 1), EntityKind.ASTEROID, 40, 990, 10, 1, -0.5, 0),
+            (entity_id(2, 1), EntityKind.BULLET, 2, 100, 100, 3, 0, 0)])
+
+    def decode(self, data, bases=None):
+        return self.codec.decode(data, {} if bases is None else bases)
+
+    def test_full_snapshot_roundtrip(self):
+        data, sent = self.codec.encode(self.base, 7)
+        sequence, base_sequence, snapshot = self.decode(data)
+        self.assertEqual((sequence, base_sequence), (7, NO_BASE))
+        self.assertEqual(snapshot[:5], self.base[:5])
+        np.testing.assert_array_equal(snapshot.entities, self.base.entities)
+        self.assertEqual(len(data), HEADER.size + 3 * ENTITY.itemsize)
+
+    def test_delta_skips_predictable_entities(self):
+        current = advance(self.base, 30)
+        full, _ = self.codec.encode(current, 2)
+        delta, sent = self.codec.encode(current, 2, self.base, 1)
+        self.assertEqual(len(delta), HEADER.size)
+        self.assertLess(len(delta), len(full))
+        _, base_sequence, snapshot = self.decode(delta, {1: self.base})
+        self.assertEqual(base_sequence, 1)
+        np.testing.assert_array_equal(snapshot.entities, sent.entities)
+        self.assertAlmostEqual(float(snapshot.entities["x"][1]),
+                               float(current.entities["x"][1]), 3)
+
+    def test_delta_sends_changes_spawns_and_removals(self):
+        current = advance(self.base, 5)
+        entities = current.entities
+        entities["vx"][0] = 2
+        entities["x"][0] += 50
+        entities["angle"][0] = 87
+        entities = np.concatenate((entities[:2], np.array(
+            [(entity_id(3, 1), EntityKind.UFO, 30, 0, 300, 1, 0, 0)],
+            dtype=ENTITY)))
+        current = current._replace(entities=entities)
+
+        delta, sent = self.codec.encode(current, 2, self.base, 1)
+        _, _, snapshot = self.decode(delta, {1: self.base})
+        np.testing.assert_array_equal(snapshot.entities, sent.entities)
+        np.testing.assert_array_equal(snapshot.entities["id"],
+                                      entities["id"])
+        self.assertEqual(float(snapshot.entities["x"][0]),
+                         float(entities["x"][0]))
+        self.assertEqual(int(snapshot.entities["angle"][0]), 87)
+        self.assertEqual(int(snapshot.entities["kind"][2]), EntityKind.UFO)
+
+    def test_wrapping_prediction(self):
+        current = advance(self.base, 20)
+        self.assertLess(float(current.entities["x"][1]), 100)
+        delta, sent = self.codec.encode(current, 2, self.base, 1)
+        self.assertEqual(len(delta), HEADER.size)
+        _, _, snapshot = self.decode(delta, {1: self.base})
+        self.assertAlmostEqual(float(snapshot.entities["x"][1]),
+                               float(current.entities["x"][1]), 3)
+
+    def test_missing_base(self):
+        delta, _ = self.codec.encode(advance(self.base, 1), 2, self.base, 1)
+        with self.assertRaises(SnapshotError):
+            self.decode(delta)
+
+    def test_truncated(self):
+        data, _ = self.codec.encode(self.base, 1)
+        with self.assertRaises(SnapshotError):
+            self.decode(data[:-1])
+        with self.assertRaises(SnapshotError):
+            self.decode(data[:HEADER.size - 1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import random
+from unittest import TestCase, main
+
+import numpy as np
+from pygame import Surface
+
+from scripts.entities import EntityStore, rows_of
+from scripts.models import GameObject
+from scripts.spatial import SpatialHash, first_unclaimed
+
+
+def make_objects(count, seed, store):
+    rng = random.Random(seed)
+    return [GameObject((rng.uniform(-50, 1550), rng.uniform(-50, 750)),
+                       Surface((rng.choice([12, 60, 150]),) * 2), (0, 0),
+                       store)
+            for _ in range(count)]
+
+
+class TestSpatialHash(TestCase):
+    def setUp(self):
+        self.grid = SpatialHash(1500, 700)
+        self.grid.BRUTE_FORCE_PAIRS = 0
+        self.store = EntityStore()
+
+    def test_pairs_match_brute_force(self):
+        objects = make_objects(100, 1, self.store)
+        targets = make_objects(300, 2, self.store)
+        expected = [(index, other_index)
+                    for index, game_object in enumerate(objects)
+                    for other_index, target in enumerate(targets)
+                    if game_object.collides_with(target)]
+        indices, other_indices = self.grid.store_pairs(
+            self.store, rows_of(objects), rows_of(targets))
+        self.assertEqual(list(zip(indices.tolist(), other_indices.tolist())),
+                         expected)
+
+    def test_wraps_cells_across_edges(self):
+        positions = np.array([[-5.0, 350.0]])
+        other_positions = np.array([[1495.0, 350.0], [3.0, 350.0]])
+        radii = np.array([10.0])
+        other_radii = np.array([10.0, 10.0])
+        indices, other_indices = self.grid.pairs(positions, radii,
+                                                 other_positions, other_radii)
+        self.assertEqual(other_indices.tolist(), [1])
+
+    def test_small_grid_has_no_duplicates(self):
+        grid = SpatialHash(100, 100)
+        grid.BRUTE_FORCE_PAIRS = 0
+        positions = np.array([[10.0, 10.0]])
+        other_positions = np.array([[20.0, 20.0], [50.0, 50.0]])
+        indices, other_indices = grid.pairs(positions, np.array([60.0]),
+                                            other_positions,
+                                            np.array([5.0, 5.0]))
+        self.assertEqual(other_indices.tolist(), [0, 1])
+
+    def test_no_pairs_for_empty_input(self):
+        indices, other_indices = self.grid.pairs(
+            np.zeros((0, 2)), np.zeros(0), np.array([[1.0, 1.0]]),
+            np.array([1.0]))
+        self.assertEqual(len(indices), 0)
+        self.assertEqual(len(other_indices), 0)
+
+
+class TestFirstUnclaimed(TestCase):
+    def test_first_hit_in_list_order(self):
+        matches = first_unclaimed(np.array([0, 0, 1, 1, 2]),
+                                  np.array([1, 2, 1, 3, 3]))
+        self.assertEqual(matches, [(0, 1), (1, 3)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import random
+import time
+from itertools import combinations
+from math import hypot
+from unittest import TestCase, main
+
+from scripts.spawn import SpawnGrid, SpawnPlanner, poisson_disk
+
+CENTER = (750, 350)
+
+
+class TestSpawnGrid(TestCase):
+    def test_is_free(self):
+        grid = SpawnGrid(100)
+        grid.add(150, 150)
+        self.assertFalse(grid.is_free(240, 150, 100))
+        self.assertTrue(grid.is_free(260, 150, 100))
+        self.assertTrue(grid.is_free(240, 150, 50))
+
+
+class TestPoissonDisk(TestCase):
+    def sample(self, count, seed=0):
+        return list(poisson_disk(1500, 700, count, 150, random.Random(seed),
+                                 [(CENTER, 250)]))
+
+    def test_respects_spacing_and_exclusion(self):
+        points = self.sample(20)
+        self.assertEqual(len(points), 20)
+        for x, y in points:
+            self.assertGreater(hypot(x - CENTER[0], y - CENTER[1]), 250)
+            self.assertTrue(0 <= x <= 1500 and 0 <= y <= 700)
+        for (x, y), (other_x, other_y) in combinations(points, 2):
+            self.assertGreaterEqual(hypot(x - other_x, y - other_y), 150)
+
+    def test_same_seed_same_layout(self):
+        self.assertEqual(self.sample(6, 3), self.sample(6, 3))
+        self.assertNotEqual(self.sample(6, 3), self.sample(6, 4))
+
+    def test_large_wave_is_bounded(self):
+        start = time.perf_counter()
+        points = self.sample(2000)
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(len(points), 2000)
+        self.assertTrue(all(hypot(x - CENTER[0], y - CENTER[1]) > 250
+                            for x, y in points))
+
+
+class TestSpawnPlanner(TestCase):
+    def setUp(self):
+        self.planner = SpawnPlanner(1500, 700, points_per_tick=4)
+
+    def test_prepared_layout_matches_direct_layout(self):
+        expected = list(self.planner.sampler(7, 2, 10, CENTER))
+        self.planner.prepare(7, 2, 10, CENTER)
+        for _ in range(2):
+            self.assertFalse(self.planner.is_ready())
+            self.planner.advance()
+        self.planner.advance()
+        self.assertTrue(self.planner.is_ready())
+        self.assertEqual(self.planner.layout(7, 2, 10, CENTER), expected)
+        self.assertEqual(self.planner.layout(7, 2, 10, CENTER), expected)
+
+    def test_layout_for_another_level_is_not_reused(self):
+        self.planner.prepare(7, 2, 10, CENTER)
+        self.planner.advance(10)
+        self.assertEqual(self.planner.layout(7, 3, 10, CENTER),
+                         list(self.planner.sampler(7, 3, 10, CENTER)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
+import pygame
+
 from pygame import Surface, Vector2
 from scripts.utils import wrap_position, get_random_velocity, get_random_size, \
-    get_random_position
+    get_random_position, SpriteCache, TransformCache, surface_bytes, \
+    FontRegistry, TextCache, SpriteAtlas, load_sprite, load_sprite_region
 from unittest import TestCase, main
 
 
@@ -72,5 +75,135 @@ class TestUtils(TestCase):
         self.assertLessEqual(size, max_size)
 
 
+class TestSpriteCache(TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        self.cache = SpriteCache()
+
+    def test_get_decodes_once(self):
+        first = self.cache.get("bullet")
+        second = self.cache.get("bullet")
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_preload_whole_directory(self):
+        self.cache.preload()
+        self.assertIn("asteroid", self.cache)
+        self.assertIn("heart", self.cache)
+        misses = self.cache.misses
+        self.cache.get("spaceship")
+        self.cache.get("ufo")
+        self.assertEqual(self.cache.misses, misses)
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_reset_stats(self):
+        self.cache.get("heart")
+        self.cache.reset_stats()
+        self.assertEqual(self.cache.stats(),
+                         {"hits": 0, "misses": 0, "sprites": 1})
+
+
+class TestTransformCache(TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        self.cache = TransformCache()
+
+    def test_quantize(self):
+        self.assertEqual(self.cache.quantize(-4, 1.234), (357, 1.25))
+        self.assertEqual(self.cache.quantize(361, 0), (0, 0.05))
+
+    def test_nearby_requests_share_surface(self):
+        first = self.cache.get("asteroid", 0, 1.01)
+        second = self.cache.get("asteroid", 0.5, 0.99)
+        self.assertIs(first, second)
+        self.assertEqual(self.cache.hit_rate(), 0.5)
+        self.assertEqual(self.cache.resident_bytes, surface_bytes(first))
+
+    def test_evicts_least_recently_used_over_budget(self):
+        first = self.cache.get("spaceship", 90)
+        second = self.cache.get("spaceship", 180)
+        self.cache.byte_budget = surface_bytes(first) + surface_bytes(second)
+        self.cache.get("spaceship", 90)
+        self.cache.get("spaceship", 270)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertLessEqual(self.cache.resident_bytes,
+                             self.cache.byte_budget)
+        self.assertIs(self.cache.get("spaceship", 90), first)
+
+
+class TestSpriteAtlas(TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        self.atlas = SpriteAtlas(size=64, max_pages=2)
+
+    def test_packs_without_overlap(self):
+        sprite = load_sprite("bullet")
+        areas = [self.atlas.add(index, sprite)[1] for index in range(30)]
+        self.assertEqual(self.atlas.stats(),
+                         {"pages": 2, "regions": 30, "overflows": 0,
+                          "resident_bytes": 2 * 64 * 64 * 4})
+        self.assertLessEqual(self.atlas.resident_bytes,
+                             self.atlas.byte_budget)
+        page = self.atlas.get(0)[0]
+        on_first_page = [area for index, area in enumerate(areas)
+                         if self.atlas.get(index)[0] is page]
+        self.assertEqual(len(on_first_page), 16)
+        self.assertEqual(on_first_page[0].collidelist(on_first_page[1:]), -1)
+
+    def test_copies_pixels_exactly(self):
+        sprite = load_sprite("ufo")
+        page, area = self.atlas.add("ufo", sprite)
+        self.assertIs(self.atlas.add("ufo", sprite)[1], area)
+        for x, y in [(0, 0), (30, 30), (12, 40)]:
+            self.assertEqual(page.get_at((area.x + x, area.y + y)),
+                             sprite.get_at((x, y)))
+
+    def test_overflow_falls_back_to_sprite(self):
+        sprite = load_sprite("asteroid")
+        self.assertEqual(self.atlas.add("asteroid", sprite),
+                         (sprite, sprite.get_rect()))
+        self.assertEqual(self.atlas.overflows, 1)
+        self.assertEqual(self.atlas.pages, [])
+        self.assertNotIn("asteroid", self.atlas)
+        self.assertEqual(self.atlas.resident_bytes, 0)
+
+    def test_load_sprite_region_shares_quantized_region(self):
+        self.assertIs(load_sprite_region("spaceship", 91),
+                      load_sprite_region("spaceship", 90))
+        page, area = load_sprite_region("bullet")
+        self.assertEqual(area.size, load_sprite("bullet").get_size())
+
+
+class TestTextCache(TestCase):
+    def setUp(self):
+        pygame.init()
+        self.font = FontRegistry().get(None, 32)
+        self.cache = TextCache(max_entries=2)
+
+    def test_font_registry_builds_each_font_once(self):
+        registry = FontRegistry()
+        self.assertIs(registry.get(None, 32), registry.get(None, 32))
+        self.assertIsNot(registry.get(None, 32), registry.get(None, 28))
+        self.assertEqual(len(registry), 2)
+
+    def test_renders_only_on_change(self):
+        first = self.cache.render(self.font, "Score: 0", "white")
+        second = self.cache.render(self.font, "Score: 0", (255, 255, 255))
+        third = self.cache.render(self.font, "Score: 25", "white")
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+        self.assertEqual(self.cache.stats(),
+                         {"hits": 1, "misses": 2, "surfaces": 2})
+
+    def test_bounded_size(self):
+        for score in range(5):
+            self.cache.render(self.font, f"Score: {score}", "white")
+        self.assertEqual(len(self.cache), 2)
+
+
 if __name__ == '__main__':
     main()